@@ -0,0 +1,187 @@
+"""
+Scale sweep of the VectorEngine backends over synthetic catalogs
+(services/catalog.py).
+
+For every backend and catalog size, a fresh child process streams the catalog
+into the store and reports ingest rate, index build time, search p50 / p99
+(queries drawn from the catalog distribution), peak / resident memory and
+on-disk size. A child that crashes, is OOM-killed or exceeds --timeout marks
+where that backend falls over; larger sizes are then skipped for it.
+
+    memory   embedded Qdrant, local=":memory:" (index build: none, flat scan)
+    local    embedded Qdrant on disk (index build: reopening the store, which loads every point)
+    server   Qdrant at localhost:6333 (index build: until the optimizer reports green)
+
+Memory is the benchmark process only; for `server` the index lives in the
+Qdrant process and is not included.
+
+    python benchmarks/catalog_scale.py [--sizes 100000 1000000 10000000] [--backends memory local server] [--json out.json]
+"""
+import sys
+import os
+import time
+import json
+import shutil
+import resource
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.catalog import SyntheticCatalog
+
+BACKENDS = ("memory", "local", "server")
+COLLECTION = "bench_catalog_scale"
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+def _peak_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _dir_mb(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / 2**20
+
+def server_available() -> bool:
+    from qdrant_client import QdrantClient
+    try:
+        QdrantClient(host="localhost", port=6333, timeout=2.0).get_collections()
+        return True
+    except Exception:
+        return False
+
+def _wait_indexed(ve, timeout: float) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        info = ve.qdrant.get_collection(ve.collection_name)
+        if str(info.status).lower().endswith("green"):
+            break
+        time.sleep(0.2)
+    return time.perf_counter() - started
+
+def measure(backend: str, size: int, queries: int, batch_size: int, seed: int) -> dict:
+    """One (backend, size) point. Runs in its own process (see main)."""
+    from services.vector import VectorEngine
+
+    catalog = SyntheticCatalog(seed=seed)
+    base_rss = _rss_mb()
+    path = tempfile.mkdtemp(prefix="catalog_scale_") if backend == "local" else None
+
+    try:
+        if backend == "memory":
+            ve = VectorEngine(collection_name=COLLECTION, local=":memory:")
+        elif backend == "local":
+            ve = VectorEngine(collection_name=COLLECTION, local=path)
+        else:
+            ve = VectorEngine(collection_name=COLLECTION)
+            ve.qdrant.delete_collection(COLLECTION)
+            ve = VectorEngine(collection_name=COLLECTION)
+
+        started = time.perf_counter()
+        catalog.ingest(ve, size, batch_size=batch_size)
+        ingest_s = time.perf_counter() - started
+
+        if backend == "local":
+            ve.qdrant.close()
+            started = time.perf_counter()
+            ve = VectorEngine(collection_name=COLLECTION, local=path)
+            index_s = time.perf_counter() - started
+        elif backend == "server":
+            index_s = _wait_indexed(ve, timeout=600.0)
+        else:
+            index_s = 0.0
+
+        probes = catalog.queries(queries)
+        ve.search(probes[0], k=1)  # warm-up
+        latencies = []
+        for probe in probes:
+            started = time.perf_counter()
+            ve.search(probe, k=1)
+            latencies.append((time.perf_counter() - started) * 1000)
+        lat = np.array(latencies)
+
+        result = {
+            "backend": backend,
+            "size": size,
+            "stored": ve.get_count(),
+            "ingest_s": ingest_s,
+            "ingest_rows_per_s": size / ingest_s,
+            "index_build_s": index_s,
+            "search_p50_ms": float(np.percentile(lat, 50)),
+            "search_p99_ms": float(np.percentile(lat, 99)),
+            "rss_mb": _rss_mb() - base_rss,
+            "peak_rss_mb": _peak_mb(),
+            "disk_mb": _dir_mb(path) if path else None,
+        }
+        if backend == "server":
+            ve.qdrant.delete_collection(COLLECTION)
+        return result
+    finally:
+        if path:
+            shutil.rmtree(path, ignore_errors=True)
+
+def run_point(backend: str, size: int, args) -> dict:
+    """measure() in a child process, so memory is per point and a crash only ends this point."""
+    command = [sys.executable, os.path.abspath(__file__), "--point", backend, str(size),
+               "--queries", str(args.queries), "--batch", str(args.batch), "--seed", str(args.seed)]
+    try:
+        child = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        return {"backend": backend, "size": size, "error": f"timeout after {args.timeout:.0f} s"}
+    if child.returncode != 0:
+        lines = (child.stderr or "").strip().splitlines()
+        reason = lines[-1] if lines else f"exit status {child.returncode}"
+        if child.returncode < 0:
+            reason = f"killed by signal {-child.returncode} (out of memory?)"
+        return {"backend": backend, "size": size, "error": reason}
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--batch", type=int, default=5000, help="upsert batch size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=1800.0, help="seconds per (backend, size) point")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--point", nargs=2, metavar=("BACKEND", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.point:
+        backend, size = args.point[0], int(args.point[1])
+        print(json.dumps(measure(backend, size, args.queries, args.batch, args.seed)))
+        return
+
+    backends = list(args.backends)
+    if "server" in backends and not server_available():
+        print("No Qdrant server at localhost:6333: skipping the server backend")
+        backends.remove("server")
+
+    results = []
+    print(f"{'backend':>8} {'size':>10} {'ingest s':>9} {'rows/s':>8} {'index s':>8} "
+          f"{'p50 ms':>7} {'p99 ms':>7} {'rss MB':>7} {'peak MB':>8} {'disk MB':>8}")
+    for backend in backends:
+        for size in sorted(args.sizes):
+            r = run_point(backend, size, args)
+            results.append(r)
+            if "error" in r:
+                print(f"{backend:>8} {size:>10} falls over: {r['error']}")
+                break
+            disk = f"{r['disk_mb']:.0f}" if r["disk_mb"] is not None else "-"
+            print(f"{backend:>8} {size:>10} {r['ingest_s']:>9.1f} {r['ingest_rows_per_s']:>8.0f} "
+                  f"{r['index_build_s']:>8.1f} {r['search_p50_ms']:>7.2f} {r['search_p99_ms']:>7.2f} "
+                  f"{r['rss_mb']:>7.0f} {r['peak_rss_mb']:>8.0f} {disk:>8}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
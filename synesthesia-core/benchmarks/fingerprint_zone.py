@@ -0,0 +1,125 @@
+"""
+Target-zone benchmark for the Rust fingerprinter.
+
+Fingerprints a deterministic synthetic library once per setting and reports
+hash count, index size, fingerprint throughput and identification accuracy on
+noisy excerpts.
+
+    python benchmarks/fingerprint_zone.py [--tracks 40] [--json out.json]
+"""
+import sys
+import os
+import time
+import json
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fingerprint import FingerprintIndex, SAMPLE_RATE, HOP_SIZE
+import synesthesia.core as rust_core
+
+# (label, fingerprinter keyword arguments)
+SETTINGS = [
+    ("legacy (dt 1-9, all pairs)", dict(max_dt=9, max_df=4096, fan_out=1 << 30)),
+    ("default", dict()),
+    ("fan-out 5", dict(fan_out=5)),
+    ("narrow band (df 64)", dict(max_df=64)),
+    ("wide zone (dt 1-32, fan-out 10)", dict(max_dt=32, fan_out=10)),
+    ("density cap 30/s", dict(peaks_per_second=30)),
+    ("density cap 15/s, fan-out 5", dict(peaks_per_second=15, fan_out=5)),
+]
+
+def synth_track(seed: int, seconds: float) -> np.ndarray:
+    """Deterministic note sequence with harmonics, percussion and noise."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    audio = np.zeros(n, dtype=np.float64)
+
+    note_len = int(SAMPLE_RATE * rng.uniform(0.15, 0.4))
+    for start in range(0, n, note_len):
+        f0 = 110.0 * 2 ** (rng.integers(0, 36) / 12)
+        seg = slice(start, min(start + note_len, n))
+        env = np.exp(-np.arange(seg.stop - seg.start) / (note_len * 0.5))
+        for h in range(1, 5):
+            audio[seg] += env * np.sin(2 * np.pi * f0 * h * t[seg]) / h
+
+    beat = int(SAMPLE_RATE * 60 / rng.uniform(80, 160))
+    for start in range(0, n, beat):
+        length = min(2000, n - start)
+        audio[start:start + length] += rng.normal(0, 0.5, length) * np.exp(-np.arange(length) / 300)
+
+    audio += rng.normal(0, 0.02, n)
+    return (audio / np.max(np.abs(audio)) * 0.8).astype(np.float32)
+
+def add_noise(audio: np.ndarray, snr_db: float, rng) -> np.ndarray:
+    power = np.mean(audio ** 2)
+    noise = rng.normal(0, np.sqrt(power / 10 ** (snr_db / 10)), len(audio))
+    return (audio + noise).astype(np.float32)
+
+def run_setting(tracks, queries, kwargs):
+    started = time.perf_counter()
+    postings = {}
+    for track_id, audio in tracks.items():
+        postings[track_id] = rust_core.audio_fingerprint_array(audio, **kwargs)
+    fp_seconds = time.perf_counter() - started
+
+    index = FingerprintIndex.build(postings)
+    audio_seconds = sum(len(a) for a in tracks.values()) / SAMPLE_RATE
+
+    correct = 0
+    latencies = []
+    for track_id, excerpt, offset_frames in queries:
+        q0 = time.perf_counter()
+        q_hashes, q_offsets = rust_core.audio_fingerprint_array(excerpt, **kwargs)
+        matches = index.match(q_hashes, q_offsets, top_k=1)
+        latencies.append((time.perf_counter() - q0) * 1000)
+        if matches and matches[0]["track_id"] == track_id and abs(matches[0]["offset"] - offset_frames) <= 1:
+            correct += 1
+
+    return {
+        "hashes": len(index),
+        "hashes_per_second_audio": len(index) / audio_seconds,
+        "index_bytes": index.hashes.nbytes + index.tracks.nbytes + index.offsets.nbytes,
+        "fingerprint_x_realtime": audio_seconds / fp_seconds,
+        "accuracy": correct / len(queries),
+        "query_ms_p50": float(np.percentile(latencies, 50)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, default=40)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--excerpt", type=float, default=5.0, help="Query length in seconds")
+    parser.add_argument("--snr", type=float, default=10.0, help="Query signal-to-noise ratio in dB")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1234)
+    tracks = {f"track_{i:04d}": synth_track(i, args.seconds) for i in range(args.tracks)}
+
+    queries = []
+    excerpt_len = int(args.excerpt * SAMPLE_RATE)
+    for _ in range(args.queries):
+        track_id = f"track_{rng.integers(0, args.tracks):04d}"
+        offset_frames = int(rng.integers(0, (len(tracks[track_id]) - excerpt_len) // HOP_SIZE))
+        start = offset_frames * HOP_SIZE
+        queries.append((track_id, add_noise(tracks[track_id][start:start + excerpt_len], args.snr, rng), offset_frames))
+
+    print(f"{'setting':34} {'hashes':>9} {'hash/s':>8} {'index':>9} {'x RT':>7} {'acc':>6} {'q p50':>8}")
+    results = {}
+    for label, kwargs in SETTINGS:
+        r = run_setting(tracks, queries, kwargs)
+        results[label] = dict(r, settings=kwargs)
+        print(f"{label:34} {r['hashes']:>9} {r['hashes_per_second_audio']:>8.0f} "
+              f"{r['index_bytes'] / 1e6:>7.2f}MB {r['fingerprint_x_realtime']:>7.0f} "
+              f"{r['accuracy']:>6.1%} {r['query_ms_p50']:>6.2f}ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Micro-benchmarks for the hot paths, offline (embedded in-memory Qdrant,
+synthetic catalog and audio).
+
+    ark        Ark.ingest rows/s from a synthetic tracks_features.csv
+    search     VectorEngine.search p50 / p99 at several catalog sizes
+    rust       audio_fingerprint / audio_analyze throughput (x realtime)
+    dsp        DSP.audio_callback duration per 2048-sample block
+    render     Constellation.update_stars (rasterize + Static.update) per frame
+
+Every metric carries its unit and whether higher or lower is better, so a run
+can be checked against a stored baseline: a metric that got worse by more than
+--threshold (relative) is a regression and the exit status is 1.
+
+    python benchmarks/hot_paths.py [--only search dsp] [--json out.json]
+    python benchmarks/hot_paths.py --save-baseline benchmarks/baseline.json
+    python benchmarks/hot_paths.py --baseline benchmarks/baseline.json [--threshold 0.2]
+"""
+import sys
+import os
+import csv
+import time
+import json
+import asyncio
+import argparse
+import platform
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ark import Ark
+from services import dsp as dsp_module
+from services.dsp import DSP
+from services.vector import VectorEngine
+
+try:
+    import synesthesia.core as rust_core
+except ImportError:
+    rust_core = None
+
+SAMPLE_RATE = 44100
+BLOCK = 2048
+GROUPS = ("ark", "search", "rust", "dsp", "render")
+
+def _metric(value: float, unit: str, better: str) -> dict:
+    return {"value": float(value), "unit": unit, "better": better}
+
+def _latency(name: str, samples_ms, suffix: str = "") -> dict:
+    samples = np.asarray(samples_ms)
+    return {
+        f"{name}_p50_ms{suffix}": _metric(np.percentile(samples, 50), "ms", "lower"),
+        f"{name}_p99_ms{suffix}": _metric(np.percentile(samples, 99), "ms", "lower"),
+    }
+
+def synth_audio(seconds: float, seed: int = 0) -> np.ndarray:
+    """A new note every 100 ms (with a harmonic) plus noise: enough peaks for the fingerprinter."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    notes = rng.integers(0, 24, size=int(seconds * 10) + 1)
+    pitch = 220 * 2 ** (notes[(t * 10).astype(int)] / 12)
+    audio = 0.5 * np.sin(2 * np.pi * pitch * t) + 0.25 * np.sin(4 * np.pi * pitch * t)
+    return (audio + 0.05 * rng.standard_normal(len(t))).astype(np.float32)
+
+def write_catalog_csv(path: str, rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    features = rng.random((rows, 5))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "artists", "energy", "valence", "danceability", "acousticness", "instrumentalness"])
+        for i, row in enumerate(features):
+            writer.writerow([f"track{i:08d}", f"Track {i}", f"['Artist {i % 997}']", *np.round(row, 4)])
+
+def build_catalog(n: int, seed: int = 0) -> VectorEngine:
+    ve = VectorEngine(collection_name="bench_hot_paths", local=":memory:")
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, 5000):
+        count = min(5000, n - start)
+        tracks = [{"id": f"track{start + i}", "name": f"Track {start + i}"} for i in range(count)]
+        ve.upsert_batch(tracks, list(rng.random((count, 5), dtype=np.float32)))
+    return ve
+
+def bench_ark(rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tracks_features.csv")
+        write_catalog_csv(path, rows)
+        ve = VectorEngine(collection_name="bench_ark", local=":memory:")
+        started = time.perf_counter()
+        Ark(ve).ingest(path)
+        elapsed = time.perf_counter() - started
+    return {"ark_ingest_rows_per_s": _metric(rows / elapsed, "rows/s", "higher")}
+
+def bench_search(sizes, queries: int) -> dict:
+    results = {}
+    rng = np.random.default_rng(1)
+    for n in sizes:
+        ve = build_catalog(n)
+        probes = rng.random((queries, 5), dtype=np.float32)
+        ve.search(probes[0], k=1)  # warm-up
+        latencies = []
+        for probe in probes:
+            started = time.perf_counter()
+            ve.search(probe, k=1)
+            latencies.append((time.perf_counter() - started) * 1000)
+        results.update(_latency("search", latencies, f"@{n}"))
+    return results
+
+def bench_rust(seconds: float) -> dict:
+    if rust_core is None:
+        return {}
+    audio = synth_audio(seconds)
+    results = {}
+    for name, fn in (("fingerprint", rust_core.audio_fingerprint), ("analyze", rust_core.audio_analyze)):
+        fn(audio[:SAMPLE_RATE])  # warm-up
+        started = time.perf_counter()
+        fn(audio)
+        elapsed = time.perf_counter() - started
+        results[f"{name}_x_realtime"] = _metric(seconds / elapsed, "x", "higher")
+    return results
+
+def bench_dsp(seconds: float) -> dict:
+    dsp = DSP()
+    dsp.running = True
+    audio = synth_audio(seconds, seed=2)
+    latencies = []
+    for start in range(0, len(audio) - BLOCK + 1, BLOCK):
+        block = audio[start:start + BLOCK].reshape(-1, 1)
+        started = time.perf_counter()
+        dsp.audio_callback(block, BLOCK, None, None)
+        latencies.append((time.perf_counter() - started) * 1000)
+    # The first blocks only fill the analysis window
+    return _latency("dsp_callback", latencies[10:])
+
+def bench_render(frames: int) -> dict:
+    from textual.app import App
+    from ui.widgets.scope import Constellation
+
+    class RenderApp(App):
+        def compose(self):
+            yield Constellation(id="constellation")
+
+    latencies = []
+
+    async def run():
+        app = RenderApp()
+        async with app.run_test():
+            constellation = app.query_one(Constellation)
+            rng = np.random.default_rng(3)
+            # Typical load: ~60 hashes per UI frame across the spectrum
+            stars = [rng.integers(0, 4096, size=(60, 2)) for _ in range(frames)]
+            for batch in stars:
+                started = time.perf_counter()
+                constellation.update_stars(batch, 0.2)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    asyncio.run(run())
+    return _latency("constellation_render", latencies)
+
+def run(groups, args) -> dict:
+    results = {}
+    if "ark" in groups:
+        results.update(bench_ark(args.ark_rows))
+    if "search" in groups:
+        results.update(bench_search(args.sizes, args.queries))
+    if "rust" in groups:
+        results.update(bench_rust(args.audio_seconds))
+    if "dsp" in groups:
+        results.update(bench_dsp(args.audio_seconds))
+    if "render" in groups:
+        results.update(bench_render(args.frames))
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Rows of (name, baseline, current, relative change, regressed) for metrics in both."""
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or not base["value"]:
+            continue
+        change = (current["value"] - base["value"]) / base["value"]
+        worse = -change if current["better"] == "higher" else change
+        rows.append((name, base["value"], current["value"], change, worse > threshold))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="catalog sizes for search")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--ark-rows", type=int, default=20000)
+    parser.add_argument("--audio-seconds", type=float, default=30.0)
+    parser.add_argument("--frames", type=int, default=2000, help="Constellation frames to render")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    if "rust" in args.only and rust_core is None:
+        print("synesthesia.core not built: skipping audio_fingerprint / audio_analyze")
+    results = run(args.only, args)
+
+    print(f"{'metric':<32} {'value':>12} {'unit':>7}")
+    for name, m in results.items():
+        print(f"{name:<32} {m['value']:>12.3f} {m['unit']:>7}")
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "rust_core": rust_core is not None,
+            # DSP timings are only comparable between runs on the same analyzer
+            "dsp_analyzer": "rust" if dsp_module.StreamAnalyzer else "python",
+        },
+        "results": results,
+    }
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        rows = compare(results, baseline, args.threshold)
+        print(f"\n{'metric':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+        for name, base, current, change, regressed in rows:
+            print(f"{name:<32} {base:>12.3f} {current:>12.3f} {change:>+7.1%}{'  REGRESSION' if regressed else ''}")
+        regressions = [row for row in rows if row[4]]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Load test for the multi-session navigation server.
+
+Runs the ASGI app in-process (no network, no uvicorn) against an embedded
+in-memory Qdrant catalog. Every simulated session random-walks its vector and
+ticks at a fixed rate; client-side tick latency is reported per session count,
+with micro-batching on and off (max_batch=1, one query per tick).
+
+    python benchmarks/server_sessions.py [--sessions 50 200 500] [--tracks 20000] [--json out.json]
+"""
+import sys
+import os
+import time
+import json
+import asyncio
+import argparse
+import numpy as np
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.server import create_app, SearchBatcher
+from services.vector import VectorEngine
+
+DIMENSIONS = ("energy", "valence", "danceability", "acousticness", "instrumentalness")
+
+class NullSpotify:
+    def play_track(self, track_id: str):
+        pass
+
+def build_catalog(n: int, seed: int = 0) -> VectorEngine:
+    ve = VectorEngine(collection_name="bench_sessions", local=":memory:")
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, 5000):
+        count = min(5000, n - start)
+        tracks = [{"id": f"track{start + i}", "name": f"Track {start + i}"} for i in range(count)]
+        ve.upsert_batch(tracks, list(rng.random((count, 5), dtype=np.float32)))
+    return ve
+
+async def run_load(ve, sessions: int, seconds: float, rate_hz: float, batched: bool, seed: int = 1) -> dict:
+    batcher = SearchBatcher(ve, max_batch=128 if batched else 1, workers=2 if batched else 8)
+    app = create_app(ve, NullSpotify(), batcher)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        sids = [(await client.post("/sessions")).json()["session_id"] for _ in range(sessions)]
+        deadline = time.perf_counter() + seconds
+
+        async def session_loop(index: int, sid: str):
+            rng = np.random.default_rng(seed + index)
+            vector = rng.random(5)
+            # Stagger session phases across one period
+            await asyncio.sleep(rng.random() / rate_hz)
+            while time.perf_counter() < deadline:
+                vector = np.clip(vector + rng.normal(0, 0.05, 5), 0, 1)
+                body = dict(zip(DIMENSIONS, vector.tolist()), debounce=False)
+                started = time.perf_counter()
+                await client.post(f"/sessions/{sid}/tick", json=body)
+                elapsed = time.perf_counter() - started
+                latencies.append(elapsed * 1000)
+                await asyncio.sleep(max(0.0, 1.0 / rate_hz - elapsed))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(session_loop(i, sid) for i, sid in enumerate(sids)))
+        wall = time.perf_counter() - started
+        await batcher.close()
+
+    lat = np.array(latencies)
+    stats = batcher.stats()
+    return {
+        "sessions": sessions,
+        "batched": batched,
+        "ticks": len(lat),
+        "ticks_per_s": len(lat) / wall,
+        "offered_per_s": sessions * rate_hz,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p99_ms": float(np.percentile(lat, 99)),
+        "max_ms": float(lat.max()),
+        "index_queries": stats["batches"],
+        "mean_batch": stats["mean_batch"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--tracks", type=int, default=20000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=5.0, help="ticks per second per session")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    print(f"Building catalog of {args.tracks} tracks...")
+    ve = build_catalog(args.tracks)
+
+    results = []
+    print(f"{'sessions':>8} {'mode':>9} {'offered/s':>9} {'ticks/s':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'queries':>8} {'batch':>6}")
+    for sessions in args.sessions:
+        for batched in (False, True):
+            r = asyncio.run(run_load(ve, sessions, args.seconds, args.rate, batched))
+            results.append(r)
+            print(f"{r['sessions']:>8} {'batched' if batched else 'single':>9} {r['offered_per_s']:>9.0f} "
+                  f"{r['ticks_per_s']:>8.0f} {r['p50_ms']:>7.1f} {r['p99_ms']:>7.1f} {r['max_ms']:>7.1f} "
+                  f"{r['index_queries']:>8} {r['mean_batch']:>6.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
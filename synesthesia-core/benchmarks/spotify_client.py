@@ -0,0 +1,108 @@
+"""
+Load test of SpotifyClient against the local fake Web API (services/fake_spotify.py).
+
+Starts the fake in-process on a background uvicorn thread, then N worker
+threads each loop search -> get_track_details -> play_track through real
+HTTP for a few seconds. Reports client-side latency per call and what the
+fake saw (429s, injected failures, token refreshes).
+
+    python benchmarks/spotify_client.py [--threads 1 4 16] [--latency lognormal:60,0.5] [--rate 50] [--json out.json]
+"""
+import sys
+import os
+import time
+import json
+import socket
+import argparse
+import threading
+import numpy as np
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.catalog import ADJECTIVES, NOUNS
+from services.fake_spotify import create_fake_spotify, FakeSpotifyConfig
+from services.spotify import SpotifyClient
+
+def start_fake(config: FakeSpotifyConfig) -> str:
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(create_fake_spotify(config), host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+def run_load(base: str, threads: int, seconds: float) -> dict:
+    httpx.post(f"{base}/fake/reset")
+    latencies = {"search": [], "details": [], "play": []}
+    deadline = time.perf_counter() + seconds
+
+    def worker(index: int):
+        client = SpotifyClient(api_base=base)
+        rng = np.random.default_rng(index)
+        while time.perf_counter() < deadline:
+            query = f"{ADJECTIVES[rng.integers(len(ADJECTIVES))]} {NOUNS[rng.integers(len(NOUNS))]}"
+            started = time.perf_counter()
+            found = client.search(query)
+            latencies["search"].append((time.perf_counter() - started) * 1000)
+            if not found.get("id"):
+                continue
+            started = time.perf_counter()
+            client.get_track_details(found["id"])
+            latencies["details"].append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            client.play_track(found["id"])
+            latencies["play"].append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    wall = time.perf_counter() - started
+
+    seen = httpx.get(f"{base}/fake/stats").json()["endpoints"]
+    row = {"threads": threads, "calls_per_s": sum(len(v) for v in latencies.values()) / wall}
+    for name, values in latencies.items():
+        lat = np.array(values) if values else np.zeros(1)
+        row[f"{name}_p50_ms"] = float(np.percentile(lat, 50))
+        row[f"{name}_p99_ms"] = float(np.percentile(lat, 99))
+    row["http_requests"] = sum(e["requests"] for e in seen.values())
+    row["rate_limited"] = sum(e["rate_limited"] for e in seen.values())
+    row["failures"] = sum(e["errors"] for e in seen.values())
+    row["tokens"] = seen["token"]["ok"]
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--latency", default="lognormal:60,0.5", help="fake server latency spec")
+    parser.add_argument("--rate", type=float, default=0.0, help="fake server requests/s limit (0 = none)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    base = start_fake(FakeSpotifyConfig(latency=args.latency, rate=args.rate, error_rate=args.error_rate))
+
+    results = []
+    print(f"{'threads':>7} {'calls/s':>8} {'search p50':>11} {'p99':>6} {'details p50':>12} {'p99':>6} "
+          f"{'play p50':>9} {'p99':>6} {'http':>6} {'429':>5} {'fail':>5}")
+    for threads in args.threads:
+        r = run_load(base, threads, args.seconds)
+        results.append(r)
+        print(f"{r['threads']:>7} {r['calls_per_s']:>8.1f} {r['search_p50_ms']:>11.0f} {r['search_p99_ms']:>6.0f} "
+              f"{r['details_p50_ms']:>12.0f} {r['details_p99_ms']:>6.0f} {r['play_p50_ms']:>9.0f} "
+              f"{r['play_p99_ms']:>6.0f} {r['http_requests']:>6} {r['rate_limited']:>5} {r['failures']:>5}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
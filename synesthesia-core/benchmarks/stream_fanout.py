@@ -0,0 +1,141 @@
+"""
+Throughput / fan-out benchmark for the binary stream (services/stream.py).
+
+1. Encoding cost of FEATURES / STARS / NAV messages vs. the equivalent JSON.
+2. StreamHub fan-out to N in-process subscribers for a few seconds: DSP
+   frames at `--fps`, navigation events at `--nav-hz`. A fraction of the
+   subscribers are slow (read at 5 Hz); they must drop visualization frames
+   but receive every navigation event. Socket I/O is not included.
+
+    python benchmarks/stream_fanout.py [--subscribers 10 100 1000] [--json out.json]
+"""
+import sys
+import os
+import time
+import json
+import asyncio
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mailbox import FrameMailbox
+from services.metrics import metrics
+from services.stream import StreamHub, encode_features, encode_stars, encode_nav
+
+TRACK = {"spotify_id": "4uLU6hMCjMI75M1A2tKUQC", "title": "Example Track", "artist": "Example Artist",
+         "energy": 0.71, "valence": 0.42, "danceability": 0.66, "acousticness": 0.12, "instrumentalness": 0.0}
+
+def bench_encoding(rounds: int = 20000) -> dict:
+    box = FrameMailbox()
+    rng = np.random.default_rng(0)
+    box.publish(rms=0.2, flatness=0.1, centroid=1800.0, bpm=124.0, tempo_confidence=0.8,
+                stars=rng.integers(0, 4096, size=(120, 2)).astype(np.uint16))
+    frames, stars = box.drain(), box.drain_stars()
+    result = {"type": "found", "distance": 0.05, "track": TRACK}
+
+    def timed(fn):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            out = fn()
+        return (time.perf_counter() - started) / rounds * 1e6, len(out)
+
+    def as_json():
+        frame = {name: frames[name][0].item() for name in frames.dtype.names}
+        return json.dumps({"frame": frame, "stars": stars.tolist()}).encode()
+
+    rows = {
+        "features": timed(lambda: encode_features(frames)),
+        "stars_120": timed(lambda: encode_stars(stars, 0)),
+        "nav": timed(lambda: encode_nav(result, 1)),
+        "json_frame_and_stars": timed(as_json),
+    }
+    return {name: {"us": us, "bytes": size} for name, (us, size) in rows.items()}
+
+async def bench_fanout(subscribers: int, seconds: float, fps: float, nav_hz: float, slow_fraction: float) -> dict:
+    hub = StreamHub(max_pending=4)
+    box = FrameMailbox()
+    rng = np.random.default_rng(1)
+    metrics.histogram("stream_fanout").reset()
+
+    n_slow = int(subscribers * slow_fraction)
+    subs = [hub.subscribe() for _ in range(subscribers)]
+    received = {id(s): {"viz": 0, "nav": 0} for s in subs}
+    running = True
+
+    async def client(sub, period):
+        counts = received[id(sub)]
+        while running:
+            message = await sub.next()
+            counts["nav" if message[0] == 3 else "viz"] += 1
+            if period:
+                await asyncio.sleep(period)
+
+    tasks = [asyncio.ensure_future(client(s, 0.2 if i < n_slow else 0.0)) for i, s in enumerate(subs)]
+
+    published = nav_events = 0
+    started = time.perf_counter()
+    next_nav = started
+    while time.perf_counter() - started < seconds:
+        box.publish(rms=0.2, flatness=0.1, stars=rng.integers(0, 4096, size=(60, 2)).astype(np.uint16))
+        hub.publish_frames(box.drain(), box.drain_stars())
+        published += 1
+        if time.perf_counter() >= next_nav:
+            hub.publish_nav({"type": "found", "distance": 0.1, "track": TRACK})
+            nav_events += 1
+            next_nav += 1.0 / nav_hz
+        await asyncio.sleep(1.0 / fps)
+    elapsed = time.perf_counter() - started
+
+    # Let everyone catch up on queued navigation events
+    await asyncio.sleep(0.5)
+    running = False
+    for task in tasks:
+        task.cancel()
+
+    slow, fast = subs[:n_slow], subs[n_slow:]
+    fanout = metrics.histogram("stream_fanout").snapshot()
+    delivered = sum(c["viz"] + c["nav"] for c in received.values())
+    return {
+        "subscribers": subscribers,
+        "frames_per_s": published / elapsed,
+        "messages_delivered_per_s": delivered / elapsed,
+        "fanout_p50_ms": fanout["p50_ms"],
+        "fanout_p99_ms": fanout["p99_ms"],
+        "fast_dropped": sum(s.dropped for s in fast),
+        "slow_dropped_pct": 100.0 * sum(s.dropped for s in slow) / max(1, published * 2 * len(slow)),
+        "nav_published": nav_events,
+        "nav_lost": sum(nav_events - received[id(s)]["nav"] for s in subs),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--fps", type=float, default=44100 / 2048, help="DSP frames per second")
+    parser.add_argument("--nav-hz", type=float, default=5.0)
+    parser.add_argument("--slow", type=float, default=0.1, help="fraction of slow subscribers")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    encoding = bench_encoding()
+    print(f"{'message':<22} {'us':>7} {'bytes':>7}")
+    for name, row in encoding.items():
+        print(f"{name:<22} {row['us']:>7.2f} {row['bytes']:>7}")
+
+    fanout = []
+    print(f"\n{'subs':>6} {'frames/s':>9} {'msgs/s':>9} {'fanout p50':>11} {'p99 ms':>7} "
+          f"{'fast drop':>10} {'slow drop%':>11} {'nav lost':>9}")
+    for n in args.subscribers:
+        r = asyncio.run(bench_fanout(n, args.seconds, args.fps, args.nav_hz, args.slow))
+        fanout.append(r)
+        print(f"{r['subscribers']:>6} {r['frames_per_s']:>9.1f} {r['messages_delivered_per_s']:>9.0f} "
+              f"{r['fanout_p50_ms']:>11.3f} {r['fanout_p99_ms']:>7.3f} {r['fast_dropped']:>10} "
+              f"{r['slow_dropped_pct']:>11.1f} {r['nav_lost']:>9}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"encoding": encoding, "fanout": fanout}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import sys
+import os
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# --- Path Hack (Acceptable for simple scripts, but brittle) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fingerprint_store import FingerprintStore
+from services.library import LibraryFingerprinter
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint a directory of WAV files into the fingerprint store.")
+    parser.add_argument("root", help="Directory to walk for .wav files")
+    parser.add_argument("--store", default="data/fingerprints", help="Fingerprint store directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--commit-every", type=int, default=200, help="Files per committed segment")
+    args = parser.parse_args()
+
+    store = FingerprintStore.open(args.store)
+    fingerprinter = LibraryFingerprinter(store, workers=args.workers, commit_every=args.commit_every)
+    stats = fingerprinter.run(args.root, callback=logger.info)
+
+    # Let a compaction triggered by the last commit finish before exiting
+    store.wait_for_compaction()
+
+    if stats["failed"]:
+        logger.warning(f"{stats['failed']} files failed; re-run to retry them.")
+
+if __name__ == "__main__":
+    main()
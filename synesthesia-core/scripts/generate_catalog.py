@@ -0,0 +1,50 @@
+import sys
+import os
+import time
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# --- Path Hack (Acceptable for simple scripts, but brittle) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.catalog import SyntheticCatalog
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic track catalog into a CSV or the vector store.")
+    parser.add_argument("rows", type=int, help="Number of tracks")
+    parser.add_argument("--csv", help="Write a tracks_features.csv-style file (for Ark.ingest) instead of upserting")
+    parser.add_argument("--local", help="Embedded Qdrant path instead of the server (':memory:' to just time it)")
+    parser.add_argument("--collection", default="synesthesia_tracks_v1", help="Target collection")
+    parser.add_argument("--batch", type=int, default=5000, help="Upsert batch size")
+    parser.add_argument("--seed", type=int, default=0, help="Same seed, same catalog")
+    args = parser.parse_args()
+
+    catalog = SyntheticCatalog(seed=args.seed)
+    started = time.perf_counter()
+
+    if args.csv:
+        catalog.write_csv(args.csv, args.rows)
+    else:
+        from services.vector import VectorEngine
+        ve = VectorEngine(collection_name=args.collection, local=args.local)
+        report_every = max(args.batch, args.rows // 20)
+
+        def progress(done):
+            if done % report_every < args.batch or done == args.rows:
+                rate = done / (time.perf_counter() - started)
+                logger.info(f"{done}/{args.rows} tracks ({rate:.0f}/s)")
+
+        catalog.ingest(ve, args.rows, batch_size=args.batch, callback=progress)
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Generated {args.rows} tracks in {elapsed:.1f} s ({args.rows / elapsed:.0f}/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import sys
+import os
+import json
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# --- Path Hack (Acceptable for simple scripts, but brittle) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.replay import Replayer, build_controller
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session headless and report latency / throughput.")
+    parser.add_argument("log", help="Session log (.synrec) written by the recorder")
+    parser.add_argument("--speed", default="1", help="Replay speed factor, or 'max' to feed records back to back")
+    parser.add_argument("--no-searches", action="store_true", help="Skip recorded text searches (no Spotify needed)")
+    parser.add_argument("--playback", action="store_true", help="Actually play switched-to tracks on Spotify")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    speed = None if args.speed == "max" else float(args.speed)
+    controller = build_controller(playback=args.playback, searches=not args.no_searches)
+    report = Replayer(controller, speed=speed, searches=not args.no_searches).run(args.log)
+    controller.stop()
+
+    logger.info(f"Replayed {sum(report['records'].values())} records ({report['recorded_s']:.1f} s recorded) "
+                f"in {report['wall_s']:.1f} s: {report['records_per_s']:.0f} records/s, "
+                f"audio {report['audio_realtime_factor']:.1f}x realtime")
+    for name, hist in report["latency"].items():
+        logger.info(f"{name:<14} n={hist['count']:<6} p50 {hist['p50_ms']:.2f} ms  p99 {hist['p99_ms']:.2f} ms  "
+                    f"max {hist['max_ms']:.2f} ms")
+    agreement = report["agreement"]
+    logger.info(f"Results: {agreement['same_type']}/{agreement['compared']} same type, "
+                f"{agreement['same_track']}/{agreement['compared']} same track")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import math
+import time
+import threading
+import collections
+import numpy as np
+from typing import Callable, Dict, Optional
+
+from services.mailbox import FrameMailbox
+
+DIMENSIONS = ("energy", "valence", "danceability", "acousticness", "instrumentalness")
+
+def features_to_target(frame: np.void, base: Dict[str, float]) -> Dict[str, float]:
+    """
+    Map one DSP frame onto the 5D navigation space.
+      rms       -> energy (-50 dBFS .. -5 dBFS)
+      flatness  -> acousticness (inverse: tonal = acoustic, noisy = electronic)
+      centroid  -> valence (brighter = happier)
+      tempo     -> danceability (confident tempo near 120 BPM)
+    Instrumentalness can't be heard from these features and is kept from base.
+    """
+    db = 20.0 * math.log10(max(float(frame["rms"]), 1e-6))
+    energy = (db + 50.0) / 45.0
+    acousticness = 1.0 - float(frame["flatness"]) / 0.4
+    valence = float(frame["centroid"]) / 4000.0
+
+    confidence = float(frame["tempo_confidence"])
+    groove = math.exp(-((float(frame["bpm"]) - 120.0) / 40.0) ** 2)
+    danceability = confidence * groove + (1.0 - confidence) * base["danceability"]
+
+    target = dict(base)
+    for dim, value in (("energy", energy), ("valence", valence),
+                       ("danceability", danceability), ("acousticness", acousticness)):
+        target[dim] = min(1.0, max(0.0, value))
+    return target
+
+class AudioPilot:
+    """
+    Closed-loop navigation: live DSP features steer the target vector.
+
+    A dedicated thread wakes at a fixed rate (absolute schedule, so the rate
+    holds even when a search is slow), reads the newest frame from the DSP
+    mailbox's latest-value slot, folds it into an exponentially smoothed 5D
+    target and calls controller.tick() with it. While running, navigation
+    uses hysteresis so small wobbles in the target don't restart playback.
+
+    Every tick is timed from the frame's publish time, giving the end-to-end
+    latency (feature extraction -> search -> start_playback) against budget_ms.
+    switch_margin is in cosine distance (see Navigation). clock/sleep pace
+    the thread and can be replaced to drive it deterministically.
+    """
+
+    def __init__(self, controller, mailbox: FrameMailbox, rate_hz: float = 10.0, smoothing_s: float = 1.5,
+                 budget_ms: float = 250.0, switch_margin: float = 0.02, min_dwell_s: float = 8.0,
+                 on_result: Optional[Callable[[Dict], None]] = None,
+                 clock: Callable[[], float] = time.perf_counter, sleep: Callable[[float], None] = time.sleep):
+        self.controller = controller
+        self.mailbox = mailbox
+        self.rate_hz = rate_hz
+        self.clock = clock
+        self.sleep = sleep
+        self.smoothing_s = smoothing_s
+        self.budget_ms = budget_ms
+        self.switch_margin = switch_margin
+        self.min_dwell_s = min_dwell_s
+        self.on_result = on_result
+
+        self.target: Dict[str, float] = {dim: 0.5 for dim in DIMENSIONS}
+        self.target["instrumentalness"] = 0.0
+        self.last_seq = -1
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._saved_hysteresis = None
+
+        # Instrumentation (latest N ticks, milliseconds)
+        self.frame_age_ms = collections.deque(maxlen=1000)
+        self.tick_ms = collections.deque(maxlen=1000)
+        self.switch_latency_ms = collections.deque(maxlen=200)
+        self.ticks = 0
+        self.overruns = 0
+        self.over_budget = 0
+
+    def start(self, initial: Optional[Dict[str, float]] = None):
+        if self.running:
+            return
+        if initial:
+            self.target = dict(initial)
+
+        nav = self.controller.nav
+        self._saved_hysteresis = (nav.switch_margin, nav.min_dwell_ms)
+        nav.switch_margin = self.switch_margin
+        nav.min_dwell_ms = self.min_dwell_s * 1000
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+        if self._saved_hysteresis:
+            self.controller.nav.switch_margin, self.controller.nav.min_dwell_ms = self._saved_hysteresis
+            self._saved_hysteresis = None
+
+    def update_target(self, dt: float) -> Optional[np.void]:
+        """Fold the newest DSP frame into the smoothed target. Returns the frame, or None if stale."""
+        frame = self.mailbox.latest()
+        if frame is None or int(frame["seq"]) == self.last_seq:
+            return None
+        self.last_seq = int(frame["seq"])
+
+        raw = features_to_target(frame, self.target)
+        alpha = 1.0 - math.exp(-dt / self.smoothing_s) if self.smoothing_s > 0 else 1.0
+        for dim in DIMENSIONS:
+            self.target[dim] += alpha * (raw[dim] - self.target[dim])
+        return frame
+
+    def step(self, dt: float) -> Optional[Dict]:
+        """One closed-loop iteration (also usable headless without the thread)."""
+        frame = self.update_target(dt)
+        if frame is None or self.controller.ingesting:
+            return None
+
+        switches = self.controller.nav.switches
+        started = time.perf_counter()
+        age = (started - float(frame["time"])) * 1000
+        result = self.controller.tick(dict(self.target))
+        finished = time.perf_counter()
+
+        self.ticks += 1
+        self.frame_age_ms.append(age)
+        self.tick_ms.append((finished - started) * 1000)
+
+        # A track switch happened in this tick: frame publish -> start_playback returned
+        if self.controller.nav.switches != switches:
+            latency = (finished - float(frame["time"])) * 1000
+            self.switch_latency_ms.append(latency)
+            if latency > self.budget_ms:
+                self.over_budget += 1
+
+        if result and self.on_result:
+            self.on_result(result)
+        return result
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        started = self.clock()
+        n = 0
+        while self.running:
+            try:
+                self.step(period)
+            except Exception:
+                pass
+
+            n += 1
+            delay = started + n * period - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+            else:
+                # Missed the slot: count it and skip ahead rather than burst-catching-up
+                self.overruns += 1
+                n = int((self.clock() - started) / period)
+
+    def report(self) -> Dict:
+        """Latency summary (ms) for the instrumented closed loop."""
+        def pct(values, q):
+            return float(np.percentile(values, q)) if values else 0.0
+
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "budget_ms": self.budget_ms,
+            "over_budget": self.over_budget,
+            "frame_age_ms_p50": pct(self.frame_age_ms, 50),
+            "tick_ms_p50": pct(self.tick_ms, 50),
+            "tick_ms_p99": pct(self.tick_ms, 99),
+            "switch_latency_ms_p50": pct(self.switch_latency_ms, 50),
+            "switch_latency_ms_max": max(self.switch_latency_ms, default=0.0),
+            "switches": self.controller.nav.switches,
+            "holds": self.controller.nav.holds,
+        }
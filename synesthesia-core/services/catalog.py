@@ -0,0 +1,155 @@
+"""
+Synthetic track catalog at arbitrary scale.
+
+Tracks are drawn from a mixture of genre clusters, each with its own mean
+per feature (classical: quiet, acoustic, instrumental; electronic: loud,
+danceable, instrumental; ...), so the catalog has the multi-modal shape and
+cross-feature correlations of the real tracks_features.csv rather than a
+uniform cube. Rows are a pure function of (seed, index): any slice can be
+regenerated on its own (rows come in fixed blocks with one random stream
+each) and IDs never collide.
+"""
+import csv
+import numpy as np
+from typing import Dict, Iterator, List, Tuple
+
+DIMENSIONS = ("energy", "valence", "danceability", "acousticness", "instrumentalness")
+
+# name: (weight, mean energy, valence, danceability, acousticness, instrumentalness)
+GENRES = {
+    "pop":        (0.20, 0.65, 0.55, 0.65, 0.20, 0.02),
+    "rock":       (0.15, 0.75, 0.45, 0.50, 0.10, 0.05),
+    "hip hop":    (0.12, 0.65, 0.50, 0.75, 0.15, 0.01),
+    "electronic": (0.10, 0.80, 0.40, 0.68, 0.05, 0.60),
+    "latin":      (0.10, 0.72, 0.75, 0.75, 0.25, 0.01),
+    "classical":  (0.08, 0.15, 0.25, 0.30, 0.92, 0.85),
+    "folk":       (0.08, 0.35, 0.45, 0.50, 0.80, 0.05),
+    "jazz":       (0.07, 0.35, 0.50, 0.55, 0.70, 0.40),
+    "metal":      (0.05, 0.92, 0.30, 0.40, 0.01, 0.20),
+    "ambient":    (0.05, 0.15, 0.15, 0.30, 0.80, 0.90),
+}
+# Beta concentration per dimension: higher = tighter around the genre mean.
+# Instrumentalness is loose, which piles most vocal tracks up near 0.
+CONCENTRATION = np.array([8.0, 6.0, 10.0, 4.0, 1.5])
+
+ADJECTIVES = ("Midnight", "Golden", "Electric", "Broken", "Silent", "Neon", "Velvet", "Crimson", "Wild",
+              "Frozen", "Hollow", "Endless", "Paper", "Burning", "Lonely", "Cosmic", "Bitter", "Sweet")
+NOUNS = ("Heart", "River", "Dreams", "City", "Fire", "Ocean", "Echo", "Highway", "Garden", "Mirror",
+         "Thunder", "Shadows", "Summer", "Machine", "Satellite", "Rain", "Horizon", "Ghost")
+
+BASE62 = np.frombuffer(b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz", dtype=np.uint8)
+# Odd multiplier: index -> index * MIX is a bijection on uint64, so IDs are unique
+MIX = np.uint64(0x9E3779B97F4A7C15)
+
+TITLES = [f"{adjective} {noun}" for adjective in ADJECTIVES for noun in NOUNS]
+# Rows are generated in blocks of this many, each from its own random stream
+BLOCK = 4096
+
+CSV_COLUMNS = ("id", "name", "album", "artists", "genre", *DIMENSIONS, "tempo", "duration_ms", "year")
+
+class SyntheticCatalog:
+    def __init__(self, seed: int = 0, artists: int = 200_000):
+        self.seed = seed
+        self.artists = artists
+        self.genres = list(GENRES)
+        table = np.array([GENRES[g] for g in self.genres])
+        self._cumulative = np.cumsum(table[:, 0] / table[:, 0].sum())
+        self._means = np.clip(table[:, 1:], 0.01, 0.99)
+        # 11-char ID prefix fixed per seed, 11 chars from the index
+        prefix_rng = np.random.default_rng([seed, 0])
+        self._prefix = BASE62[prefix_rng.integers(0, 62, size=11)].tobytes().decode("ascii")
+
+    def ids(self, start: int, count: int) -> List[str]:
+        """22-character base62 IDs (Spotify-shaped) for rows [start, start + count)."""
+        x = (np.arange(start, start + count, dtype=np.uint64) + np.uint64(self.seed + 1)) * MIX
+        digits = np.empty((count, 11), dtype=np.uint8)
+        for i in range(10, -1, -1):
+            digits[:, i] = BASE62[(x % np.uint64(62)).astype(np.intp)]
+            x //= np.uint64(62)
+        return [self._prefix + suffix.decode("ascii") for suffix in digits.view("S11").ravel().tolist()]
+
+    def _sample(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        genre = np.searchsorted(self._cumulative, rng.random(count), side="right").clip(0, len(self.genres) - 1)
+        means = self._means[genre]
+        features = rng.beta(means * CONCENTRATION, (1 - means) * CONCENTRATION)
+        return genre, features.astype(np.float32)
+
+    def _block(self, block: int) -> Dict[str, np.ndarray]:
+        rng = np.random.default_rng([self.seed, 1, block])
+        genre, vectors = self._sample(rng, BLOCK)
+        return {
+            "genre": genre,
+            "vectors": vectors,
+            "title": rng.integers(0, len(TITLES), size=BLOCK),
+            # Zipf-distributed artist popularity: a few artists own many tracks
+            "artist": np.minimum(rng.zipf(1.3, size=BLOCK), self.artists) - 1,
+            "tempo": rng.normal(80 + 70 * vectors[:, 0], 15).clip(50, 220).round(3),
+            "duration_ms": rng.lognormal(np.log(215_000), 0.3, size=BLOCK).astype(np.int64),
+            "year": 2024 - rng.exponential(12, size=BLOCK).astype(np.int64),
+        }
+
+    def columns(self, start: int, count: int) -> Dict[str, list]:
+        """Rows [start, start + count) column by column; "vectors" is a float32 (count, 5) array."""
+        first, last = start // BLOCK, (start + count - 1) // BLOCK
+        blocks = [self._block(b) for b in range(first, last + 1)]
+        offset = start - first * BLOCK
+        raw = {key: np.concatenate([b[key] for b in blocks])[offset:offset + count] for key in blocks[0]}
+
+        titles = raw["title"].tolist()
+        return {
+            "id": self.ids(start, count),
+            "name": [TITLES[t] for t in titles],
+            "album": [NOUNS[t % len(NOUNS)] + " Sessions" for t in titles],
+            "artist": [f"Artist {a:06d}" for a in raw["artist"].tolist()],
+            "genre": [self.genres[g] for g in raw["genre"].tolist()],
+            "vectors": raw["vectors"],
+            "tempo": raw["tempo"].tolist(),
+            "duration_ms": raw["duration_ms"].tolist(),
+            "year": raw["year"].tolist(),
+        }
+
+    def chunk(self, start: int, count: int) -> Tuple[List[Dict], np.ndarray]:
+        """Track dicts (the Ark / upsert_batch shape) and vectors for rows [start, start + count)."""
+        cols = self.columns(start, count)
+        vectors = cols["vectors"]
+        tracks = [
+            {"id": id_, "name": name, "album": album, "artist": artist, "genre": genre,
+             **dict(zip(DIMENSIONS, values)), "tempo": tempo, "duration_ms": duration, "year": year}
+            for id_, name, album, artist, genre, values, tempo, duration, year in zip(
+                cols["id"], cols["name"], cols["album"], cols["artist"], cols["genre"], vectors.tolist(),
+                cols["tempo"], cols["duration_ms"], cols["year"])
+        ]
+        return tracks, vectors
+
+    def batches(self, total: int, batch_size: int = 10_000) -> Iterator[Tuple[List[Dict], np.ndarray]]:
+        for start in range(0, total, batch_size):
+            yield self.chunk(start, min(batch_size, total - start))
+
+    def write_csv(self, path: str, total: int, batch_size: int = 50_000) -> int:
+        """Stream `total` rows to a CSV in the tracks_features.csv layout (readable by Ark.ingest)."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            for start in range(0, total, batch_size):
+                cols = self.columns(start, min(batch_size, total - start))
+                features = cols["vectors"].astype(np.float64).round(4).T.tolist()
+                writer.writerows(zip(
+                    cols["id"], cols["name"], cols["album"], [f"['{a}']" for a in cols["artist"]], cols["genre"],
+                    *features, cols["tempo"], cols["duration_ms"], cols["year"],
+                ))
+        return total
+
+    def ingest(self, vector_engine, total: int, batch_size: int = 5_000, callback=None) -> int:
+        """Stream `total` tracks straight into a VectorEngine (no CSV in between)."""
+        done = 0
+        for tracks, vectors in self.batches(total, batch_size):
+            vector_engine.upsert_batch(tracks, list(vectors))
+            done += len(tracks)
+            if callback:
+                callback(done)
+        return done
+
+    def queries(self, count: int, seed: int = 1) -> np.ndarray:
+        """Query vectors from the catalog's own distribution (where users actually navigate)."""
+        _, vectors = self._sample(np.random.default_rng([self.seed, 2, seed]), count)
+        return vectors
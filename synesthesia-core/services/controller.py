@@ -1,7 +1,8 @@
+import os
 import threading
 import uuid
 import numpy as np
-from typing import Optional, Dict, List, Tuple
+from typing import Callable, Optional, Dict, List, Tuple
 import time
 
 from services.vector import VectorEngine
@@ -9,28 +10,232 @@ from services.spotify import SpotifyClient
 from services.dsp import DSP
 from services.ark import Ark
 from services.navigation import Navigation
+from services.autopilot import AudioPilot
+from services.fingerprint import Matcher
+from services.fingerprint_store import FingerprintStore
+from services.metrics import metrics
+from services.profiler import SamplingProfiler
+from services.recorder import SessionRecorder
 import synesthesia.core as rust_core
 
+FINGERPRINT_STORE = "data/fingerprints"
+
+# Readiness of each background service
+PENDING, STARTING, READY, FAILED = "pending", "starting", "ready", "failed"
+# Built concurrently by start(); "navigation" follows once vector + spotify are up
+SERVICES = ("vector", "spotify", "audio", "fingerprint")
+# How long a request waits for a service that is still starting (s)
+SERVICE_WAIT = 15.0
+# Per-session profiles land here (SYN_PROFILE=1 profiles from startup)
+PROFILE_DIR = os.getenv("SYN_PROFILE_DIR", "profiles")
+# Session recordings (SYN_RECORD=1 records from startup); see services/replay.py
+RECORD_DIR = os.getenv("SYN_RECORD_DIR", "recordings")
+
 class SystemController:
-    def __init__(self):
-        # Initialize Services
-        self.ve = VectorEngine()
-        self.sp = SpotifyClient()
+    """
+    Owns every service. Only the cheap parts (DSP state, mailbox, pilot) are
+    built in __init__; start() brings up the vector store, Spotify, the audio
+    device and the fingerprint index concurrently on background threads, so a
+    UI can draw its first frame straight away and light up as each service
+    reports in through on_status(name, state).
+
+    Until a service is ready its attribute is None and the calls that need it
+    wait for it (handle_search, ingestion) or return nothing (tick).
+    """
+
+    def __init__(self, on_status: Optional[Callable[[str, str], None]] = None):
+        # Needed by the UI on its first frame
         self.dsp = DSP()
-        self.ark = Ark(self.ve)
-        self.nav = Navigation(self.ve, self.sp)
+        # Closed-loop mode: live DSP features steer navigation
+        self.pilot = AudioPilot(self, self.dsp.mailbox)
+
+        # Per-stage latency / counters (shared, process-wide registry)
+        self.metrics = metrics
+        mailbox = self.dsp.mailbox
+        metrics.gauge("dsp_frames_published", lambda: mailbox.published)
+        metrics.gauge("dsp_dropped_frames", lambda: mailbox.dropped_frames)
+        metrics.gauge("dsp_dropped_stars", lambda: mailbox.dropped_stars)
+        metrics.gauge("pilot_overruns", lambda: self.pilot.overruns)
+
+        # Opt-in sampling profiler over the hot paths (idle = no cost)
+        self.profiler = SamplingProfiler({
+            "tick": SystemController.tick,
+            "handle_search": SystemController.handle_search,
+            "ingest": Ark.ingest,
+            "dsp": DSP.audio_callback,
+        })
+
+        # Built by start()
+        self.ve: Optional[VectorEngine] = None
+        self.sp: Optional[SpotifyClient] = None
+        self.ark: Optional[Ark] = None
+        self.nav: Optional[Navigation] = None
+        # Fingerprint match index (memory-mapped, so opening is near-instant)
+        self.fingerprint_index: Optional[Matcher] = None
+
+        self.on_status = on_status
+        self.status: Dict[str, str] = {name: PENDING for name in SERVICES + ("navigation",)}
+        self.errors: Dict[str, str] = {}
+        # Time from start() until each service settled (ms)
+        self.init_ms: Dict[str, float] = {}
+        # Set once a service is READY or FAILED
+        self._settled = {name: threading.Event() for name in self.status}
+        self._link_lock = threading.Lock()
+        self.started_at: Optional[float] = None
+
+        # Session recorder (vectors, ticks + results, searches, raw audio)
+        self.recorder: Optional[SessionRecorder] = None
         
         # State
         self.ingesting = False
 
-    def start(self):
-        """Start background services."""
-        self.dsp.start()
+    def start(self, wait: bool = False, services: Tuple[str, ...] = SERVICES):
+        """
+        Start background services (concurrently). wait=True blocks until all
+        settled. Services left out of `services` are marked failed ("disabled").
+        """
+        if self.started_at is not None:
+            return
+        self.started_at = time.perf_counter()
+        if os.getenv("SYN_PROFILE"):
+            self.profiler.start()
+        if os.getenv("SYN_RECORD"):
+            self.start_recording()
+        inits = (
+            ("vector", self._init_vector),
+            ("spotify", self._init_spotify),
+            ("audio", self.dsp.start),
+            ("fingerprint", self._init_fingerprint),
+        )
+        for name, init in inits:
+            if name in services:
+                threading.Thread(target=self._init_service, args=(name, init), daemon=True).start()
+            else:
+                self.errors[name] = "disabled"
+                self._set_status(name, FAILED)
+                if name in ("vector", "spotify"):
+                    self._link_navigation()
+        if wait:
+            self.wait_ready()
+
+    def _init_vector(self):
+        self.ve = VectorEngine()
+        self.ark = Ark(self.ve)
+
+    def _init_spotify(self):
+        self.sp = SpotifyClient()
+
+    def _init_fingerprint(self):
+        if os.path.isdir(FINGERPRINT_STORE):
+            self.fingerprint_index = FingerprintStore.open(FINGERPRINT_STORE)
+
+    def _init_service(self, name: str, init: Callable[[], None]):
+        self._set_status(name, STARTING)
+        try:
+            init()
+        except Exception as e:
+            self.errors[name] = str(e)
+            self._set_status(name, FAILED)
+        else:
+            self._set_status(name, READY)
+
+        if name in ("vector", "spotify"):
+            self._link_navigation()
+
+    def _link_navigation(self):
+        # Runs on whichever of vector / spotify settles last
+        with self._link_lock:
+            if self.status["navigation"] != PENDING:
+                return
+            if FAILED in (self.status["vector"], self.status["spotify"]):
+                self.errors["navigation"] = "needs vector store and Spotify"
+                self._set_status("navigation", FAILED)
+            elif self.status["vector"] == READY and self.status["spotify"] == READY:
+                self.nav = Navigation(self.ve, self.sp)
+                self._set_status("navigation", READY)
+
+    def _set_status(self, name: str, state: str):
+        self.status[name] = state
+        if state in (READY, FAILED):
+            self.init_ms[name] = (time.perf_counter() - self.started_at) * 1000
+            self._settled[name].set()
+        if self.on_status:
+            try:
+                self.on_status(name, state)
+            except Exception:
+                pass
+
+    def ready(self, *names: str) -> bool:
+        return all(self.status[name] == READY for name in names)
+
+    def wait_ready(self, *names: str, timeout: Optional[float] = None) -> bool:
+        """Block until the services (default: all) settled. True if all are READY."""
+        names = names or tuple(self.status)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for name in names:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not self._settled[name].wait(remaining):
+                return False
+        return self.ready(*names)
+
+    def _not_ready(self, *names: str) -> str:
+        pending = [f"{name} {self.errors.get(name, self.status[name])}" for name in names if self.status[name] != READY]
+        return ", ".join(pending)
 
     def stop(self):
         """Stop background services."""
+        self.pilot.stop()
         self.dsp.stop()
+        if self.profiler.running:
+            self.stop_profiling()
+        self.stop_recording()
+
+    def start_profiling(self):
+        self.profiler.start()
+
+    def stop_profiling(self) -> str:
+        """Stop the profiling session and write it to PROFILE_DIR. Returns the session folder."""
+        self.profiler.stop()
+        return self.profiler.save(PROFILE_DIR)
+
+    def start_recording(self, path: Optional[str] = None) -> SessionRecorder:
+        """Record the session to a binary log (default RECORD_DIR/session-<time>.synrec)."""
+        self.stop_recording()
+        if path is None:
+            os.makedirs(RECORD_DIR, exist_ok=True)
+            path = os.path.join(RECORD_DIR, time.strftime("session-%Y%m%d-%H%M%S.synrec"))
+        self.recorder = SessionRecorder(path)
+        self.dsp.recorder = self.recorder
+        return self.recorder
+
+    def stop_recording(self) -> Optional[str]:
+        """Stop recording. Returns the log path (None if nothing was recording)."""
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return None
+        self.dsp.recorder = None
+        recorder.close()
+        return recorder.path
+
+    def record_vector(self, vector: Dict[str, float]):
+        """Log a target vector change from the UI (no-op unless recording)."""
+        if self.recorder:
+            self.recorder.vector(vector)
+
+    def start_autopilot(self, initial: Optional[Dict[str, float]] = None, callback=None) -> bool:
+        """Let the live audio drive navigation; callback receives each tick result. False if navigation isn't up."""
+        if self.nav is None:
+            return False
+        self.pilot.on_result = callback
+        self.pilot.start(initial)
+        return True
+
+    def stop_autopilot(self) -> Dict:
+        """Return to manual navigation. Returns the latency report of the session."""
+        self.pilot.stop()
+        return self.pilot.report()
 
+    @metrics.timed("handle_search")
     def handle_search(self, query: str) -> Dict:
         """
         Unified Search Logic (formerly api.py/search).
@@ -38,6 +243,11 @@ class SystemController:
         2. Check Ark (Local DB)
         3. Terraform (Fetch features + Upsert) if missing
         """
+        if self.recorder:
+            self.recorder.search(query)
+        if not self.wait_ready("spotify", "vector", timeout=SERVICE_WAIT):
+            return {"error": "Search unavailable: " + self._not_ready("spotify", "vector")}
+
         # 1. Search Spotify
         result = self.sp.search(query)
         if not result or result.get('title') == 'Error':
@@ -94,14 +304,22 @@ class SystemController:
         
         self.ingesting = True
         def run():
-            self.ark.ingest("data/tracks_features.csv", callback=callback)
-            self.ingesting = False
+            try:
+                if self.wait_ready("vector", timeout=SERVICE_WAIT):
+                    self.ark.ingest("data/tracks_features.csv", callback=callback)
+                elif callback:
+                    callback("Ingestion skipped: " + self._not_ready("vector"))
+            finally:
+                self.ingesting = False
             
         threading.Thread(target=run, daemon=True).start()
 
     def ingest_user_playlist(self, limit: int = 50):
         """Fetch User's Top Tracks and ingest them (Green Nodes)."""
         def run():
+            if not self.wait_ready("spotify", "vector", timeout=SERVICE_WAIT):
+                print("Cannot fetch tracks: " + self._not_ready("spotify", "vector"))
+                return
             print(f"Fetching top {limit} tracks...")
             tracks = self.sp.get_initial_tracks(limit=limit)
             if not tracks:
@@ -126,14 +344,64 @@ class SystemController:
 
     def handle_suggest(self, query: str) -> List[Dict]:
         """Typeahead suggestions."""
+        if self.sp is None:
+            return []
         return self.sp.search_tracks(query, limit=5)
 
-    def tick(self, current_vector: Dict[str, float]) -> Optional[Dict]:
-        """Game Loop Tick."""
-        return self.nav.tick(current_vector)
+    def tick(self, current_vector: Dict[str, float], debounce: bool = True) -> Optional[Dict]:
+        """Navigation tick (debounce=False when the caller already debounced the change)."""
+        if self.nav is None:
+            return None
+        recorder = self.recorder
+        if recorder:
+            seq = recorder.tick(current_vector, debounce)
+            started = time.perf_counter()
+        result = self.nav.tick(current_vector, debounce)
+        if recorder:
+            recorder.result(seq, (time.perf_counter() - started) * 1000, result)
+        if result:
+            metrics.count("nav_" + result["type"])
+        return result
 
     def force_search(self, current_vector: Dict[str, float]) -> Optional[Dict]:
-        return self.nav.force_search(current_vector)
+        if self.nav is None:
+            return None
+        recorder = self.recorder
+        if recorder:
+            seq = recorder.tick(current_vector, False, forced=True)
+            started = time.perf_counter()
+        result = self.nav.force_search(current_vector)
+        if recorder:
+            recorder.result(seq, (time.perf_counter() - started) * 1000, result)
+        if result:
+            metrics.count("nav_" + result["type"])
+        return result
+
+    def identify(self, audio_data: np.ndarray, sample_rate: int = 44100, channels: int = 1) -> Optional[Dict]:
+        """
+        Identify an audio buffer (any rate / channel count) against the fingerprint index.
+        A match re-seeds Navigation at the track's vector.
+        """
+        if self.fingerprint_index is None:
+            return None
+
+        match = self.fingerprint_index.identify(audio_data, sample_rate, channels)
+        if match is None:
+            return None
+
+        track_data = self.ve.get_track_data(match['track_id']) if self.nav else None
+        if track_data is None:
+            return {"type": "identified", "match": match, "track": None, "vector": None}
+
+        vector, payload = track_data
+        self.nav.seed(vector, payload.get('spotify_id', match['track_id']))
+
+        return {
+            "type": "identified",
+            "match": match,
+            "track": payload,
+            "vector": vector
+        }
 
     def analyze_audio(self, audio_data: np.ndarray) -> Tuple[List[Tuple[int, int]], float, float]:
         """
@@ -1,33 +1,218 @@
-import sounddevice as sd
+import os
 import numpy as np
 import threading
-import queue
 import time
 import collections
-from typing import Optional
+from abc import ABC, abstractmethod
+from typing import Callable, Iterator, Optional
 
 # Try to import the Rust extension
 try:
-    from synesthesia.core import audio_analyze, audio_fingerprint
+    from synesthesia.core import StreamAnalyzer, TempoTracker, Resampler, audio_fingerprint_array
 except ImportError:
-    audio_analyze = None
-    audio_fingerprint = None
+    StreamAnalyzer = None
+    TempoTracker = None
+    Resampler = None
+    audio_fingerprint_array = None
+
+from services.mailbox import FrameMailbox, STAR_DTYPE
+from services.metrics import metrics
+from services.wav import open_wav_memmap, pcm_to_float
+
+# Column order of the StreamAnalyzer feature matrix
+FEATURE_COLUMNS = ("rms", "flatness", "centroid", "rolloff", "onset")
+
+# Same signature as a sounddevice InputStream callback
+AudioCallback = Callable[[np.ndarray, int, object, object], None]
+
+class AudioSource(ABC):
+    """
+    Produces (frames, channels) float32 blocks and hands them to a callback
+    with the sounddevice callback signature, so every source goes through the
+    exact same analysis path as the microphone.
+
+    realtime=True paces blocks at wall-clock speed; False runs as fast as possible.
+    """
+
+    def __init__(self, sample_rate: int = 44100, block_size: int = 2048, realtime: bool = True, channels: int = 1):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.realtime = realtime
+        self.channels = channels
+        self.thread: Optional[threading.Thread] = None
+        # One event per run, so a pump that outlives stop() can never see a later start()
+        self._stop: Optional[threading.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._stop is not None and not self._stop.is_set()
+
+    @abstractmethod
+    def blocks(self) -> Iterator[np.ndarray]:
+        """Yield (frames, channels) float32 blocks until the source ends (or forever)."""
+
+    def run(self, callback: AudioCallback) -> int:
+        """Pump every block through callback on the calling thread. Returns blocks delivered."""
+        self._stop = threading.Event()
+        return self._pump(callback, self._stop)
+
+    def _pump(self, callback: AudioCallback, stop: threading.Event) -> int:
+        started = time.perf_counter()
+        count = 0
+        for block in self.blocks():
+            if stop.is_set():
+                break
+            callback(block, len(block), None, None)
+            count += 1
+            if self.realtime:
+                # Absolute schedule so pacing does not drift with callback cost
+                delay = started + count * self.block_size / self.sample_rate - time.perf_counter()
+                if delay > 0 and stop.wait(delay):
+                    break
+        stop.set()
+        return count
+
+    def start(self, callback: AudioCallback):
+        self.stop()
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._pump, args=(callback, self._stop), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self._stop:
+            self._stop.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+class MicrophoneSource(AudioSource):
+    """Live input via sounddevice (imported on start so headless runs never load PortAudio)."""
+
+    def __init__(self, sample_rate: int = 44100, block_size: int = 2048, channels: int = 1):
+        super().__init__(sample_rate, block_size, realtime=True, channels=channels)
+        self.stream = None
+
+    @property
+    def running(self) -> bool:
+        return self.stream is not None
+
+    def start(self, callback: AudioCallback):
+        import sounddevice as sd
+
+        stream = sd.InputStream(
+            channels=self.channels,
+            samplerate=self.sample_rate,
+            blocksize=self.block_size,
+            callback=callback
+        )
+        stream.start()
+        self.stream = stream
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        raise RuntimeError("MicrophoneSource is callback-driven; use start()")
+
+    def stop(self):
+        if self.stream:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except:
+                pass
+        self.stream = None
+
+class WavFileSource(AudioSource):
+    """Plays a WAV file (e.g. test_audio.wav) from a read-only memory map."""
+
+    def __init__(self, path: str, block_size: int = 2048, realtime: bool = True, loop: bool = False):
+        self.samples, sample_rate = open_wav_memmap(path)
+        super().__init__(sample_rate, block_size, realtime, channels=self.samples.shape[1])
+        self.path = path
+        self.loop = loop
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        total = len(self.samples)
+        while True:
+            for start in range(0, total - self.block_size + 1, self.block_size):
+                yield pcm_to_float(self.samples[start:start + self.block_size])
+            if not self.loop or total < self.block_size:
+                return
+
+class SyntheticSource(AudioSource):
+    """
+    Deterministic test signal: a seeded note sequence on a fixed beat grid
+    with a kick on every beat and a low noise floor. The same seed always
+    yields the same samples, so runs are reproducible.
+    """
+
+    def __init__(self, sample_rate: int = 44100, block_size: int = 2048, realtime: bool = True,
+                 bpm: float = 120.0, seconds: Optional[float] = None, seed: int = 0):
+        super().__init__(sample_rate, block_size, realtime)
+        self.bpm = bpm
+        self.seconds = seconds
+        self.seed = seed
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        rng = np.random.default_rng(self.seed)
+        notes = 110.0 * 2 ** (rng.integers(0, 36, size=64) / 12)
+        beat_len = 60.0 / self.bpm
+        total = None if self.seconds is None else int(self.seconds * self.sample_rate)
+
+        n = 0
+        while total is None or n + self.block_size <= total:
+            t = (n + np.arange(self.block_size)) / self.sample_rate
+            beat = (t / beat_len).astype(np.int64)
+            since_beat = t - beat * beat_len
+
+            freq = notes[beat % len(notes)]
+            tone = 0.25 * np.sin(2 * np.pi * freq * t) + 0.1 * np.sin(4 * np.pi * freq * t)
+            kick = 0.6 * np.exp(-since_beat * 30.0) * np.sin(2 * np.pi * 55.0 * since_beat)
+            noise = rng.normal(0.0, 0.01, self.block_size)
+
+            yield (tone + kick + noise).astype(np.float32).reshape(-1, 1)
+            n += self.block_size
 
 class DSP:
-    def __init__(self, sample_rate=44100, block_size=2048):
+    def __init__(self, sample_rate=44100, block_size=2048, hop_size=512, source: Optional[AudioSource] = None):
         self.sample_rate = sample_rate
         self.block_size = block_size
-        self.queue = queue.Queue()
+        self.hop_size = hop_size
+        # Lock-free channel to the UI (single producer: the audio callback)
+        self.mailbox = FrameMailbox()
         self.running = False
         self.paused = False
-        self.stream = None
-        self.thread = None
+
+        # Explicit source (file / synthetic); None means microphone with synthetic fallback
+        self.source = source
+        self.active_source: Optional[AudioSource] = None
+        # Native downmix/resample to (sample_rate, mono) when the source differs
+        self.converter = None
+        self.input_rate = sample_rate
+
+        # Optional session recorder: gets every raw input block that is analyzed
+        self.recorder = None
+
+        # Optional per-frame hook (headless runs, tests) in addition to the mailbox
+        self.on_features: Optional[Callable[[dict], None]] = None
+        # Latest analyzer row (rms, flatness, centroid, rolloff, bpm, tempo_confidence),
+        # republished for blocks shorter than a hop so their stars still go out
+        self._last_row = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        # Failures inside the callback are counted (metrics "dsp_callback_errors"), not raised
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
         
         # Buffering for Fingerprinting (needs > 4096 samples)
         self.min_size = 4096 + 2048 # Window + Hop
         # Use deque for O(1) appends, maxlen prevents infinite growth
         self.buffer = collections.deque(maxlen=self.min_size * 2)
 
+        # Single-pass STFT analyzer (one real FFT per hop, all features)
+        self.analyzer = None
+        self.tempo = None
+        if StreamAnalyzer:
+            self.analyzer = StreamAnalyzer(sample_rate, frame_size=block_size, hop_size=hop_size)
+            # Tempo from the onset envelope, updated once per hop
+            self.tempo = TempoTracker(self.analyzer.frame_rate)
+
     def pause(self):
         self.paused = True
 
@@ -35,49 +220,84 @@ class DSP:
         self.paused = False
 
     def start(self):
-        if self.running:
+        # A file or fixed-length source that ran out leaves running set; restart it then
+        if self.running and self.active_source is not None and self.active_source.running:
             return
-            
+        if self.active_source:
+            self.active_source.stop()
+
         self.running = True
-        
-        # If Rust extension is missing or sounddevice fails, we might want a fallback
-        try:
-            self.stream = sd.InputStream(
-                channels=1,
-                samplerate=self.sample_rate,
-                blocksize=self.block_size,
-                callback=self.audio_callback
-            )
-            self.stream.start()
-        except Exception:
-            # Failed to start audio stream, starting Mock DSP thread
-            self.thread = threading.Thread(target=self._mock_loop, daemon=True)
-            self.thread.start()
+
+        if self.source is not None:
+            self._configure_input(self.source)
+            self.active_source = self.source
+        else:
+            try:
+                self.active_source = MicrophoneSource(self.sample_rate, self.block_size)
+                self._configure_input(self.active_source)
+                self.active_source.start(self.audio_callback)
+                return
+            except Exception:
+                # No input device: deterministic synthetic signal at wall-clock speed
+                self.active_source = SyntheticSource(self.sample_rate, self.block_size)
+                self._configure_input(self.active_source)
+
+        self.active_source.start(self.audio_callback)
 
     def stop(self):
         self.running = False
-        if self.stream:
-            try:
-                self.stream.stop()
-                self.stream.close()
-            except:
-                pass
-        self.stream = None
+        if self.active_source:
+            self.active_source.stop()
+        self.active_source = None
+
+    def run_source(self, source: AudioSource) -> int:
+        """
+        Headless: push every block of source through the analysis path on
+        the calling thread (as fast as possible unless source.realtime).
+        """
+        self._configure_input(source)
+        self.running = True
+        try:
+            return source.run(self.audio_callback)
+        finally:
+            self.running = False
+
+    def _configure_input(self, source: AudioSource):
+        self.open_input(source.sample_rate, source.channels)
+
+    def open_input(self, sample_rate: int, channels: int = 1):
+        """Set up conversion of an input rate/channel layout to the analysis format."""
+        self.converter = None
+        self.input_rate = sample_rate
+        if sample_rate == self.sample_rate and channels == 1:
+            return
+        if Resampler:
+            self.converter = Resampler(sample_rate, self.sample_rate, channels=channels)
+        elif sample_rate != self.sample_rate:
+            raise ValueError(f"Source is {sample_rate} Hz but DSP runs at {self.sample_rate} Hz "
+                             f"and the Rust resampler is unavailable")
 
+    @metrics.timed("dsp_callback")
     def audio_callback(self, indata, frames, time_info, status):
         if status:
             pass
         if not self.running or self.paused:
             return
+        if self.recorder:
+            self.recorder.audio(indata, self.input_rate)
 
-        # indata is numpy array (frames, channels)
-        # Flatten to 1D array for Rust
-        audio_data = indata[:, 0].astype(np.float32)
+        # indata is numpy array (frames, channels); reduce to mono at sample_rate
+        if self.converter:
+            audio_data = self.converter.process(np.ascontiguousarray(indata, dtype=np.float32))
+        elif indata.shape[1] > 1:
+            audio_data = indata.mean(axis=1, dtype=np.float32)
+        else:
+            audio_data = indata[:, 0].astype(np.float32)
         
         # Efficient append
         self.buffer.extend(audio_data)
 
-        fingerprints = []
+        stars = None
         
         # Process if we have enough data
         if len(self.buffer) >= self.min_size:
@@ -85,77 +305,58 @@ class DSP:
             # We take the last N samples needed
             chunk = np.array(self.buffer, dtype=np.float32)
             
-            if audio_fingerprint:
-                # Returns list of (hash, time_offset)
-                raw_fingerprints = audio_fingerprint(chunk)
+            if audio_fingerprint_array:
+                with metrics.timer("fingerprint"):
+                    hashes, _ = audio_fingerprint_array(chunk)
                 
                 # Unpack hashes for visualization
                 # Rust pack_hash: ((f1 as u64) << 20) | ((f2 as u64) << 8) | (dt as u64)
                 # Layout: [Unused: 32] [F1: 12] [F2: 12] [Delta: 8]
-                for (h, t) in raw_fingerprints:
-                    f1 = (h >> 20) & 0xFFF
-                    dt = h & 0xFF
-                    fingerprints.append((f1, dt))
+                stars = np.empty((len(hashes), 2), dtype=STAR_DTYPE)
+                stars[:, 0] = (hashes >> 20) & 0xFFF
+                stars[:, 1] = hashes & 0xFF
             
             # Note: deque handles the sliding window automatically via maxlen, 
             # but for overlapping FFTs we just keep streaming.
         
         try:
-            if audio_analyze:
-                # Call Rust extension
-                rms, flatness = audio_analyze(audio_data)
+            if self.analyzer:
+                # Call Rust extension: (n_frames, 5) matrix, one row per hop
+                frames = self.analyzer.process(audio_data)
+                if len(frames):
+                    rms, flatness, centroid, rolloff, _ = frames[-1]
+                    onsets = np.ascontiguousarray(frames[:, 4])
+                    onset = onsets.max()
+                    bpm, tempo_confidence = self.tempo.update(onsets)
+                    self._last_row = (rms, flatness, centroid, rolloff, bpm, tempo_confidence)
+                else:
+                    # No hop completed: repeat the last features, with no new onset
+                    rms, flatness, centroid, rolloff, bpm, tempo_confidence = self._last_row
+                    onset = 0.0
             else:
                 # Fallback python calc
                 rms = np.sqrt(np.mean(audio_data**2))
                 flatness = 0.5 # Placeholder
+                centroid = rolloff = onset = 0.0
+                bpm, tempo_confidence = 0.0, 0.0
             
-            # Create AudioFeatures dict
-            features = {
-                "rms": float(rms),
-                "spectral_centroid": float(flatness), # Using flatness as proxy
-                "bpm": 120.0, # Mock
-                "is_transient": rms > 0.1, # Simple threshold
-                "stars": fingerprints
-            }
-            
-            # Avoid queue overflow
-            if self.queue.qsize() < 10:
-                self.queue.put(features)
-                
-        except Exception:
-            pass
+            # Fixed-size record into the mailbox ring (full ring = counted drop)
+            self.mailbox.publish(rms, flatness, centroid, rolloff, onset, bpm, tempo_confidence, stars)
 
-    def _mock_loop(self):
-        """Generates fake data if microphone is unavailable."""
-        import random
-        import math
-        
-        t = 0.0
-        while self.running:
-            if self.paused:
-                time.sleep(0.1)
-                continue
-            t += 0.1
-            rms = (math.sin(t) + 1) / 2 * 0.5
-            flatness = random.random()
-            
-            # Mock stars
-            stars = []
-            if random.random() > 0.5:
-                for _ in range(random.randint(1, 5)):
-                    f1 = random.randint(100, 4000)
-                    dt = random.randint(1, 60)
-                    stars.append((f1, dt))
-
-            features = {
-                "rms": rms,
-                "spectral_centroid": flatness,
-                "bpm": 120.0,
-                "is_transient": rms > 0.8,
-                "stars": stars
-            }
-            
-            if self.queue.qsize() < 10:
-                self.queue.put(features)
-            
-            time.sleep(0.1)
+            if self.on_features:
+                self.on_features({
+                    "rms": float(rms),
+                    "flatness": float(flatness),
+                    "spectral_centroid": float(centroid),
+                    "rolloff": float(rolloff),
+                    "onset": float(onset),
+                    "bpm": float(bpm),
+                    "tempo_confidence": float(tempo_confidence),
+                    "is_transient": rms > 0.1, # Simple threshold
+                    "stars": stars if stars is not None else np.empty((0, 2), dtype=STAR_DTYPE)
+                })
+                
+        except Exception as exc:
+            self.errors += 1
+            self.last_error = exc
+            metrics.count("dsp_callback_errors")
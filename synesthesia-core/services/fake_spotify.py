@@ -0,0 +1,338 @@
+"""
+Local stand-in for the Spotify Web API (offline latency / rate-limit testing).
+
+    uvicorn services.fake_spotify:create_fake_spotify --factory --port 8901
+    SYN_SPOTIFY_API_BASE=http://127.0.0.1:8901 python main.py
+
+Implements what SpotifyClient uses: POST /api/token (client credentials and
+refresh), /v1/search, /v1/tracks/{id}, /v1/audio-features, /v1/me/player/devices,
+PUT /v1/me/player/play and GET /v1/me/player. Tracks come from a
+SyntheticCatalog, so IDs are stable across restarts.
+
+Behaviour is set through SYN_FAKE_SPOTIFY_* variables (or POST /fake/config):
+
+    LATENCY      latency distribution, e.g. "lognormal:60,0.5" (median ms, sigma),
+                 "const:20", "uniform:10,80", "normal:50,10"; per endpoint with
+                 "search=lognormal:120,0.6;devices=const:5;*=const:20"
+    RATE         sustained requests/s before 429 + Retry-After (0 = unlimited)
+    BURST        token bucket size (default 2 x RATE)
+    ERROR_RATE   fraction of requests answered 500/502/503
+    STALL_RATE   fraction of requests delayed by STALL_MS first (client timeouts)
+    TOKEN_TTL    access token lifetime (s); expired tokens get 401
+    TRACKS       catalog size; DEVICES  number of playback devices; SEED
+GET /fake/stats reports per-endpoint counts, 429s and injected failures.
+"""
+import os
+import math
+import time
+import uuid
+import random
+import asyncio
+from urllib.parse import parse_qs
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from services.catalog import SyntheticCatalog
+
+ENDPOINTS = ("token", "search", "track", "audio_features", "devices", "start_playback", "current_playback")
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """'kind:a,b' -> sampler returning seconds."""
+    kind, _, params = spec.strip().partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+    if kind == "const":
+        ms = values[0] if values else 0.0
+        return lambda rng: ms / 1000
+    if kind == "uniform":
+        low, high = values
+        return lambda rng: rng.uniform(low, high) / 1000
+    if kind == "normal":
+        mean, sd = values
+        return lambda rng: max(0.0, rng.gauss(mean, sd)) / 1000
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(median), sigma) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+def parse_latencies(spec: str) -> Dict[str, Callable[[random.Random], float]]:
+    """'search=lognormal:120,0.6;*=const:20' (or a bare spec for every endpoint) -> {endpoint: sampler}."""
+    samplers = {}
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        name, _, dist = part.rpartition("=")
+        samplers[name or "*"] = parse_latency(dist)
+    return samplers
+
+class FakeSpotifyConfig:
+    def __init__(self, latency: str = "const:0", rate: float = 0.0, burst: Optional[float] = None,
+                 error_rate: float = 0.0, stall_rate: float = 0.0, stall_ms: float = 10_000.0,
+                 token_ttl: int = 3600, tracks: int = 10_000, devices: int = 2, seed: int = 0):
+        self.latency = latency
+        self.rate = rate
+        self.burst = burst
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+        self.token_ttl = token_ttl
+        self.tracks = tracks
+        self.devices = devices
+        self.seed = seed
+
+    @classmethod
+    def from_env(cls) -> "FakeSpotifyConfig":
+        def env(name, default, cast=float):
+            value = os.getenv("SYN_FAKE_SPOTIFY_" + name)
+            return cast(value) if value not in (None, "") else default
+        return cls(
+            latency=env("LATENCY", "const:0", str),
+            rate=env("RATE", 0.0),
+            burst=env("BURST", None),
+            error_rate=env("ERROR_RATE", 0.0),
+            stall_rate=env("STALL_RATE", 0.0),
+            stall_ms=env("STALL_MS", 10_000.0),
+            token_ttl=env("TOKEN_TTL", 3600, int),
+            tracks=env("TRACKS", 10_000, int),
+            devices=env("DEVICES", 2, int),
+            seed=env("SEED", 0, int),
+        )
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """0 if a request may go through, else seconds until one may."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class FakeSpotify:
+    """State behind the fake API: catalog, tokens, devices, playback and counters."""
+
+    def __init__(self, config: FakeSpotifyConfig):
+        self.configure(config)
+        self.catalog_size = config.tracks
+        tracks, _ = SyntheticCatalog(seed=config.seed).chunk(0, config.tracks)
+        self.tracks = {t["id"]: t for t in tracks}
+        self._names = [(f"{t['name']} {t['artist']}".lower(), t["id"]) for t in tracks]
+        self.devices = [
+            {"id": uuid.uuid5(uuid.NAMESPACE_DNS, f"fake-device-{i}").hex, "is_active": i == 0,
+             "is_private_session": False, "is_restricted": False, "name": f"Fake Speaker {i + 1}",
+             "type": "Computer" if i == 0 else "Speaker", "volume_percent": 60}
+            for i in range(config.devices)
+        ]
+        self.tokens: Dict[str, float] = {}
+        self.playback: Optional[Dict] = None
+        self.reset_stats()
+
+    def configure(self, config: FakeSpotifyConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.latency = parse_latencies(config.latency)
+        self.bucket = _TokenBucket(config.rate, config.burst or 2 * config.rate) if config.rate > 0 else None
+
+    def reset_stats(self):
+        self.stats = {name: {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "stalls": 0, "unauthorized": 0}
+                      for name in ENDPOINTS}
+
+    # --- Spotify-shaped objects ---
+
+    def track_object(self, track: Dict) -> Dict:
+        artist_id = uuid.uuid5(uuid.NAMESPACE_DNS, track["artist"]).hex[:22]
+        return {
+            "id": track["id"],
+            "name": track["name"],
+            "type": "track",
+            "uri": f"spotify:track:{track['id']}",
+            "duration_ms": track["duration_ms"],
+            "explicit": False,
+            "popularity": int(track["energy"] * 100),
+            "artists": [{"id": artist_id, "name": track["artist"], "type": "artist", "uri": f"spotify:artist:{artist_id}"}],
+            "album": {"name": track["album"], "release_date": str(track["year"]), "album_type": "album"},
+        }
+
+    def features_object(self, track: Dict) -> Dict:
+        return {
+            "id": track["id"],
+            "type": "audio_features",
+            "uri": f"spotify:track:{track['id']}",
+            "energy": track["energy"],
+            "valence": track["valence"],
+            "danceability": track["danceability"],
+            "acousticness": track["acousticness"],
+            "instrumentalness": track["instrumentalness"],
+            "tempo": track["tempo"],
+            "duration_ms": track["duration_ms"],
+        }
+
+    def search(self, query: str, limit: int, offset: int) -> Tuple[List[Dict], int]:
+        terms = query.lower().split()
+        hits = [tid for text, tid in self._names if all(term in text for term in terms)]
+        return [self.track_object(self.tracks[tid]) for tid in hits[offset:offset + limit]], len(hits)
+
+    def issue_token(self) -> Dict:
+        token = uuid.uuid4().hex
+        self.tokens[token] = time.monotonic() + self.config.token_ttl
+        return {"access_token": token, "token_type": "Bearer", "expires_in": self.config.token_ttl,
+                "refresh_token": uuid.uuid4().hex,
+                "scope": "user-top-read user-modify-playback-state user-read-playback-state"}
+
+    def authorized(self, request: Request) -> bool:
+        header = request.headers.get("authorization", "")
+        expiry = self.tokens.get(header.removeprefix("Bearer ").strip())
+        return expiry is not None and expiry > time.monotonic()
+
+def _error(status: int, message: str, headers: Optional[Dict] = None) -> JSONResponse:
+    return JSONResponse({"error": {"status": status, "message": message}}, status_code=status, headers=headers)
+
+def create_fake_spotify(config: Optional[FakeSpotifyConfig] = None) -> FastAPI:
+    fake = FakeSpotify(config or FakeSpotifyConfig.from_env())
+    api = FastAPI(title="Fake Spotify Web API")
+    api.state.fake = fake
+
+    async def gate(endpoint: str, request: Request, auth: bool = True) -> Optional[Response]:
+        """Latency, rate limiting, failure injection and auth, in that order. None = serve the request."""
+        stats = fake.stats[endpoint]
+        stats["requests"] += 1
+        config = fake.config
+
+        sampler = fake.latency.get(endpoint) or fake.latency.get("*")
+        if sampler:
+            await asyncio.sleep(sampler(fake.rng))
+        if config.stall_rate and fake.rng.random() < config.stall_rate:
+            stats["stalls"] += 1
+            await asyncio.sleep(config.stall_ms / 1000)
+
+        # The token endpoint lives on the accounts service, outside the Web API limit
+        if fake.bucket is not None and endpoint != "token":
+            wait = fake.bucket.take()
+            if wait:
+                stats["rate_limited"] += 1
+                # Spotify sends whole seconds
+                return _error(429, "API rate limit exceeded", {"Retry-After": str(max(1, math.ceil(wait)))})
+        if config.error_rate and fake.rng.random() < config.error_rate:
+            stats["errors"] += 1
+            status = fake.rng.choice((500, 502, 503))
+            return _error(status, "Injected failure")
+        if auth and not fake.authorized(request):
+            stats["unauthorized"] += 1
+            return _error(401, "The access token expired")
+        stats["ok"] += 1
+        return None
+
+    @api.post("/api/token")
+    async def token(request: Request):
+        rejected = await gate("token", request, auth=False)
+        if rejected:
+            return rejected
+        form = parse_qs((await request.body()).decode())
+        if form.get("grant_type", [""])[0] not in ("client_credentials", "refresh_token", "authorization_code"):
+            return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+        return fake.issue_token()
+
+    @api.get("/v1/search")
+    async def search(request: Request, q: str, type: str = "track", limit: int = 10, offset: int = 0):
+        rejected = await gate("search", request)
+        if rejected:
+            return rejected
+        items, total = fake.search(q, min(limit, 50), offset)
+        return {"tracks": {"items": items, "total": total, "limit": limit, "offset": offset,
+                           "href": str(request.url), "next": None, "previous": None}}
+
+    @api.get("/v1/tracks/{track_id}")
+    async def track(request: Request, track_id: str):
+        rejected = await gate("track", request)
+        if rejected:
+            return rejected
+        found = fake.tracks.get(track_id)
+        return fake.track_object(found) if found else _error(404, "Non existing id")
+
+    @api.get("/v1/audio-features")
+    @api.get("/v1/audio-features/")
+    async def audio_features(request: Request, ids: str):
+        rejected = await gate("audio_features", request)
+        if rejected:
+            return rejected
+        found = [fake.tracks.get(track_id) for track_id in ids.split(",")[:100]]
+        return {"audio_features": [fake.features_object(t) if t else None for t in found]}
+
+    @api.get("/v1/audio-features/{track_id}")
+    async def audio_features_one(request: Request, track_id: str):
+        rejected = await gate("audio_features", request)
+        if rejected:
+            return rejected
+        found = fake.tracks.get(track_id)
+        return fake.features_object(found) if found else _error(404, "Non existing id")
+
+    @api.get("/v1/me/player/devices")
+    async def devices(request: Request):
+        rejected = await gate("devices", request)
+        if rejected:
+            return rejected
+        return {"devices": fake.devices}
+
+    @api.put("/v1/me/player/play")
+    async def start_playback(request: Request, device_id: Optional[str] = None):
+        rejected = await gate("start_playback", request)
+        if rejected:
+            return rejected
+        body = await request.json() if await request.body() else {}
+        device = next((d for d in fake.devices if d["id"] == device_id or (device_id is None and d["is_active"])), None)
+        if device is None:
+            return _error(404, "Player command failed: No active device found")
+        uris = body.get("uris") or []
+        track_id = uris[0].rsplit(":", 1)[-1] if uris else (fake.playback or {}).get("item", {}).get("id")
+        if track_id not in fake.tracks:
+            return _error(400, "Invalid track uri")
+        for d in fake.devices:
+            d["is_active"] = d is device
+        fake.playback = {
+            "device": device,
+            "is_playing": True,
+            "progress_ms": 0,
+            "timestamp": int(time.time() * 1000),
+            "currently_playing_type": "track",
+            "item": fake.track_object(fake.tracks[track_id]),
+        }
+        return Response(status_code=204)
+
+    @api.get("/v1/me/player")
+    async def current_playback(request: Request):
+        rejected = await gate("current_playback", request)
+        if rejected:
+            return rejected
+        if fake.playback is None:
+            return Response(status_code=204)
+        state = dict(fake.playback)
+        state["progress_ms"] = int(time.time() * 1000) - state["timestamp"]
+        return state
+
+    # --- Test controls (not part of the Spotify API) ---
+
+    @api.get("/fake/stats")
+    async def stats():
+        return {"endpoints": fake.stats, "tokens_issued": len(fake.tokens), "tracks": fake.catalog_size}
+
+    @api.post("/fake/config")
+    async def configure(request: Request):
+        """Change latency / rate / failure settings at runtime (catalog and devices stay)."""
+        current = dict(vars(fake.config))
+        current.update(await request.json())
+        fake.configure(FakeSpotifyConfig(**current))
+        return vars(fake.config)
+
+    @api.post("/fake/reset")
+    async def reset():
+        fake.reset_stats()
+        fake.playback = None
+        return {"reset": True}
+
+    return api
@@ -0,0 +1,146 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, Sequence
+
+# Try to import the Rust extension
+try:
+    from synesthesia.core import audio_fingerprint_array, fingerprint_match
+except ImportError:
+    audio_fingerprint_array = None
+    fingerprint_match = None
+
+# Fingerprinter frame geometry (src/audio.rs)
+SAMPLE_RATE = 44100
+HOP_SIZE = 2048
+
+# Default target zone (FingerprintConfig::default in src/audio.rs)
+MAX_DT = 9
+
+class Matcher(ABC):
+    """Shared query path for anything exposing match() (in-memory index or on-disk store)."""
+
+    # Minimum aligned hashes before a match is trusted
+    min_score = 8
+
+    @abstractmethod
+    def match(self, q_hashes: np.ndarray, q_offsets: np.ndarray, top_k: int = 5) -> List[Dict]:
+        """Best top_k tracks for a query, each {"track_id", "score", "offset"}."""
+
+    def identify(self, audio_data: np.ndarray, sample_rate: int = SAMPLE_RATE, channels: int = 1) -> Optional[Dict]:
+        """
+        Fingerprint a query buffer and return the best match (with
+        offset_seconds into the track), or None below min_score. Audio at
+        other rates or with (frames, channels) layout is converted natively.
+        """
+        if audio_fingerprint_array is None:
+            return None
+
+        q_hashes, q_offsets = audio_fingerprint_array(
+            np.ascontiguousarray(audio_data, dtype=np.float32), sample_rate=sample_rate, channels=channels
+        )
+        matches = self.match(q_hashes, q_offsets, top_k=1)
+        if not matches or matches[0]["score"] < self.min_score:
+            return None
+
+        best = matches[0]
+        best["offset_seconds"] = best["offset"] * HOP_SIZE / SAMPLE_RATE
+        return best
+
+class FingerprintIndex(Matcher):
+    """
+    Inverted index from fingerprint hash to (track, anchor offset).
+    Stored as three parallel arrays sorted by hash, so a lookup is a binary
+    search and the whole index is a few contiguous buffers instead of dicts.
+    """
+
+    def __init__(self, hashes: np.ndarray, tracks: np.ndarray, offsets: np.ndarray, track_ids: Sequence[str]):
+        self.hashes = hashes
+        self.tracks = tracks
+        self.offsets = offsets
+        # Any sequence mapping track number -> track id (may be lazily loaded)
+        self.track_ids = track_ids
+
+        # Hashes shared by more tracks than this are stop-words and skipped
+        self.max_postings = 10000
+
+    @classmethod
+    def build(cls, postings: Dict[str, tuple]) -> "FingerprintIndex":
+        """
+        Build from {track_id: (hashes, offsets)}.
+        """
+        track_ids = list(postings.keys())
+        if not track_ids:
+            return cls(
+                np.empty(0, dtype=np.uint64),
+                np.empty(0, dtype=np.uint32),
+                np.empty(0, dtype=np.uint32),
+                [],
+            )
+
+        hashes = np.concatenate([np.asarray(postings[t][0], dtype=np.uint64) for t in track_ids])
+        offsets = np.concatenate([np.asarray(postings[t][1], dtype=np.uint32) for t in track_ids])
+        tracks = np.concatenate([
+            np.full(len(postings[t][0]), i, dtype=np.uint32) for i, t in enumerate(track_ids)
+        ])
+
+        order = np.argsort(hashes, kind="stable")
+        return cls(hashes[order], tracks[order], offsets[order], track_ids)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def match(self, q_hashes: np.ndarray, q_offsets: np.ndarray, top_k: int = 5) -> List[Dict]:
+        """
+        Score candidate tracks by time-offset histogram voting.
+        Returns [{track_id, score, offset}] best first; offset is in fingerprint frames.
+        """
+        q_hashes = np.ascontiguousarray(q_hashes, dtype=np.uint64)
+        q_offsets = np.ascontiguousarray(q_offsets, dtype=np.uint32)
+        if len(q_hashes) == 0 or len(self.hashes) == 0:
+            return []
+
+        if fingerprint_match:
+            raw = fingerprint_match(
+                q_hashes, q_offsets, self.hashes, self.tracks, self.offsets,
+                top_k=top_k, max_postings=self.max_postings
+            )
+        else:
+            raw = self._match_numpy(q_hashes, q_offsets, top_k)
+
+        return [
+            {"track_id": self.track_ids[track], "score": int(score), "offset": int(offset)}
+            for track, score, offset in raw
+        ]
+
+    def _match_numpy(self, q_hashes: np.ndarray, q_offsets: np.ndarray, top_k: int) -> List[tuple]:
+        """Vectorised fallback when the Rust extension is unavailable."""
+        lo = np.searchsorted(self.hashes, q_hashes, side="left")
+        hi = np.searchsorted(self.hashes, q_hashes, side="right")
+        counts = hi - lo
+        keep = (counts > 0) & (counts <= self.max_postings)
+        lo, counts, q_offsets = lo[keep], counts[keep], q_offsets[keep]
+        if counts.sum() == 0:
+            return []
+
+        # Expand [lo, hi) ranges into one flat posting index array
+        starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+        idx = starts + np.arange(counts.sum())
+
+        tracks = self.tracks[idx].astype(np.int64)
+        deltas = self.offsets[idx].astype(np.int64) - np.repeat(q_offsets, counts).astype(np.int64)
+
+        keys = (tracks << 32) | (deltas & 0xFFFFFFFF)
+        bins, votes = np.unique(keys, return_counts=True)
+
+        # Strongest offset bin per track, then best tracks
+        bin_tracks = bins >> 32
+        order = np.lexsort((-votes, bin_tracks))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = bin_tracks[order][1:] != bin_tracks[order][:-1]
+        best = order[first]
+        best = best[np.lexsort((bin_tracks[best], -votes[best]))][:top_k]
+
+        return [
+            (int(bin_tracks[i]), int(votes[i]), int(np.int32(np.uint32(bins[i] & 0xFFFFFFFF))))
+            for i in best
+        ]
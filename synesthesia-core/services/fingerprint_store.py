@@ -0,0 +1,322 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import numpy as np
+from typing import List, Dict, Optional, Sequence
+
+from services.fingerprint import Matcher, FingerprintIndex
+
+MANIFEST = "manifest.json"
+TRACKS = "tracks.txt"
+SOURCES = "sources.txt"
+COLUMNS = (("hashes", np.uint64), ("tracks", np.uint32), ("offsets", np.uint32))
+
+def _load_columns(path: str) -> tuple:
+    """Memory-map one sorted posting table (read-only, no data is read up front)."""
+    return tuple(np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name, _ in COLUMNS)
+
+def _write_columns(path: str, hashes: np.ndarray, tracks: np.ndarray, offsets: np.ndarray):
+    os.makedirs(path, exist_ok=True)
+    for (name, dtype), column in zip(COLUMNS, (hashes, tracks, offsets)):
+        np.save(os.path.join(path, f"{name}.npy"), np.asarray(column, dtype=dtype))
+
+def merge_runs(runs: List[tuple], out_dir: str, block_size: int = 1 << 20):
+    """
+    K-way merge of hash-sorted posting runs into one table on disk.
+    Works block by block: each round takes, from every run, the postings up to
+    the smallest "last hash of the next block" across runs, so memory stays
+    bounded at roughly len(runs) * block_size postings.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    total = sum(len(run[0]) for run in runs)
+    out = [
+        np.lib.format.open_memmap(os.path.join(out_dir, f"{name}.npy"), mode="w+", dtype=dtype, shape=(total,))
+        for name, dtype in COLUMNS
+    ]
+
+    cursors = [0] * len(runs)
+    written = 0
+    while written < total:
+        active = [i for i, run in enumerate(runs) if cursors[i] < len(run[0])]
+        cutoff = min(runs[i][0][min(cursors[i] + block_size, len(runs[i][0])) - 1] for i in active)
+
+        pieces = []
+        for i in active:
+            hashes = runs[i][0]
+            start = cursors[i]
+            end = min(start + block_size, len(hashes))
+            stop = start + int(np.searchsorted(hashes[start:end], cutoff, side="right"))
+            if stop > start:
+                pieces.append(tuple(np.asarray(col[start:stop]) for col in runs[i]))
+                cursors[i] = stop
+
+        merged = [np.concatenate([p[c] for p in pieces]) for c in range(3)]
+        order = np.argsort(merged[0], kind="stable")
+        n = len(order)
+        for column, values in zip(out, merged):
+            column[written:written + n] = values[order]
+        written += n
+
+    for column in out:
+        column.flush()
+
+class TrackTable(Sequence):
+    """Track number -> track id, read from tracks.txt on first access."""
+
+    def __init__(self, path: str, count: int):
+        self.path = path
+        self.count = count
+        self._ids: Optional[List[str]] = None
+
+    def _load(self) -> List[str]:
+        if self._ids is None:
+            ids = []
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for _, line in zip(range(self.count), f):
+                        ids.append(line.rstrip("\n"))
+            self._ids = ids
+        return self._ids
+
+    def __getitem__(self, i):
+        return self._load()[i]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def extend(self, track_ids: List[str]):
+        if self._ids is not None:
+            self._ids.extend(track_ids)
+        self.count += len(track_ids)
+
+class SegmentBuilder:
+    """
+    External-memory bulk builder for one segment.
+    Postings are buffered up to chunk_postings, sorted and spilled as runs,
+    then merged into the final segment by merge_runs().
+    """
+
+    def __init__(self, root: str, first_track: int = 0, chunk_postings: int = 1 << 23):
+        self.root = root
+        self.first_track = first_track
+        self.chunk_postings = chunk_postings
+        self.tmp = tempfile.mkdtemp(dir=root, prefix=".build-")
+        self.track_ids: List[str] = []
+        self.runs: List[str] = []
+        self._chunk = []
+        self._pending = 0
+
+    def add(self, track_id: str, hashes: np.ndarray, offsets: np.ndarray):
+        track = self.first_track + len(self.track_ids)
+        self.track_ids.append(track_id)
+        self._chunk.append((
+            np.asarray(hashes, dtype=np.uint64),
+            np.full(len(hashes), track, dtype=np.uint32),
+            np.asarray(offsets, dtype=np.uint32),
+        ))
+        self._pending += len(hashes)
+        if self._pending >= self.chunk_postings:
+            self._spill()
+
+    def _spill(self):
+        if not self._chunk:
+            return
+        hashes, tracks, offsets = (np.concatenate([c[i] for c in self._chunk]) for i in range(3))
+        order = np.argsort(hashes, kind="stable")
+
+        run_dir = os.path.join(self.tmp, f"run-{len(self.runs):05d}")
+        _write_columns(run_dir, hashes[order], tracks[order], offsets[order])
+        self.runs.append(run_dir)
+        self._chunk = []
+        self._pending = 0
+
+    def finish(self, out_dir: str):
+        """Write the merged segment to out_dir and remove the spill runs."""
+        self._spill()
+        try:
+            if len(self.runs) == 1:
+                os.replace(self.runs[0], out_dir)
+            else:
+                merge_runs([_load_columns(run) for run in self.runs], out_dir)
+        finally:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def abort(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+class FingerprintStore(Matcher):
+    """
+    Persistent fingerprint database.
+
+    Layout of the store directory:
+        manifest.json       live segment list and track count (replaced atomically)
+        tracks.txt          one track id per line; line number = track number
+        sources.txt         what committed segments were built from (e.g. file paths)
+        seg-NNNNNN/         hashes.npy / tracks.npy / offsets.npy sorted by hash
+
+    Each segment is a sorted hash table whose posting list for a hash is the
+    contiguous run of equal hashes. Segments are memory-mapped read-only, so
+    opening a store only reads the manifest regardless of library size.
+    New tracks are appended as new segments; compact() merges them in the
+    background once there are more than max_segments.
+    """
+
+    def __init__(self, path: str, max_segments: int = 8):
+        self.path = path
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+        os.makedirs(path, exist_ok=True)
+        manifest = self._read_manifest()
+        self.track_count = manifest["track_count"]
+        self._tracks_bytes = manifest["tracks_bytes"]
+        self._sources_bytes = manifest.get("sources_bytes", 0)
+        self._next_segment = manifest["next_segment"]
+        self.track_ids = TrackTable(os.path.join(path, TRACKS), self.track_count)
+        self.segments: List[tuple] = [(name, self._open_segment(name)) for name in manifest["segments"]]
+
+    @classmethod
+    def open(cls, path: str, **kwargs) -> "FingerprintStore":
+        return cls(path, **kwargs)
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(os.path.join(self.path, MANIFEST), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": 1, "segments": [], "track_count": 0, "tracks_bytes": 0, "next_segment": 0}
+
+    def _write_manifest(self, segment_names: List[str]):
+        manifest = {
+            "version": 1,
+            "segments": segment_names,
+            "track_count": self.track_count,
+            "tracks_bytes": self._tracks_bytes,
+            "sources_bytes": self._sources_bytes,
+            "next_segment": self._next_segment,
+        }
+        tmp = os.path.join(self.path, MANIFEST + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(self.path, MANIFEST))
+
+    def _open_segment(self, name: str) -> FingerprintIndex:
+        hashes, tracks, offsets = _load_columns(os.path.join(self.path, name))
+        return FingerprintIndex(hashes, tracks, offsets, self.track_ids)
+
+    def _new_segment_name(self) -> str:
+        name = f"seg-{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def __len__(self) -> int:
+        return sum(len(index) for _, index in self.segments)
+
+    def builder(self, chunk_postings: int = 1 << 23) -> SegmentBuilder:
+        """Start a bulk build of one new segment (commit it with append())."""
+        return SegmentBuilder(self.path, first_track=self.track_count, chunk_postings=chunk_postings)
+
+    def _append_lines(self, filename: str, lines: Sequence[str], committed_bytes: int) -> int:
+        """Truncate lines left behind by an interrupted append, then extend. Returns the new size."""
+        with open(os.path.join(self.path, filename), "ab") as f:
+            f.truncate(committed_bytes)
+            f.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+            return f.tell()
+
+    def append(self, builder: SegmentBuilder, sources: Sequence[str] = ()):
+        """
+        Publish a finished builder as a new segment, recording what it was
+        built from (see sources()) in the same commit.
+        Track ids and sources are written before the manifest, so a crash
+        leaves the store at its previous consistent state.
+        """
+        if not builder.track_ids:
+            builder.abort()
+            return
+
+        with self._lock:
+            if builder.first_track != self.track_count:
+                builder.abort()
+                raise ValueError("Builder is stale: another segment was appended since it started")
+
+            name = self._new_segment_name()
+            # A directory under this name is debris of an append that crashed before its manifest
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+            builder.finish(os.path.join(self.path, name))
+
+            self._tracks_bytes = self._append_lines(TRACKS, builder.track_ids, self._tracks_bytes)
+            if sources:
+                self._sources_bytes = self._append_lines(SOURCES, sources, self._sources_bytes)
+
+            self.track_count += len(builder.track_ids)
+            self.track_ids.extend(builder.track_ids)
+            segments = self.segments + [(name, self._open_segment(name))]
+            self._write_manifest([n for n, _ in segments])
+            self.segments = segments
+
+        if len(self.segments) > self.max_segments:
+            self.compact(background=True)
+
+    def sources(self) -> set:
+        """Sources of every committed segment; anything written by an interrupted append is ignored."""
+        if not self._sources_bytes:
+            return set()
+        with open(os.path.join(self.path, SOURCES), "rb") as f:
+            data = f.read(self._sources_bytes)
+        return set(data.decode("utf-8").splitlines())
+
+    def add_tracks(self, postings: Dict[str, tuple]):
+        """Convenience wrapper: build and append one segment from {track_id: (hashes, offsets)}."""
+        builder = self.builder()
+        for track_id, (hashes, offsets) in postings.items():
+            builder.add(track_id, hashes, offsets)
+        self.append(builder)
+
+    def compact(self, background: bool = False):
+        """Merge all current segments into one. Readers keep working on the old ones until the swap."""
+        if background:
+            if self._compactor and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(target=self.compact, daemon=True)
+            self._compactor.start()
+            return
+
+        snapshot = list(self.segments)
+        if len(snapshot) < 2:
+            return
+
+        with self._lock:
+            name = self._new_segment_name()
+        tmp_dir = tempfile.mkdtemp(dir=self.path, prefix=".compact-")
+        merge_runs([(i.hashes, i.tracks, i.offsets) for _, i in snapshot], tmp_dir)
+
+        with self._lock:
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+            os.replace(tmp_dir, os.path.join(self.path, name))
+            merged = {n for n, _ in snapshot}
+            # Segments appended while merging stay live after the merged one
+            remaining = [(n, i) for n, i in self.segments if n not in merged]
+            segments = [(name, self._open_segment(name))] + remaining
+            self._write_manifest([n for n, _ in segments])
+            self.segments = segments
+
+        # Old segments are unlinked; open memmaps stay valid until released
+        for n in merged:
+            shutil.rmtree(os.path.join(self.path, n), ignore_errors=True)
+
+    def wait_for_compaction(self, timeout: Optional[float] = None):
+        if self._compactor:
+            self._compactor.join(timeout)
+
+    def match(self, q_hashes: np.ndarray, q_offsets: np.ndarray, top_k: int = 5) -> List[Dict]:
+        """Match against every live segment and keep the best score per track."""
+        best: Dict[str, Dict] = {}
+        for _, index in self.segments:
+            for m in index.match(q_hashes, q_offsets, top_k=top_k):
+                if m["track_id"] not in best or m["score"] > best[m["track_id"]]["score"]:
+                    best[m["track_id"]] = m
+
+        return sorted(best.values(), key=lambda m: -m["score"])[:top_k]
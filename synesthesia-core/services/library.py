@@ -0,0 +1,229 @@
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from services.fingerprint import SAMPLE_RATE, HOP_SIZE, MAX_DT
+from services.fingerprint_store import FingerprintStore
+from services.wav import open_wav_memmap, pcm_to_float
+
+# Try to import the Rust extension
+try:
+    from synesthesia.core import audio_fingerprint_array, Resampler
+except ImportError:
+    audio_fingerprint_array = None
+    Resampler = None
+
+# Fingerprinter geometry (src/audio.rs): analysis window, how many frames
+# ahead an anchor is paired with (the target zone) and the block of frames
+# the peaks_per_second cap is applied over. Chunks start on a block boundary
+# and overlap by whole blocks covering the look-ahead, so streaming produces
+# exactly the hashes a whole-file pass would, with or without the cap.
+WINDOW_SIZE = 4096
+LOOKAHEAD_FRAMES = MAX_DT + 1
+DENSITY_BLOCK_FRAMES = 22
+OVERLAP_FRAMES = -(-LOOKAHEAD_FRAMES // DENSITY_BLOCK_FRAMES) * DENSITY_BLOCK_FRAMES
+
+# Anchor frames fingerprinted per streamed chunk (~45 s of audio, whole density blocks)
+CHUNK_FRAMES = 45 * DENSITY_BLOCK_FRAMES
+
+def iter_wav_blocks(path: str, block_frames: int = 1 << 16) -> Iterator[np.ndarray]:
+    """
+    Stream a WAV file (8/16/24/32-bit PCM or 32-bit float) as mono 44.1kHz
+    float32 blocks in [-1, 1]. The file is memory-mapped and only
+    block_frames samples per channel are decoded at a time. Other rates and
+    multichannel files are downmixed and resampled by the Rust Resampler in
+    one pass per block.
+    """
+    samples, rate = open_wav_memmap(path)
+    channels = samples.shape[1]
+
+    converter = None
+    if Resampler and (rate != SAMPLE_RATE or channels > 1):
+        converter = Resampler(rate, SAMPLE_RATE, channels=channels)
+    elif rate != SAMPLE_RATE:
+        raise ValueError(f"cannot resample {rate} Hz to {SAMPLE_RATE} Hz without the Rust core")
+
+    for start in range(0, len(samples), block_frames):
+        block = pcm_to_float(samples[start:start + block_frames])
+
+        if converter:
+            block = converter.process(np.ascontiguousarray(block))
+            if len(block):
+                yield block
+            continue
+
+        mono = block.mean(axis=1) if channels > 1 else block[:, 0]
+        yield np.ascontiguousarray(mono, dtype=np.float32)
+
+def fingerprint_stream(blocks: Iterator[np.ndarray], fingerprint=None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Fingerprint an audio stream chunk by chunk.
+    Each chunk covers CHUNK_FRAMES anchor frames plus the look-ahead they pair
+    with, rounded up to whole density blocks; only anchors inside the chunk
+    are kept and offsets are shifted to track time. Returns (hashes, offsets, seconds of audio).
+    """
+    fingerprint = fingerprint or audio_fingerprint_array
+    if fingerprint is None:
+        raise RuntimeError("Rust core (synesthesia.core) is not available")
+
+    step = CHUNK_FRAMES * HOP_SIZE
+    need = (CHUNK_FRAMES + OVERLAP_FRAMES) * HOP_SIZE + WINDOW_SIZE
+
+    all_hashes: List[np.ndarray] = []
+    all_offsets: List[np.ndarray] = []
+    pending = np.empty(0, dtype=np.float32)
+    base_frame = 0
+    total_samples = 0
+
+    def emit(chunk: np.ndarray, last: bool):
+        hashes, offsets = fingerprint(chunk)
+        hashes, offsets = np.asarray(hashes), np.asarray(offsets)
+        if not last:
+            keep = offsets < CHUNK_FRAMES
+            hashes, offsets = hashes[keep], offsets[keep]
+        all_hashes.append(hashes.astype(np.uint64))
+        all_offsets.append(offsets.astype(np.uint32) + base_frame)
+
+    for block in blocks:
+        total_samples += len(block)
+        pending = np.concatenate([pending, block])
+        while len(pending) >= need:
+            emit(np.ascontiguousarray(pending[:need]), last=False)
+            pending = pending[step:]
+            base_frame += CHUNK_FRAMES
+
+    if len(pending) >= WINDOW_SIZE:
+        emit(pending, last=True)
+
+    if not all_hashes:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint32), total_samples / SAMPLE_RATE
+    return np.concatenate(all_hashes), np.concatenate(all_offsets), total_samples / SAMPLE_RATE
+
+def fingerprint_file(path: str) -> Tuple[str, np.ndarray, np.ndarray, float]:
+    """Worker entry point: stream-decode, convert and fingerprint one file."""
+    hashes, offsets, seconds = fingerprint_stream(iter_wav_blocks(path))
+    return path, hashes, offsets, seconds
+
+def find_audio_files(root: str, extensions=(".wav",)) -> List[str]:
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(extensions):
+                paths.append(os.path.join(dirpath, name))
+    return sorted(paths)
+
+def default_track_id(path: str) -> str:
+    """
+    File stem; name files by Spotify ID so matches resolve in the Ark.
+    Stems that collide get the path relative to the library root instead
+    (see LibraryFingerprinter.track_ids).
+    """
+    return os.path.splitext(os.path.basename(path))[0]
+
+class LibraryFingerprinter:
+    """
+    Fingerprint a directory of audio files across all cores into a FingerprintStore.
+    Completed files are recorded as sources of the segment they went into, in
+    the same commit, so an interrupted run resumes where it stopped and never
+    appends a file twice.
+    """
+
+    def __init__(self, store: FingerprintStore, workers: Optional[int] = None, commit_every: int = 200,
+                 track_id_fn: Callable[[str], str] = default_track_id):
+        self.store = store
+        self.workers = workers or os.cpu_count() or 1
+        self.commit_every = commit_every
+        self.track_id_fn = track_id_fn
+
+    def completed(self) -> set:
+        return self.store.sources()
+
+    def track_ids(self, root: str, paths: List[str]) -> Dict[str, str]:
+        """
+        Track ID per path. An ID from track_id_fn that is shared by several
+        files, or already belongs to a stored track, is replaced by the file's
+        path relative to root, so two files never merge into one track.
+        """
+        ids = {path: self.track_id_fn(path) for path in paths}
+        shared = Counter(ids.values())
+        stored = set(self.store.track_ids)
+        for path, track_id in ids.items():
+            if shared[track_id] > 1 or track_id in stored:
+                ids[path] = os.path.relpath(path, root).replace(os.sep, "/")
+        return ids
+
+    def _commit(self, builder, paths: List[str]):
+        self.store.append(builder, sources=paths)
+
+    def run(self, root: str, callback: Optional[Callable[[str], None]] = None) -> dict:
+        def log(msg):
+            if callback:
+                callback(msg)
+
+        done = self.completed()
+        todo = [p for p in find_audio_files(root) if os.path.abspath(p) not in done]
+        log(f"Fingerprinting {len(todo)} files ({len(done)} already done) with {self.workers} workers...")
+
+        track_ids = self.track_ids(root, todo)
+        renamed = sum(1 for path in todo if track_ids[path] != self.track_id_fn(path))
+        if renamed:
+            log(f"{renamed} files share a track ID; using their paths in the library instead")
+
+        started = time.perf_counter()
+        stats = {"files": 0, "failed": 0, "audio_seconds": 0.0, "hashes": 0}
+        builder = self.store.builder()
+        batch: List[str] = []
+
+        def report() -> str:
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            stats["elapsed"] = elapsed
+            stats["audio_hours_per_minute"] = (stats["audio_seconds"] / 3600.0) / (elapsed / 60.0)
+            return (f"{stats['files']}/{len(todo)} files, {stats['audio_seconds'] / 3600.0:.2f} h audio, "
+                    f"{stats['audio_hours_per_minute']:.2f} audio-h/min")
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = set()
+            queue = iter(todo)
+
+            def submit_next():
+                path = next(queue, None)
+                if path is not None:
+                    pending.add(pool.submit(fingerprint_file, path))
+
+            # Bounded in-flight work keeps memory flat on huge libraries
+            for _ in range(self.workers * 2):
+                submit_next()
+
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    pending.discard(future)
+                    submit_next()
+                    try:
+                        path, hashes, offsets, seconds = future.result()
+                    except Exception as e:
+                        stats["failed"] += 1
+                        log(f"Skipping file: {e}")
+                        continue
+
+                    builder.add(track_ids[path], hashes, offsets)
+                    batch.append(os.path.abspath(path))
+                    stats["files"] += 1
+                    stats["audio_seconds"] += seconds
+                    stats["hashes"] += len(hashes)
+
+                    if len(batch) >= self.commit_every:
+                        self._commit(builder, batch)
+                        builder, batch = self.store.builder(), []
+                        log(f"Fingerprinted {report()}")
+
+        if batch:
+            self._commit(builder, batch)
+        else:
+            builder.abort()
+
+        log(f"Library fingerprinting complete: {report()}, {stats['failed']} failed")
+        return stats
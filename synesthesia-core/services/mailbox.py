@@ -0,0 +1,142 @@
+import time
+import numpy as np
+from typing import Optional
+
+# One analysis frame; stars travel separately in the star ring
+FRAME_DTYPE = np.dtype([
+    ("seq", np.uint64),
+    ("time", np.float64),
+    ("rms", np.float32),
+    ("flatness", np.float32),
+    ("centroid", np.float32),
+    ("rolloff", np.float32),
+    ("onset", np.float32),
+    ("bpm", np.float32),
+    ("tempo_confidence", np.float32),
+    ("is_transient", np.bool_),
+    ("stars", np.uint16),
+])
+
+# Constellation points: (f1 bin, dt frames) of each fingerprint hash
+STAR_DTYPE = np.uint16
+
+class FrameMailbox:
+    """
+    Single-producer / single-consumer channel for DSP frames.
+
+    The audio thread publishes into preallocated NumPy rings and the UI drains
+    them; neither side takes a lock. Each side only ever advances its own
+    counter (producer: _head/_star_head, consumer: _tail/_star_tail) and the
+    producer bumps its counter after the record is written, so the consumer
+    never sees a partial record.
+
+    - drain() returns every frame published since the last drain (lossless up
+      to capacity; further frames are dropped and counted).
+    - latest() is a fast path for continuous signals (RMS, flatness): the newest
+      frame, readable by anyone at any time without consuming the ring.
+    - drain_stars() returns all stars accumulated since the last call, so
+      transients are never lost to sampling.
+    """
+
+    def __init__(self, capacity: int = 64, star_capacity: int = 4096):
+        self.capacity = capacity
+        self.star_capacity = star_capacity
+        self._frames = np.zeros(capacity, dtype=FRAME_DTYPE)
+        self._stars = np.zeros((star_capacity, 2), dtype=STAR_DTYPE)
+
+        # Latest-value slots, double-buffered; _latest names the readable one
+        self._slots = np.zeros(2, dtype=FRAME_DTYPE)
+        self._latest = -1
+
+        self._head = 0
+        self._tail = 0
+        self._star_head = 0
+        self._star_tail = 0
+
+        self.published = 0
+        self.dropped_frames = 0
+        self.dropped_stars = 0
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    # --- Producer side (audio thread) ---
+
+    def publish(self, rms: float, flatness: float, centroid: float = 0.0, rolloff: float = 0.0,
+                onset: float = 0.0, bpm: float = 0.0, tempo_confidence: float = 0.0,
+                stars: Optional[np.ndarray] = None) -> bool:
+        """Write one frame (and its stars). Returns False if the frame ring was full."""
+        seq = self.published
+        self.published += 1
+
+        n_stars = 0
+        if stars is not None and len(stars):
+            n_stars = self._push_stars(stars)
+
+        values = (seq, time.perf_counter(), rms, flatness, centroid, rolloff, onset,
+                  bpm, tempo_confidence, rms > 0.1, n_stars)
+
+        slot = 0 if self._latest != 0 else 1
+        self._slots[slot] = values
+        self._latest = slot
+
+        if self._head - self._tail >= self.capacity:
+            self.dropped_frames += 1
+            return False
+        self._frames[self._head % self.capacity] = values
+        self._head += 1
+        return True
+
+    def _push_stars(self, stars: np.ndarray) -> int:
+        free = self.star_capacity - (self._star_head - self._star_tail)
+        n = min(len(stars), free)
+        self.dropped_stars += len(stars) - n
+        if n == 0:
+            return 0
+
+        start = self._star_head % self.star_capacity
+        first = min(n, self.star_capacity - start)
+        self._stars[start:start + first] = stars[:first]
+        self._stars[:n - first] = stars[first:n]
+        self._star_head += n
+        return n
+
+    # --- Consumer side (UI thread) ---
+
+    def drain(self) -> np.ndarray:
+        """Copy out and consume every pending frame, oldest first."""
+        head, tail = self._head, self._tail
+        if head == tail:
+            return self._frames[:0].copy()
+
+        idx = np.arange(tail, head) % self.capacity
+        frames = self._frames[idx]
+        self._tail = head
+        return frames
+
+    def drain_stars(self) -> np.ndarray:
+        """Copy out and consume every accumulated star as an (n, 2) array."""
+        head, tail = self._star_head, self._star_tail
+        if head == tail:
+            return self._stars[:0].copy()
+
+        idx = np.arange(tail, head) % self.star_capacity
+        stars = self._stars[idx]
+        self._star_tail = head
+        return stars
+
+    def latest(self) -> Optional[np.void]:
+        """Newest published frame (not consumed), or None before the first one."""
+        # The producer always writes the other slot, so this one is never mid-write
+        slot = self._latest
+        if slot < 0:
+            return None
+        return self._slots[slot].copy()
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "pending": len(self),
+            "dropped_frames": self.dropped_frames,
+            "dropped_stars": self.dropped_stars,
+        }
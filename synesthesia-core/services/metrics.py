@@ -0,0 +1,209 @@
+import json
+import time
+import functools
+import threading
+from typing import Callable, Dict, List, Optional
+
+# HDR-style log-linear buckets over integer microseconds: values below
+# 2 * SUB_BUCKETS are exact, above that every power of two is split into
+# SUB_BUCKETS equal buckets (<= 1/16 = 6.25% relative error).
+SUB_BITS = 4
+SUB_BUCKETS = 1 << SUB_BITS
+# Up to 2^40 us (~12 days) before clamping
+BUCKETS = (40 - SUB_BITS + 1) * SUB_BUCKETS
+
+def _bucket(us: int) -> int:
+    shift = us.bit_length() - SUB_BITS - 1
+    if shift <= 0:
+        return us
+    return min(BUCKETS - 1, shift * SUB_BUCKETS + (us >> shift))
+
+def _bucket_value(index: int) -> float:
+    """Midpoint of a bucket, in microseconds."""
+    shift = index // SUB_BUCKETS - 1
+    if shift <= 0:
+        return float(index)
+    low = (index - shift * SUB_BUCKETS) << shift
+    return low + ((1 << shift) - 1) / 2.0
+
+class Histogram:
+    """Fixed-memory latency histogram. record() is O(1); percentiles walk ~600 buckets."""
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKETS
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+        self._lock = threading.Lock()
+
+    def record_us(self, us: int):
+        index = _bucket(us)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_us += us
+            if self.min_us is None or us < self.min_us:
+                self.min_us = us
+            if us > self.max_us:
+                self.max_us = us
+
+    def record(self, ms: float):
+        self.record_us(max(0, int(ms * 1000)))
+
+    def percentile(self, q: float) -> float:
+        """q in [0, 100], result in milliseconds."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, int(q / 100.0 * self.count + 0.5))
+            seen = 0
+            for index, n in enumerate(self.counts):
+                seen += n
+                if seen >= rank:
+                    value = min(max(_bucket_value(index), self.min_us), self.max_us)
+                    return value / 1000.0
+        return self.max_us / 1000.0
+
+    def snapshot(self) -> Dict:
+        count = self.count
+        return {
+            "count": count,
+            "mean_ms": self.total_us / count / 1000.0 if count else 0.0,
+            "sum_ms": self.total_us / 1000.0,
+            "min_ms": (self.min_us or 0) / 1000.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "p999_ms": self.percentile(99.9),
+            "max_ms": self.max_us / 1000.0,
+        }
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * BUCKETS
+            self.count = self.total_us = self.max_us = 0
+            self.min_us = None
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record_us((time.perf_counter_ns() - self.started) // 1000)
+        return False
+
+class Metrics:
+    """
+    Registry of named latency histograms, counters and gauges (callables
+    read at snapshot time). Names are created on first use.
+
+        with metrics.timer("vector_search"): ...
+        @metrics.timed("nav_tick")
+        metrics.count("nav_found")
+
+    snapshot() returns plain dicts; to_json() / to_prometheus() format it
+    and dump(path) writes either one depending on the extension (.prom).
+    """
+
+    def __init__(self, prefix: str = "synesthesia"):
+        self.prefix = prefix
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Callable[[], float]] = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        hist = self.histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(name, Histogram())
+        return hist
+
+    def timer(self, name: str) -> _Timer:
+        return _Timer(self.histogram(name))
+
+    def timed(self, name: str):
+        """Decorator: record every call of the function into histogram name."""
+        def decorate(fn):
+            hist = self.histogram(name)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter_ns()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    hist.record_us((time.perf_counter_ns() - started) // 1000)
+            return wrapper
+        return decorate
+
+    def record(self, name: str, ms: float):
+        self.histogram(name).record(ms)
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, fn: Callable[[], float]):
+        self.gauges[name] = fn
+
+    def snapshot(self) -> Dict:
+        gauges = {}
+        for name, fn in list(self.gauges.items()):
+            try:
+                gauges[name] = float(fn())
+            except Exception:
+                continue
+        return {
+            "time": time.time(),
+            "uptime_s": time.time() - self.started_at,
+            "latency": {name: hist.snapshot() for name, hist in sorted(self.histograms.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "gauges": gauges,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        snap = self.snapshot()
+        lines = []
+        for name, s in snap["latency"].items():
+            metric = f"{self.prefix}_{name}_ms"
+            lines.append(f"# TYPE {metric} summary")
+            for q, key in (("0.5", "p50_ms"), ("0.9", "p90_ms"), ("0.99", "p99_ms"), ("0.999", "p999_ms")):
+                lines.append(f'{metric}{{quantile="{q}"}} {s[key]:.3f}')
+            lines.append(f"{metric}_sum {s['sum_ms']:.3f}")
+            lines.append(f"{metric}_count {s['count']}")
+        for name, value in snap["counters"].items():
+            metric = f"{self.prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, value in snap["gauges"].items():
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> str:
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def reset(self):
+        with self._lock:
+            for hist in self.histograms.values():
+                hist.reset()
+            self.counters.clear()
+
+# Process-wide registry the services record into
+metrics = Metrics()
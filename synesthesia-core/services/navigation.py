@@ -3,6 +3,7 @@ import numpy as np
 from typing import Optional, Dict
 from services.vector import VectorEngine
 from services.spotify import SpotifyClient
+from services.metrics import metrics
 
 class Navigation:
     def __init__(self, vector_engine: VectorEngine, spotify_client: SpotifyClient):
@@ -11,11 +12,22 @@ class Navigation:
         self.last_vector = None
         self.last_search_time = 0
         self.current_track_id = None
+        self.current_track_vector = None
+        self.last_switch_time = 0
         
         # Debounce settings
         self.debounce_ms = 300
         self.threshold = 0.01
 
+        # Hysteresis (off while both are 0, as in manual navigation): a new
+        # track must beat the playing one by switch_margin in cosine distance,
+        # the collection's metric, and the playing one must have lasted
+        # min_dwell_ms. Each switch is a Spotify start_playback call.
+        self.switch_margin = 0.0
+        self.min_dwell_ms = 0
+        self.switches = 0
+        self.holds = 0
+
     def _vector_dict_to_array(self, vector_dict: Dict[str, float]) -> np.ndarray:
         return np.array([
             vector_dict['energy'],
@@ -25,16 +37,41 @@ class Navigation:
             vector_dict['instrumentalness']
         ], dtype=np.float32)
 
+    def seed(self, vector: np.ndarray, track_id: Optional[str] = None):
+        """
+        Re-anchor navigation on a known point (e.g. an identified track).
+        The next tick only searches once the target moves away from it.
+        """
+        self.last_vector = np.asarray(vector, dtype=np.float32)
+        self.last_search_time = time.time() * 1000
+        if track_id:
+            self.current_track_id = track_id
+            self.current_track_vector = self.last_vector
+            self.last_switch_time = self.last_search_time
+
     def force_search(self, current_vector: Dict[str, float]) -> Optional[Dict]:
         """Force a search immediately, bypassing debounce."""
         vector_array = self._vector_dict_to_array(current_vector)
-        return self._perform_search(vector_array)
+        return self._perform_search(vector_array, forced=True)
 
-    def tick(self, current_vector: Dict[str, float]) -> Optional[Dict]:
+    @metrics.timed("nav_tick")
+    def tick(self, current_vector: Dict[str, float], debounce: bool = True) -> Optional[Dict]:
         """
-        Called every tick (e.g. 100ms).
+        Called every tick (e.g. 100ms), or once per settled change when the
+        caller debounces itself (debounce=False).
         Returns a result dict if a search/action occurred, else None.
         """
+        vector_array = self.accept(current_vector, debounce)
+        if vector_array is None:
+            return None
+        return self._perform_search(vector_array)
+
+    def accept(self, current_vector: Dict[str, float], debounce: bool = True) -> Optional[np.ndarray]:
+        """
+        First half of tick(): threshold + debounce. Returns the vector to
+        search for, or None. Callers that run the search themselves (e.g.
+        batched across sessions) pass its results to apply().
+        """
         vector_array = self._vector_dict_to_array(current_vector)
 
         # Check for significant change
@@ -45,17 +82,34 @@ class Navigation:
 
         # Debounce
         now = time.time() * 1000
-        if now - self.last_search_time < self.debounce_ms:
+        if debounce and now - self.last_search_time < self.debounce_ms:
             return None
 
         self.last_vector = vector_array
         self.last_search_time = now
-        
-        # print(f"Searching for vector: {vector_array}")
-        return self._perform_search(vector_array)
+        return vector_array
+
+    @staticmethod
+    def _cosine_distance(a: np.ndarray, b: np.ndarray) -> float:
+        # Same ranking as the Qdrant collection (Distance.COSINE)
+        norm = float(np.linalg.norm(a) * np.linalg.norm(b))
+        return 1.0 - float(np.dot(a, b)) / norm if norm > 0 else 1.0
 
-    def _perform_search(self, vector_array: np.ndarray) -> Optional[Dict]:
-        results = self.ve.search(vector_array, k=1)
+    def _should_switch(self, vector_array: np.ndarray, found_vector: np.ndarray) -> bool:
+        """Hysteresis check for replacing the playing track with a closer one."""
+        if self.current_track_vector is None or (self.switch_margin <= 0 and self.min_dwell_ms <= 0):
+            return True
+        if time.time() * 1000 - self.last_switch_time < self.min_dwell_ms:
+            return False
+        current = self._cosine_distance(vector_array, self.current_track_vector)
+        candidate = self._cosine_distance(vector_array, found_vector)
+        return current - candidate > self.switch_margin
+
+    def _perform_search(self, vector_array: np.ndarray, forced: bool = False) -> Optional[Dict]:
+        return self.apply(vector_array, self.ve.search(vector_array, k=1), forced)
+
+    def apply(self, vector_array: np.ndarray, results: list, forced: bool = False) -> Dict:
+        """Second half of a search: pick the nearest hit, apply hysteresis and play it."""
         if results:
             track = results[0]
             track_id = track['payload'].get('spotify_id')
@@ -66,7 +120,19 @@ class Navigation:
             
             # Avoid re-playing same track (unless forced? No, keep check)
             if track_id != self.current_track_id:
+                if not forced and not self._should_switch(vector_array, found_vector):
+                    self.holds += 1
+                    return {
+                        "type": "held",
+                        "track_id": self.current_track_id,
+                        "candidate": track['payload'],
+                        "distance": distance
+                    }
+
                 self.current_track_id = track_id
+                self.current_track_vector = found_vector
+                self.last_switch_time = time.time() * 1000
+                self.switches += 1
                 self.sp.play_track(track_id)
                 
             return {
@@ -78,5 +144,3 @@ class Navigation:
             return {
                 "type": "void"
             }
-            
-        return None
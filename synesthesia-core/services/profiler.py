@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import time
+import inspect
+import threading
+import collections
+from typing import Callable, Dict, List, Optional, Tuple
+
+def _label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """
+    Opt-in statistical profiler for the hot paths.
+
+    While running, a daemon thread snapshots every thread's Python stack
+    (sys._current_frames) at `interval` seconds. A sample is kept only if the
+    stack passes through one of the target functions, and is attributed to
+    that section (outermost target wins). Nothing is wrapped or patched, so
+    profiling works across the audio, navigation and ingestion threads and
+    costs nothing at all while stopped.
+
+    Results: top(n) for a live hot-function view and save(directory) for a
+    per-session folder with folded stacks (flamegraph.pl / speedscope
+    compatible), a text summary and JSON.
+    """
+
+    def __init__(self, targets: Dict[str, Callable], interval: float = 0.005):
+        # Decorated functions (metrics.timed) are matched by their real code object
+        self.targets = {}
+        for name, fn in targets.items():
+            code = getattr(inspect.unwrap(fn), "__code__", None)
+            if code is not None:
+                self.targets[code] = name
+        self.interval = interval
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.samples = 0
+        self.ticks = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self.sections: Dict[str, int] = collections.Counter()
+        # (section, code objects root -> leaf) -> samples
+        self.stacks: Dict[Tuple, int] = collections.Counter()
+
+    def start(self):
+        if self.running:
+            return
+        with self._lock:
+            self._reset()
+        self.started_at = time.time()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        self.thread = None
+        self.duration = time.time() - self.started_at
+
+    def _run(self):
+        own = threading.get_ident()
+        while self.running:
+            self.sample(skip=own)
+            time.sleep(self.interval)
+
+    def sample(self, skip: Optional[int] = None):
+        """Take one snapshot of all threads (called by the sampler thread)."""
+        found = []
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            stack = []
+            section = None
+            root = 0
+            while frame is not None:
+                code = frame.f_code
+                stack.append(code)
+                if code in self.targets:
+                    section = self.targets[code]
+                    root = len(stack)
+                frame = frame.f_back
+            if section is not None:
+                # Keep the section root and everything it called
+                found.append((section, tuple(reversed(stack[:root]))))
+
+        with self._lock:
+            self.ticks += 1
+            for key in found:
+                self.samples += 1
+                self.sections[key[0]] += 1
+                self.stacks[key] += 1
+
+    def top(self, n: int = 15, section: Optional[str] = None) -> List[Dict]:
+        """Hottest functions: self = samples where it was the leaf, total = where it was on the stack."""
+        own: Dict = collections.Counter()
+        total: Dict = collections.Counter()
+        with self._lock:
+            items = list(self.stacks.items())
+            samples = sum(count for (sec, _), count in items if section in (None, sec))
+        for (sec, stack), count in items:
+            if section not in (None, sec):
+                continue
+            own[stack[-1]] += count
+            for code in set(stack):
+                total[code] += count
+
+        rows = []
+        for code, count in own.most_common(n):
+            rows.append({
+                "function": _label(code),
+                "self": count,
+                "total": total[code],
+                "self_pct": 100.0 * count / samples if samples else 0.0,
+                "total_pct": 100.0 * total[code] / samples if samples else 0.0,
+            })
+        return rows
+
+    def folded(self) -> str:
+        """Collapsed stacks: 'section;root;...;leaf count' per line."""
+        with self._lock:
+            items = list(self.stacks.items())
+        lines = [";".join([section] + [_label(code) for code in stack]) + f" {count}" for (section, stack), count in items]
+        return "\n".join(sorted(lines)) + "\n"
+
+    def summary(self, n: int = 25) -> Dict:
+        return {
+            "started_at": self.started_at,
+            "duration_s": self.duration if not self.running else time.time() - self.started_at,
+            "interval_ms": self.interval * 1000,
+            "ticks": self.ticks,
+            "samples": self.samples,
+            "sections": dict(self.sections),
+            "top": self.top(n),
+        }
+
+    def save(self, directory: str, n: int = 25) -> str:
+        """Write this session to directory/profile-<timestamp>/ and return that path."""
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at or time.time()))
+        path = os.path.join(directory, f"profile-{stamp}")
+        os.makedirs(path, exist_ok=True)
+
+        summary = self.summary(n)
+        with open(os.path.join(path, "stacks.folded"), "w", encoding="utf-8") as f:
+            f.write(self.folded())
+        with open(os.path.join(path, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        with open(os.path.join(path, "top.txt"), "w", encoding="utf-8") as f:
+            f.write(f"{summary['samples']} samples in {summary['duration_s']:.1f}s "
+                    f"({summary['interval_ms']:.0f} ms interval)\n")
+            for section, count in sorted(summary["sections"].items(), key=lambda kv: -kv[1]):
+                f.write(f"  {section}: {count}\n")
+            f.write(f"\n{'self%':>7} {'total%':>7}  function\n")
+            for row in summary["top"]:
+                f.write(f"{row['self_pct']:7.1f} {row['total_pct']:7.1f}  {row['function']}\n")
+        return path
@@ -0,0 +1,128 @@
+"""
+Append-only binary session log.
+
+    file     MAGIC, then records back to back
+    record   <BIQ  kind, payload length, microseconds since recording start
+    VECTOR   5 x f32                       target vector as the UI changed it
+    TICK     <QB7x then 5 x f32            tick seq, mode (0 tick, 1 debounced tick, 2 forced search), vector
+    RESULT   <Qf then UTF-8 JSON           tick seq, live tick duration (ms), result dict (null if None)
+    AUDIO    <IH2x then interleaved i16    input sample rate, channels, raw DSP input block
+    SEARCH   UTF-8                         text search query
+
+A truncated last record (crash mid-write) is ignored by read_log().
+"""
+import json
+import time
+import struct
+import threading
+import numpy as np
+from typing import Dict, Iterator, Optional, Tuple
+
+MAGIC = b"SYNREC1\n"
+RECORD = struct.Struct("<BIQ")
+TICK_HEADER = struct.Struct("<QB7x")
+RESULT_HEADER = struct.Struct("<Qf")
+AUDIO_HEADER = struct.Struct("<IH2x")
+
+VECTOR, TICK, RESULT, AUDIO, SEARCH = 1, 2, 3, 4, 5
+KIND_NAMES = {VECTOR: "vector", TICK: "tick", RESULT: "result", AUDIO: "audio", SEARCH: "search"}
+DIMENSIONS = ("energy", "valence", "danceability", "acousticness", "instrumentalness")
+
+def _vector_bytes(vector) -> bytes:
+    if isinstance(vector, dict):
+        vector = [vector.get(dim, 0.0) for dim in DIMENSIONS]
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+def _vector_dict(payload: bytes) -> Dict[str, float]:
+    return dict(zip(DIMENSIONS, np.frombuffer(payload, dtype="<f4").tolist()))
+
+class SessionRecorder:
+    """
+    Thread-safe writer for the session log (UI, navigation and audio threads
+    all append). Writes go through a buffered file; audio is stored as 16-bit
+    PCM, about 88 kB/s for mono 44.1 kHz.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._tick_seq = 0
+        self.records = 0
+        self.bytes = len(MAGIC)
+
+    def _append(self, kind: int, payload: bytes):
+        t_us = int((time.perf_counter() - self._started) * 1e6)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(RECORD.pack(kind, len(payload), t_us))
+            self._file.write(payload)
+            self.records += 1
+            self.bytes += RECORD.size + len(payload)
+
+    def vector(self, vector):
+        self._append(VECTOR, _vector_bytes(vector))
+
+    def tick(self, vector, debounce: bool, forced: bool = False) -> int:
+        with self._lock:
+            self._tick_seq += 1
+            seq = self._tick_seq
+        mode = 2 if forced else int(bool(debounce))
+        self._append(TICK, TICK_HEADER.pack(seq, mode) + _vector_bytes(vector))
+        return seq
+
+    def result(self, seq: int, elapsed_ms: float, result: Optional[Dict]):
+        body = json.dumps(result, separators=(",", ":"), default=float).encode("utf-8")
+        self._append(RESULT, RESULT_HEADER.pack(seq, elapsed_ms) + body)
+
+    def audio(self, block: np.ndarray, sample_rate: int):
+        block = np.asarray(block)
+        channels = block.shape[1] if block.ndim > 1 else 1
+        pcm = (np.clip(block, -1.0, 1.0) * 32767).astype("<i2")
+        self._append(AUDIO, AUDIO_HEADER.pack(int(sample_rate), channels) + pcm.tobytes())
+
+    def search(self, query: str):
+        self._append(SEARCH, query.encode("utf-8"))
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def read_log(path: str) -> Iterator[Tuple[float, int, object]]:
+    """Yield (seconds since start, kind, decoded payload) for every complete record."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            kind, length, t_us = RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            yield t_us / 1e6, kind, _decode(kind, payload)
+
+def _decode(kind: int, payload: bytes):
+    if kind == VECTOR:
+        return _vector_dict(payload)
+    if kind == TICK:
+        seq, mode = TICK_HEADER.unpack_from(payload)
+        return {"seq": seq, "debounce": mode == 1, "forced": mode == 2,
+                "vector": _vector_dict(payload[TICK_HEADER.size:])}
+    if kind == RESULT:
+        seq, elapsed_ms = RESULT_HEADER.unpack_from(payload)
+        return {"seq": seq, "ms": elapsed_ms, "result": json.loads(payload[RESULT_HEADER.size:])}
+    if kind == AUDIO:
+        sample_rate, channels = AUDIO_HEADER.unpack_from(payload)
+        pcm = np.frombuffer(payload, dtype="<i2", offset=AUDIO_HEADER.size)
+        block = (pcm.astype(np.float32) / 32767).reshape(-1, channels)
+        return {"sample_rate": sample_rate, "channels": channels, "block": block}
+    if kind == SEARCH:
+        return payload.decode("utf-8")
+    return payload
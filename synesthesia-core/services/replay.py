@@ -0,0 +1,141 @@
+"""
+Headless replay of a session log (services/recorder.py) into a SystemController.
+
+Ticks (or, for logs without ticks, the raw vector changes) are fed to the
+controller's navigation, audio blocks to its DSP callback and text searches
+to handle_search, either on the recorded schedule (speed=1.0, 2.0, ...) or
+back to back (speed=None). The report compares replayed latencies and
+results with the ones recorded live.
+
+Navigation debounce / dwell use wall-clock time, so at max speed a replay
+may legitimately hold or skip switches the live session made; result
+agreement is only meaningful at recorded speed.
+"""
+import time
+from typing import Dict, Optional
+
+from services.metrics import Histogram
+from services.recorder import read_log, KIND_NAMES, VECTOR, TICK, RESULT, AUDIO, SEARCH
+
+class NullPlayer:
+    """Spotify stand-in for replays: navigation runs, nothing plays."""
+
+    def __init__(self):
+        self.played = []
+
+    def play_track(self, track_id: str):
+        self.played.append(track_id)
+
+def build_controller(playback: bool = False, searches: bool = False):
+    """A SystemController with only what a replay needs (no audio device)."""
+    from services.controller import SystemController
+    from services.navigation import Navigation
+
+    controller = SystemController()
+    services = ("vector", "spotify") if playback or searches else ("vector",)
+    controller.start(services=services)
+    if not controller.wait_ready("vector"):
+        raise RuntimeError("Vector store unavailable: " + controller.errors.get("vector", ""))
+    if playback:
+        controller.wait_ready("navigation")
+    else:
+        controller.nav = Navigation(controller.ve, NullPlayer())
+    return controller
+
+def _track_id(result: Optional[Dict]) -> Optional[str]:
+    if not result:
+        return None
+    track = result.get("track") or result.get("candidate") or {}
+    return track.get("spotify_id") or track.get("id")
+
+class Replayer:
+    def __init__(self, controller, speed: Optional[float] = 1.0, searches: bool = True):
+        self.controller = controller
+        self.speed = speed
+        self.searches = searches
+        self.histograms = {name: Histogram() for name in ("tick", "recorded_tick", "search", "dsp_block", "lag")}
+        # (sample rate, channels) the DSP input is currently configured for
+        self._layout = None
+
+    def _feed_audio(self, audio: Dict):
+        dsp = self.controller.dsp
+        layout = (audio["sample_rate"], audio["channels"])
+        if self._layout != layout:
+            dsp.open_input(*layout)
+            dsp.running = True
+            self._layout = layout
+        started = time.perf_counter()
+        dsp.audio_callback(audio["block"], len(audio["block"]), None, None)
+        self.histograms["dsp_block"].record((time.perf_counter() - started) * 1000)
+
+    def _feed_tick(self, vector: Dict[str, float], debounce: bool, forced: bool) -> Optional[Dict]:
+        started = time.perf_counter()
+        if forced:
+            result = self.controller.force_search(vector)
+        else:
+            result = self.controller.tick(vector, debounce)
+        self.histograms["tick"].record((time.perf_counter() - started) * 1000)
+        return result
+
+    def run(self, path: str) -> Dict:
+        """Replay the log at `path` and return the report."""
+        # Logs from sessions without tick records (e.g. UI-only captures) are
+        # driven by their vector changes instead
+        has_ticks = any(kind == TICK for _, kind, _ in read_log(path))
+
+        counts = {name: 0 for name in KIND_NAMES.values()}
+        replayed: Dict[int, Optional[Dict]] = {}
+        recorded: Dict[int, Optional[Dict]] = {}
+        audio_seconds = 0.0
+        recorded_duration = 0.0
+        self._layout = None
+
+        started = time.perf_counter()
+        for t, kind, payload in read_log(path):
+            name = KIND_NAMES.get(kind, "unknown")
+            counts[name] = counts.get(name, 0) + 1
+            recorded_duration = t
+            if self.speed:
+                lag = time.perf_counter() - started - t / self.speed
+                if lag < 0:
+                    time.sleep(-lag)
+                else:
+                    self.histograms["lag"].record(lag * 1000)
+
+            if kind == TICK:
+                replayed[payload["seq"]] = self._feed_tick(payload["vector"], payload["debounce"], payload["forced"])
+            elif kind == VECTOR and not has_ticks:
+                self._feed_tick(payload, True, False)
+            elif kind == RESULT:
+                recorded[payload["seq"]] = payload["result"]
+                self.histograms["recorded_tick"].record(payload["ms"])
+            elif kind == AUDIO:
+                self._feed_audio(payload)
+                audio_seconds += len(payload["block"]) / payload["sample_rate"]
+            elif kind == SEARCH and self.searches:
+                search_started = time.perf_counter()
+                self.controller.handle_search(payload)
+                self.histograms["search"].record((time.perf_counter() - search_started) * 1000)
+        wall = time.perf_counter() - started
+
+        compared = [seq for seq in recorded if seq in replayed]
+        same_type = sum(1 for seq in compared
+                        if (recorded[seq] or {}).get("type") == (replayed[seq] or {}).get("type"))
+        same_track = sum(1 for seq in compared if _track_id(recorded[seq]) == _track_id(replayed[seq]))
+        records = sum(counts.values())
+        return {
+            "path": path,
+            "speed": self.speed or "max",
+            "records": counts,
+            "recorded_s": recorded_duration,
+            "wall_s": wall,
+            "records_per_s": records / wall if wall else 0.0,
+            "audio_s": audio_seconds,
+            "audio_realtime_factor": audio_seconds / wall if wall else 0.0,
+            "latency": {name: h.snapshot() for name, h in self.histograms.items() if h.count},
+            "agreement": {
+                "compared": len(compared),
+                "same_type": same_type,
+                "same_track": same_track,
+            },
+        }
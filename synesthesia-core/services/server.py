@@ -0,0 +1,321 @@
+"""
+Headless multi-session navigation server.
+
+    uvicorn services.server:app --host 0.0.0.0 --port 8000
+
+Every client creates a session and posts its 5D vector to /sessions/{id}/tick.
+/stream is a WebSocket that pushes DSP frames, stars and navigation results
+in the binary format of services.stream (SYN_SERVER_AUDIO=1 runs the DSP).
+Sessions keep their own Navigation state (debounce, hysteresis, current
+track) but share one VectorEngine and one SpotifyClient. Searches from all
+sessions go through a SearchBatcher, which turns whatever arrived while the
+previous query was running into a single batched index query.
+"""
+import os
+import time
+import uuid
+import asyncio
+import contextlib
+import numpy as np
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Response, WebSocket
+from pydantic import BaseModel
+
+from services.navigation import Navigation
+from services.metrics import metrics
+from services.stream import StreamHub
+
+# Sessions not seen for this long are dropped (s)
+SESSION_TTL = 600.0
+
+class SearchBatcher:
+    """
+    Micro-batches concurrent nearest-neighbour queries.
+
+    Up to `workers` batched queries run at once (in the default executor).
+    While they run, new requests queue up; as soon as a slot frees, everything
+    queued (up to max_batch) goes out as one search_batch() call. A lone
+    request at low load is dispatched immediately, so batching adds no latency
+    unless max_wait_ms is set to linger for stragglers.
+    """
+
+    def __init__(self, vector_engine, max_batch: int = 128, max_wait_ms: float = 0.0, workers: int = 2):
+        self.ve = vector_engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.workers = workers
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self.batches = 0
+        self.requests = 0
+        self.largest = 0
+
+    def _ensure_started(self):
+        # Bound to the running loop on first use (works with and without lifespan)
+        if self.task is None or self.task.done():
+            self.queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def search(self, vector: np.ndarray, k: int = 1) -> List[dict]:
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((vector, k, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            await self._slots.acquire()
+            batch = [await self.queue.get()]
+            if self.max_wait:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            asyncio.get_running_loop().create_task(self._execute(batch))
+
+    async def _execute(self, batch):
+        try:
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                return
+            vectors = np.stack([item[0] for item in batch])
+            k = max(item[1] for item in batch)
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.largest = max(self.largest, len(batch))
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(None, self.ve.search_batch, vectors, k)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, n, future), hits in zip(batch, results):
+                if not future.done():
+                    future.set_result(hits[:n])
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def stats(self) -> Dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest,
+        }
+
+class _SessionPlayer:
+    """Spotify stand-in for a session's Navigation: plays through the shared client off the event loop."""
+
+    def __init__(self, spotify, enabled: bool):
+        self.spotify = spotify
+        self.enabled = enabled
+
+    def play_track(self, track_id: str):
+        if self.enabled and self.spotify is not None:
+            asyncio.get_running_loop().run_in_executor(None, self.spotify.play_track, track_id)
+
+class Session:
+    """One client's navigation state on top of the shared services."""
+
+    def __init__(self, session_id: str, vector_engine, spotify, playback: bool = False):
+        self.id = session_id
+        self.nav = Navigation(vector_engine, _SessionPlayer(spotify, playback))
+        self.created = self.last_seen = time.monotonic()
+        self.ticks = 0
+        self.searches = 0
+
+    async def tick(self, vector: Dict[str, float], batcher: SearchBatcher, debounce: bool = True,
+                   forced: bool = False) -> Optional[Dict]:
+        self.last_seen = time.monotonic()
+        self.ticks += 1
+        if forced:
+            vector_array = self.nav._vector_dict_to_array(vector)
+        else:
+            vector_array = self.nav.accept(vector, debounce)
+            if vector_array is None:
+                return None
+
+        self.searches += 1
+        results = await batcher.search(vector_array, k=1)
+        return self.nav.apply(vector_array, results, forced)
+
+    def state(self) -> Dict:
+        return {
+            "session_id": self.id,
+            "current_track_id": self.nav.current_track_id,
+            "ticks": self.ticks,
+            "searches": self.searches,
+            "switches": self.nav.switches,
+            "holds": self.nav.holds,
+            "debounce_ms": self.nav.debounce_ms,
+            "switch_margin": self.nav.switch_margin,
+            "min_dwell_ms": self.nav.min_dwell_ms,
+        }
+
+class SessionOptions(BaseModel):
+    playback: bool = False
+    debounce_ms: Optional[float] = None
+    switch_margin: Optional[float] = None
+    min_dwell_ms: Optional[float] = None
+
+class TickRequest(BaseModel):
+    energy: float
+    valence: float
+    danceability: float
+    acousticness: float
+    instrumentalness: float = 0.0
+    debounce: bool = True
+
+def create_app(vector_engine=None, spotify=None, batcher: Optional[SearchBatcher] = None,
+               dsp=None, hub: Optional[StreamHub] = None) -> FastAPI:
+    """
+    Build the server. Services not passed in are created on startup (the
+    same lazy, heavy-import-free path the TUI controller uses). With a dsp,
+    its frames are streamed to /stream subscribers.
+    """
+    hub = hub or StreamHub(dsp.mailbox if dsp is not None else None)
+    state = {"ve": vector_engine, "sp": spotify, "batcher": batcher}
+    sessions: Dict[str, Session] = {}
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_):
+        loop = asyncio.get_running_loop()
+        if state["ve"] is None:
+            from services.vector import VectorEngine
+            state["ve"] = await loop.run_in_executor(None, VectorEngine)
+        if state["sp"] is None:
+            from services.spotify import SpotifyClient
+            state["sp"] = await loop.run_in_executor(None, SpotifyClient)
+        if dsp is not None:
+            dsp.start()
+        hub.start()
+        yield
+        await hub.close()
+        if dsp is not None:
+            dsp.stop()
+        if state["batcher"]:
+            await state["batcher"].close()
+
+    server = FastAPI(title="Synesthesia Navigation Server", lifespan=lifespan)
+
+    def get_batcher() -> SearchBatcher:
+        if state["batcher"] is None:
+            state["batcher"] = SearchBatcher(state["ve"])
+        return state["batcher"]
+
+    def get_session(session_id: str) -> Session:
+        session = sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Unknown session")
+        return session
+
+    def expire():
+        cutoff = time.monotonic() - SESSION_TTL
+        for session_id in [sid for sid, s in sessions.items() if s.last_seen < cutoff]:
+            del sessions[session_id]
+
+    @server.post("/sessions")
+    async def create_session(options: Optional[SessionOptions] = None):
+        options = options or SessionOptions()
+        expire()
+        session = Session(uuid.uuid4().hex, state["ve"], state["sp"], options.playback)
+        if options.debounce_ms is not None:
+            session.nav.debounce_ms = options.debounce_ms
+        if options.switch_margin is not None:
+            session.nav.switch_margin = options.switch_margin
+        if options.min_dwell_ms is not None:
+            session.nav.min_dwell_ms = options.min_dwell_ms
+        sessions[session.id] = session
+        metrics.count("server_sessions_created")
+        return session.state()
+
+    @server.get("/sessions/{session_id}")
+    async def session_state(session_id: str):
+        return get_session(session_id).state()
+
+    @server.delete("/sessions/{session_id}")
+    async def delete_session(session_id: str):
+        get_session(session_id)
+        del sessions[session_id]
+        return {"deleted": session_id}
+
+    async def run_tick(session_id: str, request: TickRequest, forced: bool) -> Dict:
+        session = get_session(session_id)
+        started = time.perf_counter()
+        vector = request.model_dump(exclude={"debounce"})
+        result = await session.tick(vector, get_batcher(), debounce=request.debounce, forced=forced)
+        metrics.record("server_tick", (time.perf_counter() - started) * 1000)
+        if result is None:
+            return {"type": "idle"}
+        metrics.count("nav_" + result["type"])
+        hub.publish_nav(result, session_id)
+        return result
+
+    @server.post("/sessions/{session_id}/tick")
+    async def tick(session_id: str, request: TickRequest):
+        return await run_tick(session_id, request, forced=False)
+
+    @server.post("/sessions/{session_id}/search")
+    async def force_search(session_id: str, request: TickRequest):
+        return await run_tick(session_id, request, forced=True)
+
+    @server.websocket("/stream")
+    async def stream(websocket: WebSocket, session: Optional[str] = None, viz: bool = True):
+        """Binary push: nav events for `session` (all sessions if omitted), plus DSP frames if viz."""
+        await websocket.accept()
+        hub.start()
+        subscriber = hub.subscribe(session, viz)
+
+        async def send():
+            while True:
+                await websocket.send_bytes(await subscriber.next())
+
+        async def receive():
+            # Only here to notice the client going away while nothing is being sent
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        tasks = [asyncio.ensure_future(send()), asyncio.ensure_future(receive())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.exception()  # a closed socket just ends the stream
+        finally:
+            for task in tasks:
+                task.cancel()
+            hub.unsubscribe(subscriber)
+
+    @server.get("/stats")
+    async def stats():
+        return {
+            "sessions": len(sessions),
+            "batcher": get_batcher().stats(),
+            "stream": hub.stats(),
+            "metrics": metrics.snapshot(),
+        }
+
+    @server.get("/metrics")
+    async def prometheus():
+        return Response(metrics.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+    return server
+
+def _server_dsp():
+    if not os.getenv("SYN_SERVER_AUDIO"):
+        return None
+    from services.dsp import DSP
+    return DSP()
+
+app = create_app(dsp=_server_dsp())
@@ -1,13 +1,19 @@
 import os
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
 from typing import List, Dict, Optional
 
+from services.metrics import metrics
+
 class SpotifyClient:
-    def __init__(self):
+    def __init__(self, api_base: Optional[str] = None):
         self.mock_mode = False
+        # Alternative Web API host, e.g. the local fake (services/fake_spotify.py)
+        api_base = api_base or os.getenv("SYN_SPOTIFY_API_BASE")
         client_id = os.getenv("SPOTIPY_CLIENT_ID")
         client_secret = os.getenv("SPOTIPY_CLIENT_SECRET")
+        if api_base:
+            # Real HTTP against a local stand-in: any credentials do
+            client_id = client_id or "local"
+            client_secret = client_secret or "local"
         if not client_id or not client_secret:
             if os.getenv("SYN_ENV") == "DEV":
                 print("⚠️  WARNING: Running in MOCK MODE (No Spotify Credentials)")
@@ -17,6 +23,20 @@ class SpotifyClient:
                 raise RuntimeError("FATAL: Spotify Credentials Missing in .env file. Set SYN_ENV=DEV to bypass.")
 
         try:
+            # Deferred: only needed once credentials are present
+            import spotipy
+            from spotipy.oauth2 import SpotifyOAuth, SpotifyClientCredentials
+            from spotipy.cache_handler import MemoryCacheHandler
+
+            if api_base:
+                # No user login against a stand-in: client-credentials tokens from its
+                # /api/token, kept in memory so the real token cache is never touched
+                auth_manager = SpotifyClientCredentials(client_id, client_secret, cache_handler=MemoryCacheHandler())
+                auth_manager.OAUTH_TOKEN_URL = api_base.rstrip("/") + "/api/token"
+                self.sp = spotipy.Spotify(auth_manager=auth_manager, requests_timeout=5)
+                self.sp.prefix = api_base.rstrip("/") + "/v1/"
+                return
+
             redirect_uri = os.getenv("SPOTIPY_REDIRECT_URI", "http://127.0.0.1:3000/callback")
             
             auth_manager = SpotifyOAuth(
@@ -33,6 +53,7 @@ class SpotifyClient:
                 # CRITICAL: Do not fail silently in production
                 raise RuntimeError(f"Spotify Auth Failed: {e}. Check your credentials or set SYN_ENV=DEV.")
 
+    @metrics.timed("spotify_play")
     def play_track(self, track_id: str):
         """Start playback of a track."""
         if self.mock_mode:
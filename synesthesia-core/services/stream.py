@@ -0,0 +1,202 @@
+"""
+Binary streaming of DSP frames, constellation stars and navigation events.
+
+Every message is a 16-byte little-endian header followed by a payload:
+
+    header   <BBHIQ   kind, version, reserved, count, seq
+    FEATURES count x WIRE_FRAME_DTYPE (48 bytes each: u64 seq, u64 time_us, 7 x f32, u32 stars)
+    STARS    count x (u16 f1 bin, u16 dt)
+    NAV      <BxxxfI  result type, distance, metadata length; then UTF-8 JSON track metadata
+
+seq is the newest DSP frame sequence number (FEATURES / STARS) or the hub's
+navigation event counter (NAV). time_us is wall-clock microseconds.
+"""
+import json
+import time
+import struct
+import asyncio
+import collections
+import numpy as np
+from typing import Dict, Optional, Set, Tuple
+
+from services.mailbox import FrameMailbox
+from services.metrics import metrics
+
+WIRE_VERSION = 1
+HEADER = struct.Struct("<BBHIQ")
+NAV_HEADER = struct.Struct("<BxxxfI")
+KIND_FEATURES, KIND_STARS, KIND_NAV = 1, 2, 3
+
+WIRE_FRAME_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("time_us", "<u8"),
+    ("rms", "<f4"),
+    ("flatness", "<f4"),
+    ("centroid", "<f4"),
+    ("rolloff", "<f4"),
+    ("onset", "<f4"),
+    ("bpm", "<f4"),
+    ("tempo_confidence", "<f4"),
+    ("stars", "<u4"),
+])
+WIRE_STAR_DTYPE = np.dtype("<u2")
+
+NAV_TYPES = {"found": 1, "void": 2, "held": 3, "identified": 4}
+NAV_NAMES = {code: name for name, code in NAV_TYPES.items()}
+
+# Mailbox times are perf_counter(); shift them onto the wall clock
+_WALL_OFFSET = time.time() - time.perf_counter()
+
+def encode_features(frames: np.ndarray) -> bytes:
+    """Mailbox frames (FRAME_DTYPE) -> one FEATURES message."""
+    wire = np.empty(len(frames), dtype=WIRE_FRAME_DTYPE)
+    wire["seq"] = frames["seq"]
+    wire["time_us"] = ((frames["time"] + _WALL_OFFSET) * 1e6).astype(np.uint64)
+    for name in ("rms", "flatness", "centroid", "rolloff", "onset", "bpm", "tempo_confidence", "stars"):
+        wire[name] = frames[name]
+    seq = int(frames["seq"][-1]) if len(frames) else 0
+    return HEADER.pack(KIND_FEATURES, WIRE_VERSION, 0, len(wire), seq) + wire.tobytes()
+
+def encode_stars(stars: np.ndarray, seq: int) -> bytes:
+    """(n, 2) star coordinates -> one STARS message."""
+    payload = np.ascontiguousarray(stars, dtype=WIRE_STAR_DTYPE)
+    return HEADER.pack(KIND_STARS, WIRE_VERSION, 0, len(payload), seq) + payload.tobytes()
+
+def encode_nav(result: Dict, seq: int) -> bytes:
+    """A navigation result dict -> one NAV message (track metadata as JSON)."""
+    track = result.get("track") or result.get("candidate") or {}
+    meta = json.dumps(track, separators=(",", ":"), default=float).encode("utf-8")
+    body = NAV_HEADER.pack(NAV_TYPES.get(result.get("type"), 0), float(result.get("distance", 0.0)), len(meta))
+    return HEADER.pack(KIND_NAV, WIRE_VERSION, 0, 1, seq) + body + meta
+
+def decode(message: bytes) -> Tuple[int, int, object]:
+    """Inverse of the encoders: (kind, seq, payload) for clients and tests."""
+    kind, version, _, count, seq = HEADER.unpack_from(message)
+    if version != WIRE_VERSION:
+        raise ValueError(f"Unsupported stream version {version}")
+    body = memoryview(message)[HEADER.size:]
+    if kind == KIND_FEATURES:
+        return kind, seq, np.frombuffer(body, dtype=WIRE_FRAME_DTYPE, count=count)
+    if kind == KIND_STARS:
+        return kind, seq, np.frombuffer(body, dtype=WIRE_STAR_DTYPE, count=count * 2).reshape(-1, 2)
+    if kind == KIND_NAV:
+        code, distance, length = NAV_HEADER.unpack_from(body)
+        track = json.loads(bytes(body[NAV_HEADER.size:NAV_HEADER.size + length]) or b"{}")
+        return kind, seq, {"type": NAV_NAMES.get(code, "unknown"), "distance": distance, "track": track}
+    raise ValueError(f"Unknown stream message kind {kind}")
+
+class Subscriber:
+    """
+    One client's outbox. Navigation events are rare and must arrive, so they
+    queue up to max_nav (a backlog that large means the client has stalled;
+    the oldest are then dropped and counted, and the NAV seq shows the gap).
+    Visualization messages keep only the newest max_pending, so a slow
+    client skips stale frames instead of lagging.
+    """
+
+    def __init__(self, session_id: Optional[str] = None, viz: bool = True, max_pending: int = 4,
+                 max_nav: int = 4096):
+        self.session_id = session_id
+        self.viz = viz
+        self.nav_queue = collections.deque(maxlen=max_nav)
+        self.viz_queue = collections.deque(maxlen=max_pending)
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.dropped_nav = 0
+
+    def offer_viz(self, message: bytes):
+        if len(self.viz_queue) == self.viz_queue.maxlen:
+            self.dropped += 1
+        self.viz_queue.append(message)
+        self.ready.set()
+
+    def offer_nav(self, message: bytes):
+        if len(self.nav_queue) == self.nav_queue.maxlen:
+            self.dropped_nav += 1
+        self.nav_queue.append(message)
+        self.ready.set()
+
+    async def next(self) -> bytes:
+        while not (self.nav_queue or self.viz_queue):
+            self.ready.clear()
+            await self.ready.wait()
+        self.sent += 1
+        # Navigation first: it's never the stale one
+        return self.nav_queue.popleft() if self.nav_queue else self.viz_queue.popleft()
+
+class StreamHub:
+    """
+    Fans out DSP frames (drained from the mailbox at rate_hz) and navigation
+    events to every subscriber. Each message is encoded once and the same
+    bytes object is handed to all outboxes.
+    """
+
+    def __init__(self, mailbox: Optional[FrameMailbox] = None, rate_hz: float = 30.0, max_pending: int = 4,
+                 max_nav: int = 4096):
+        self.mailbox = mailbox
+        self.rate_hz = rate_hz
+        self.max_pending = max_pending
+        self.max_nav = max_nav
+        self.subscribers: Set[Subscriber] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.nav_seq = 0
+        self.messages = 0
+
+    def subscribe(self, session_id: Optional[str] = None, viz: bool = True) -> Subscriber:
+        subscriber = Subscriber(session_id, viz, self.max_pending, self.max_nav)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def start(self):
+        if self.mailbox is not None and (self.task is None or self.task.done()):
+            self.task = asyncio.get_running_loop().create_task(self._pump())
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def publish_nav(self, result: Dict, session_id: Optional[str] = None):
+        """Deliver a navigation result to subscribers of that session (or of all sessions)."""
+        self.nav_seq += 1
+        message = encode_nav(result, self.nav_seq)
+        for subscriber in self.subscribers:
+            if subscriber.session_id in (None, session_id):
+                subscriber.offer_nav(message)
+        self.messages += 1
+
+    def publish_frames(self, frames: np.ndarray, stars: np.ndarray):
+        with metrics.timer("stream_fanout"):
+            messages = []
+            if len(frames):
+                messages.append(encode_features(frames))
+            if len(stars):
+                seq = int(frames["seq"][-1]) if len(frames) else 0
+                messages.append(encode_stars(stars, seq))
+            for subscriber in self.subscribers:
+                if subscriber.viz:
+                    for message in messages:
+                        subscriber.offer_viz(message)
+            self.messages += len(messages)
+
+    async def _pump(self):
+        period = 1.0 / self.rate_hz
+        while True:
+            frames = self.mailbox.drain()
+            stars = self.mailbox.drain_stars()
+            if self.subscribers and (len(frames) or len(stars)):
+                self.publish_frames(frames, stars)
+            await asyncio.sleep(period)
+
+    def stats(self) -> Dict:
+        return {
+            "subscribers": len(self.subscribers),
+            "messages": self.messages,
+            "sent": sum(s.sent for s in self.subscribers),
+            "dropped": sum(s.dropped for s in self.subscribers),
+            "dropped_nav": sum(s.dropped_nav for s in self.subscribers),
+        }
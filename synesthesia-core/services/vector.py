@@ -1,24 +1,33 @@
 import os
 import numpy as np
 from typing import List, Optional, Dict
-from qdrant_client import QdrantClient, models
 import uuid
 
+from services.metrics import metrics
+
+# qdrant_client takes ~1 s to import; it's loaded when the engine is built
+
 class VectorEngine:
-    def __init__(self, collection_name: str = "synesthesia_tracks_v1"):
+    def __init__(self, collection_name: str = "synesthesia_tracks_v1", local: Optional[str] = None):
+        """local: embedded storage path (or ":memory:") instead of the Qdrant server."""
         self.collection_name = collection_name
         
         # Load Concept Definitions (if any)
         self.concepts = {"atomic": {}, "compound": {}}
 
+        from qdrant_client import QdrantClient, models
+
         # Initialize Qdrant
-        try:
-            self.qdrant = QdrantClient(host="localhost", port=6333, timeout=2.0)
-            # Test connection
-            self.qdrant.get_collections()
-        except Exception:
-            # Fallback to local storage
-            self.qdrant = QdrantClient(path="./qdrant_storage")
+        if local:
+            self.qdrant = QdrantClient(location=local) if local == ":memory:" else QdrantClient(path=local)
+        else:
+            try:
+                self.qdrant = QdrantClient(host="localhost", port=6333, timeout=2.0)
+                # Test connection
+                self.qdrant.get_collections()
+            except Exception:
+                # Fallback to local storage
+                self.qdrant = QdrantClient(path="./qdrant_storage")
         
         # Ensure collection exists with 5 Dimensions
         if not self.qdrant.collection_exists(self.collection_name):
@@ -78,6 +87,7 @@ class VectorEngine:
         # Deprecated alias for get_track_data
         return self.get_track_data(song_id)
 
+    @metrics.timed("vector_search")
     def search(self, vector: np.ndarray, k: int = 5) -> List[dict]:
         # Ensure vector is 5D
         if len(vector) != 5:
@@ -96,6 +106,29 @@ class VectorEngine:
             print(f"Vector Search Error: {e}")
             return []
 
+    @metrics.timed("vector_search_batch")
+    def search_batch(self, vectors: np.ndarray, k: int = 5) -> List[List[dict]]:
+        """Nearest k for each row of vectors (n, 5) in one query round-trip."""
+        from qdrant_client import models
+
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, 5)
+        if len(vectors) == 0:
+            return []
+
+        requests = [
+            models.QueryRequest(query=vector.tolist(), limit=k, with_payload=True, with_vector=True)
+            for vector in vectors
+        ]
+        try:
+            responses = self.qdrant.query_batch_points(collection_name=self.collection_name, requests=requests)
+            return [
+                [{'id': hit.id, 'payload': hit.payload, 'vector': hit.vector} for hit in response.points]
+                for response in responses
+            ]
+        except Exception as e:
+            print(f"Vector Batch Search Error: {e}")
+            return [[] for _ in range(len(vectors))]
+
     def upsert_batch(self, tracks: List[dict], vectors: List[np.ndarray]):
         """
         Batch upsert tracks into Qdrant.
@@ -103,6 +136,8 @@ class VectorEngine:
         if len(tracks) != len(vectors):
             return
 
+        from qdrant_client import models
+
         points = []
         
         for track, vector in zip(tracks, vectors):
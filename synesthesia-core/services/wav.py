@@ -0,0 +1,75 @@
+"""
+WAV decoding shared by the live file source (services.dsp) and library
+fingerprinting (services.library): sample data is memory-mapped and only
+the blocks being used are converted to float32.
+"""
+import os
+import numpy as np
+
+def open_wav_memmap(path: str) -> tuple:
+    """
+    Memory-map the sample data of a PCM/float WAV file.
+    Returns (samples, sample_rate) where samples is (frames, channels) for
+    8/16/32-bit int and 32-bit float, or (frames, channels, 3) uint8 for 24-bit.
+    """
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = chunk[:4], int.from_bytes(chunk[4:], "little")
+
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                tag = int.from_bytes(body[0:2], "little")
+                if tag == 0xFFFE:
+                    # WAVE_FORMAT_EXTENSIBLE: real format is the sub-format GUID prefix
+                    tag = int.from_bytes(body[24:26], "little")
+                fmt = (
+                    tag,
+                    int.from_bytes(body[2:4], "little"),
+                    int.from_bytes(body[4:8], "little"),
+                    int.from_bytes(body[14:16], "little"),
+                )
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+    if fmt is None:
+        raise ValueError(f"{path} has no fmt chunk")
+    tag, channels, sample_rate, bits = fmt
+    # Streaming writers may leave the data size unset (0xFFFFFFFF); never map past the file
+    size = min(size, os.path.getsize(path) - offset)
+
+    dtypes = {(1, 8): np.uint8, (1, 16): np.dtype("<i2"), (1, 32): np.dtype("<i4"), (3, 32): np.dtype("<f4")}
+    if (tag, bits) == (1, 24):
+        frames = size // (3 * channels)
+        samples = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(frames, channels, 3))
+    elif (tag, bits) in dtypes:
+        dtype = np.dtype(dtypes[(tag, bits)])
+        frames = size // (dtype.itemsize * channels)
+        samples = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+    else:
+        raise ValueError(f"unsupported WAV format tag={tag} bits={bits}")
+    return samples, sample_rate
+
+def pcm_to_float(block: np.ndarray) -> np.ndarray:
+    """Convert a memory-mapped WAV block to float32 in [-1, 1]."""
+    if block.ndim == 3:
+        b = block.astype(np.int32)
+        ints = (b[..., 0] | (b[..., 1] << 8) | (b[..., 2] << 16)) << 8 >> 8
+        return ints.astype(np.float32) / 8388608.0
+    if block.dtype == np.uint8:
+        return (block.astype(np.float32) - 128.0) / 128.0
+    if block.dtype == np.int16:
+        return block.astype(np.float32) / 32768.0
+    if block.dtype == np.int32:
+        return block.astype(np.float32) / 2147483648.0
+    return np.asarray(block, dtype=np.float32)
@@ -0,0 +1,263 @@
+use crate::stft::Stft;
+
+/// Column layout of the per-frame feature matrix.
+pub const FEATURE_NAMES: [&str; 5] = ["rms", "flatness", "centroid", "rolloff", "onset"];
+pub const NUM_FEATURES: usize = FEATURE_NAMES.len();
+
+const ROLLOFF_FRACTION: f32 = 0.85;
+// Log compression applied before spectral flux (onset strength)
+const FLUX_COMPRESSION: f32 = 100.0;
+
+/// Stateful single-pass analyzer.
+/// Buffers incoming blocks, runs one real FFT per hop and derives every
+/// feature from that single spectrum.
+pub struct SpectralAnalyzer {
+    stft: Stft,
+    sample_rate: f32,
+    hop_size: usize,
+    // Sliding frame of the most recent samples (never exceeds frame_size)
+    buffer: Vec<f32>,
+    // Log-compressed magnitudes of the previous frame for spectral flux
+    prev_log_mags: Vec<f32>,
+}
+
+impl SpectralAnalyzer {
+    pub fn new(sample_rate: u32, frame_size: usize, hop_size: usize) -> Self {
+        let stft = Stft::new(frame_size);
+        let num_bins = stft.num_bins();
+        let mut analyzer = Self {
+            stft,
+            sample_rate: sample_rate as f32,
+            hop_size,
+            buffer: Vec::with_capacity(frame_size),
+            prev_log_mags: vec![0.0; num_bins],
+        };
+        analyzer.reset();
+        analyzer
+    }
+
+    /// Frames produced per second of audio.
+    pub fn frame_rate(&self) -> f32 {
+        self.sample_rate / self.hop_size as f32
+    }
+
+    /// Clear history. The frame is pre-filled with silence so the first frame
+    /// is emitted after one hop and every hop yields exactly one frame.
+    pub fn reset(&mut self) {
+        self.buffer.clear();
+        self.buffer.resize(self.stft.frame_size() - self.hop_size, 0.0);
+        self.prev_log_mags.iter_mut().for_each(|m| *m = 0.0);
+    }
+
+    /// Feed a block of samples, appending one row of NUM_FEATURES values to
+    /// `out` per completed hop. Returns the number of frames produced.
+    pub fn process(&mut self, audio: &[f32], out: &mut Vec<f32>) -> usize {
+        let frame_size = self.stft.frame_size();
+        let mut frames = 0;
+        let mut rest = audio;
+
+        while !rest.is_empty() {
+            let take = (frame_size - self.buffer.len()).min(rest.len());
+            self.buffer.extend_from_slice(&rest[..take]);
+            rest = &rest[take..];
+
+            if self.buffer.len() == frame_size {
+                let row = self.analyze_frame();
+                out.extend_from_slice(&row);
+                self.buffer.drain(..self.hop_size);
+                frames += 1;
+            }
+        }
+        frames
+    }
+
+    fn analyze_frame(&mut self) -> [f32; NUM_FEATURES] {
+        let rms = calculate_rms(&self.buffer);
+        let bin_hz = self.sample_rate / self.stft.frame_size() as f32;
+        let mags = self.stft.magnitudes(&self.buffer);
+
+        // Single pass over the spectrum (DC excluded from shape features)
+        let mut power_sum = 0.0;
+        let mut log_power_sum = 0.0;
+        let mut mag_sum = 0.0;
+        let mut weighted_sum = 0.0;
+        let mut flux = 0.0;
+
+        for (bin, (&mag, prev)) in mags.iter().zip(self.prev_log_mags.iter_mut()).enumerate() {
+            let log_mag = (1.0 + FLUX_COMPRESSION * mag).ln();
+            let diff = log_mag - *prev;
+            if diff > 0.0 { flux += diff; }
+            *prev = log_mag;
+
+            if bin == 0 { continue; }
+            let power = mag * mag;
+            power_sum += power;
+            log_power_sum += (power + 1e-10).ln();
+            mag_sum += mag;
+            weighted_sum += bin as f32 * bin_hz * mag;
+        }
+
+        let num_bins = (mags.len() - 1) as f32;
+        let (flatness, centroid, rolloff) = if power_sum > 0.0 {
+            let arithmetic_mean = power_sum / num_bins;
+            let geometric_mean = (log_power_sum / num_bins).exp();
+
+            // Second (early-exit) pass for the rolloff point
+            let threshold = ROLLOFF_FRACTION * power_sum;
+            let mut cumulative = 0.0;
+            let mut rolloff_bin = mags.len() - 1;
+            for (bin, &mag) in mags.iter().enumerate().skip(1) {
+                cumulative += mag * mag;
+                if cumulative >= threshold {
+                    rolloff_bin = bin;
+                    break;
+                }
+            }
+
+            (geometric_mean / arithmetic_mean, weighted_sum / mag_sum, rolloff_bin as f32 * bin_hz)
+        } else {
+            (0.0, 0.0, 0.0)
+        };
+
+        [rms, flatness, centroid, rolloff, flux / mags.len() as f32]
+    }
+}
+
+pub fn calculate_rms(audio: &[f32]) -> f32 {
+    if audio.is_empty() { return 0.0; }
+    let sum_squares: f32 = audio.iter().map(|&x| x * x).sum();
+    (sum_squares / audio.len() as f32).sqrt()
+}
+
+/// One-shot analysis of a whole block: RMS over every sample and spectral
+/// features over the largest power-of-two frame (up to 4096) that fits,
+/// so short blocks such as DSP's 2048 samples still get a real spectrum.
+pub fn analyze_block(audio: &[f32], sample_rate: u32) -> [f32; NUM_FEATURES] {
+    let mut row = [0.0; NUM_FEATURES];
+    if audio.len() < 2 { return row; }
+
+    let frame_size = 1usize << (usize::BITS - 1 - audio.len().min(4096).leading_zeros());
+    let mut analyzer = SpectralAnalyzer::new(sample_rate, frame_size, frame_size);
+    let mut out = Vec::with_capacity(NUM_FEATURES);
+    analyzer.process(&audio[audio.len() - frame_size..], &mut out);
+
+    row.copy_from_slice(&out[..NUM_FEATURES]);
+    row[0] = calculate_rms(audio);
+    row
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::f32::consts::PI;
+
+    const SAMPLE_RATE: u32 = 44100;
+    const FRAME: usize = 2048;
+    const HOP: usize = 512;
+
+    fn tone(freq: f32, len: usize) -> Vec<f32> {
+        (0..len).map(|n| (2.0 * PI * freq * n as f32 / SAMPLE_RATE as f32).sin()).collect()
+    }
+
+    fn noise(len: usize) -> Vec<f32> {
+        let mut state = 0x9e3779b9u32;
+        (0..len)
+            .map(|_| {
+                state ^= state << 13;
+                state ^= state >> 17;
+                state ^= state << 5;
+                state as f32 / u32::MAX as f32 * 2.0 - 1.0
+            })
+            .collect()
+    }
+
+    fn analyze(audio: &[f32]) -> Vec<[f32; NUM_FEATURES]> {
+        let mut out = Vec::new();
+        SpectralAnalyzer::new(SAMPLE_RATE, FRAME, HOP).process(audio, &mut out);
+        out.chunks_exact(NUM_FEATURES).map(|row| row.try_into().unwrap()).collect()
+    }
+
+    #[test]
+    fn rms_of_sine() {
+        // 441 Hz: exactly 100 samples per period, so 44100 samples are whole periods
+        let sine: Vec<f32> = tone(441.0, 44100).iter().map(|x| 0.5 * x).collect();
+        assert!((calculate_rms(&sine) - 0.5 / 2f32.sqrt()).abs() < 1e-4);
+        assert_eq!(calculate_rms(&[]), 0.0);
+
+        // Frames that hold only signal report the same RMS
+        let rows = analyze(&sine);
+        assert!((rows[10][0] - 0.5 / 2f32.sqrt()).abs() < 1e-2);
+    }
+
+    #[test]
+    fn frame_count_follows_hop() {
+        let mut analyzer = SpectralAnalyzer::new(SAMPLE_RATE, FRAME, HOP);
+        let mut out = Vec::new();
+        assert_eq!(analyzer.process(&vec![0.0; 10000], &mut out), 10000 / HOP);
+        assert_eq!(out.len(), 10000 / HOP * NUM_FEATURES);
+        // The 10000 % HOP leftover samples complete the next frame
+        assert_eq!(analyzer.process(&vec![0.0; HOP - 10000 % HOP], &mut out), 1);
+        assert!((analyzer.frame_rate() - SAMPLE_RATE as f32 / HOP as f32).abs() < 1e-3);
+    }
+
+    #[test]
+    fn tone_centroid_is_its_frequency() {
+        let bin_hz = SAMPLE_RATE as f32 / FRAME as f32;
+        for freq in [40.0 * bin_hz, 1000.0, 5000.0] {
+            let rows = analyze(&tone(freq, FRAME * 4));
+            let centroid = rows.last().unwrap()[2];
+            assert!((centroid - freq).abs() < 2.0 * bin_hz, "{} Hz tone: centroid {}", freq, centroid);
+            let rolloff = rows.last().unwrap()[3];
+            assert!((rolloff - freq).abs() < 2.0 * bin_hz, "{} Hz tone: rolloff {}", freq, rolloff);
+        }
+    }
+
+    #[test]
+    fn flatness_separates_noise_from_tone() {
+        // Flatness of a single white-noise periodogram is about exp(-gamma) = 0.56
+        // rather than 1, since each bin's power is exponentially distributed
+        let noisy = analyze(&noise(FRAME * 4));
+        let tonal = analyze(&tone(1000.0, FRAME * 4));
+        let (noise_flatness, tone_flatness) = (noisy.last().unwrap()[1], tonal.last().unwrap()[1]);
+        assert!(noise_flatness > 0.4, "noise flatness {}", noise_flatness);
+        assert!(tone_flatness < 0.01, "tone flatness {}", tone_flatness);
+    }
+
+    #[test]
+    fn silence_is_all_zero() {
+        for row in analyze(&vec![0.0; FRAME]) {
+            assert_eq!(row, [0.0; NUM_FEATURES]);
+        }
+    }
+
+    #[test]
+    fn blocks_match_single_call() {
+        let audio: Vec<f32> = noise(20000).iter().zip(tone(700.0, 20000)).map(|(n, t)| 0.2 * n + t).collect();
+        let mut whole = Vec::new();
+        SpectralAnalyzer::new(SAMPLE_RATE, FRAME, HOP).process(&audio, &mut whole);
+
+        let mut analyzer = SpectralAnalyzer::new(SAMPLE_RATE, FRAME, HOP);
+        let mut blocks = Vec::new();
+        let mut frames = 0;
+        let mut rest = &audio[..];
+        for size in [1, 511, 512, 513, 0, 2048, 3000, 100].iter().cycle() {
+            if rest.is_empty() {
+                break;
+            }
+            let (block, tail) = rest.split_at((*size).min(rest.len()));
+            frames += analyzer.process(block, &mut blocks);
+            rest = tail;
+        }
+        assert_eq!(frames, audio.len() / HOP);
+        assert_eq!(whole, blocks);
+    }
+
+    #[test]
+    fn analyze_block_uses_largest_power_of_two() {
+        let audio: Vec<f32> = tone(1000.0, 3000).iter().map(|x| 0.25 * x).collect();
+        let row = analyze_block(&audio, SAMPLE_RATE);
+        assert!((row[0] - calculate_rms(&audio)).abs() < 1e-6);
+        assert!((row[2] - 1000.0).abs() < 2.0 * SAMPLE_RATE as f32 / 2048.0);
+        assert_eq!(analyze_block(&[0.5], SAMPLE_RATE), [0.0; NUM_FEATURES]);
+    }
+}
@@ -1,5 +1,4 @@
-use rustfft::{FftPlanner, num_complex::Complex};
-use crate::window::hanning_window;
+use crate::stft::Stft;
 
 const WINDOW_SIZE: usize = 4096;
 const HOP_SIZE: usize = 2048;
@@ -10,21 +9,51 @@ const HOP_SIZE: usize = 2048;
 // Highs: 2kHz+ (bins 185+)
 const BAND_SPLITS: [usize; 4] = [0, 20, 200, WINDOW_SIZE / 2]; 
 
+pub const FRAMES_PER_SECOND: f32 = 44100.0 / HOP_SIZE as f32;
+
+/// Frames per peak-density block: one second rounded to whole frames.
+/// services/library.py streams in chunks of whole blocks (CHUNK_FRAMES,
+/// DENSITY_BLOCK_FRAMES) so the cap sees the same blocks as a whole-file pass.
+pub const DENSITY_BLOCK_FRAMES: usize = 22;
+
+/// Target zone and density limits for hash generation.
+/// Each anchor peak pairs only with peaks `min_dt..=max_dt` frames later and
+/// within `max_df` bins, keeping at most `fan_out` targets (nearest frames and
+/// strongest peaks first).
+#[derive(Clone, Copy)]
+pub struct FingerprintConfig {
+    pub min_dt: usize,
+    pub max_dt: usize,
+    pub max_df: usize,
+    pub fan_out: usize,
+    // Strongest peaks kept per second of audio (0 = unlimited)
+    pub peaks_per_second: usize,
+}
+
+impl Default for FingerprintConfig {
+    fn default() -> Self {
+        Self { min_dt: 1, max_dt: 9, max_df: 256, fan_out: 10, peaks_per_second: 0 }
+    }
+}
+
 pub struct AudioFingerprinter {
-    planner: FftPlanner<f32>,
-    window: Vec<f32>,
+    // Shared real-input FFT (same code path as the analyzer)
+    stft: Stft,
+    config: FingerprintConfig,
     // Pre-allocated buffers for reuse
-    fft_buffer: Vec<Complex<f32>>,
-    peaks_buffer: Vec<usize>,
+    peaks_buffer: Vec<(usize, f32)>,
     band_peaks_buffer: Vec<(usize, f32)>,
 }
 
 impl AudioFingerprinter {
     pub fn new() -> Self {
+        Self::with_config(FingerprintConfig::default())
+    }
+
+    pub fn with_config(config: FingerprintConfig) -> Self {
         Self {
-            planner: FftPlanner::new(),
-            window: hanning_window(WINDOW_SIZE),
-            fft_buffer: vec![Complex::zero(); WINDOW_SIZE],
+            stft: Stft::new(WINDOW_SIZE),
+            config,
             peaks_buffer: Vec::with_capacity(64),
             band_peaks_buffer: Vec::with_capacity(32),
         }
@@ -35,51 +64,9 @@ impl AudioFingerprinter {
         ((f1 as u64) << 20) | ((f2 as u64) << 8) | (dt as u64)
     }
 
-    pub fn calculate_rms(audio: &[f32]) -> f32 {
-        if audio.is_empty() { return 0.0; }
-        let sum_squares: f32 = audio.iter().map(|&x| x * x).sum();
-        (sum_squares / audio.len() as f32).sqrt()
-    }
-
-    pub fn calculate_spectral_flatness(&mut self, audio: &[f32]) -> f32 {
-        if audio.len() < WINDOW_SIZE { return 0.0; }
-        
-        let fft = self.planner.plan_fft_forward(WINDOW_SIZE);
-        
-        // Prepare buffer
-        for (i, (&sample, &win)) in audio.iter().zip(&self.window).enumerate().take(WINDOW_SIZE) {
-            self.fft_buffer[i] = Complex::new(sample * win, 0.0);
-        }
-            
-        fft.process(&mut self.fft_buffer);
-        
-        // Calculate power spectrum
-        // Use a small epsilon to avoid log(0)
-        let mut sum_val = 0.0;
-        let mut log_sum = 0.0;
-        
-        for c in &self.fft_buffer {
-            let mag = c.norm_sqr();
-            sum_val += mag;
-            log_sum += (mag + 1e-10).ln();
-        }
-        
-        let arithmetic_mean = sum_val / WINDOW_SIZE as f32;
-        let geometric_mean = (log_sum / WINDOW_SIZE as f32).exp();
-        
-        if arithmetic_mean == 0.0 { 0.0 } else { geometric_mean / arithmetic_mean }
-    }
-
-    pub fn analyze(&mut self, audio: &[f32]) -> (f32, f32) {
-        let rms = Self::calculate_rms(audio);
-        let flatness = self.calculate_spectral_flatness(audio);
-        (rms, flatness)
-    }
-
     pub fn fingerprint(&mut self, audio: &[f32]) -> Vec<(u64, usize)> {
         if audio.len() < WINDOW_SIZE { return Vec::new(); }
 
-        let fft = self.planner.plan_fft_forward(WINDOW_SIZE);
         let num_windows = (audio.len() - WINDOW_SIZE) / HOP_SIZE;
         
         // We still need to store the full spectrogram history for the look-ahead
@@ -93,12 +80,7 @@ impl AudioFingerprinter {
         for i in 0..num_windows {
             let start = i * HOP_SIZE;
             
-            // Fill buffer
-            for (j, (&sample, &win)) in audio[start..].iter().zip(&self.window).enumerate().take(WINDOW_SIZE) {
-                self.fft_buffer[j] = Complex::new(sample * win, 0.0);
-            }
-
-            fft.process(&mut self.fft_buffer);
+            let mags = self.stft.magnitudes(&audio[start..start + WINDOW_SIZE]);
 
             // Reuse peak buffer for this frame
             self.peaks_buffer.clear();
@@ -112,9 +94,9 @@ impl AudioFingerprinter {
                 for bin in min_bin..max_bin {
                     if bin == 0 || bin >= WINDOW_SIZE - 1 { continue; }
                     
-                    let mag = self.fft_buffer[bin].norm();
-                    let mag_prev = self.fft_buffer[bin - 1].norm();
-                    let mag_next = self.fft_buffer[bin + 1].norm();
+                    let mag = mags[bin];
+                    let mag_prev = mags[bin - 1];
+                    let mag_next = mags[bin + 1];
 
                     if mag > mag_prev && mag > mag_next {
                         let db = 20.0 * mag.log10();
@@ -127,24 +109,35 @@ impl AudioFingerprinter {
                 // Sort and take top 5
                 self.band_peaks_buffer.sort_by(|a, b| b.1.partial_cmp(&a.1).unwrap_or(std::cmp::Ordering::Equal));
                 
-                for (bin, _) in self.band_peaks_buffer.iter().take(5) {
-                    self.peaks_buffer.push(*bin);
-                }
+                self.peaks_buffer.extend(self.band_peaks_buffer.iter().take(5));
             }
+            // Strongest first, so the fan-out cap keeps the most robust targets
+            self.peaks_buffer.sort_by(|a, b| b.1.partial_cmp(&a.1).unwrap_or(std::cmp::Ordering::Equal));
             // We have to clone here to persist the frame in the spectrogram history
             spectrogram.push(self.peaks_buffer.clone());
         }
 
-        // 2. GENERATE HASHES
+        if self.config.peaks_per_second > 0 {
+            Self::limit_peak_density(&mut spectrogram, self.config.peaks_per_second);
+        }
+
+        // 2. GENERATE HASHES (within the target zone, capped per anchor)
+        let FingerprintConfig { min_dt, max_dt, max_df, fan_out, .. } = self.config;
         for (t1, peaks) in spectrogram.iter().enumerate() {
-            for &f1 in peaks {
-                let look_ahead_max = (t1 + 10).min(spectrogram.len());
-                
-                for t2 in (t1 + 1)..look_ahead_max {
+            let look_ahead_max = (t1 + max_dt + 1).min(spectrogram.len());
+
+            for &(f1, _) in peaks {
+                let mut emitted = 0;
+
+                'zone: for t2 in (t1 + min_dt)..look_ahead_max {
                     let dt = t2 - t1;
-                    for &f2 in &spectrogram[t2] {
+                    for &(f2, _) in &spectrogram[t2] {
+                        if f2.abs_diff(f1) > max_df { continue; }
+
                         let hash = Self::pack_hash(f1, f2, dt);
                         fingerprints.push((hash, t1));
+                        emitted += 1;
+                        if emitted >= fan_out { break 'zone; }
                     }
                 }
             }
@@ -152,4 +145,113 @@ impl AudioFingerprinter {
 
         fingerprints
     }
-}
\ No newline at end of file
+
+    /// Keep only the strongest `peaks_per_second` peaks in each block of
+    /// DENSITY_BLOCK_FRAMES frames, counted from the start of the audio.
+    fn limit_peak_density(spectrogram: &mut [Vec<(usize, f32)>], peaks_per_second: usize) {
+        let mut strengths: Vec<f32> = Vec::new();
+
+        for frames in spectrogram.chunks_mut(DENSITY_BLOCK_FRAMES) {
+            strengths.clear();
+            strengths.extend(frames.iter().flatten().map(|&(_, db)| db));
+            if strengths.len() <= peaks_per_second { continue; }
+
+            // Strength of the weakest peak that survives
+            strengths.sort_by(|a, b| b.partial_cmp(a).unwrap_or(std::cmp::Ordering::Equal));
+            let threshold = strengths[peaks_per_second - 1];
+            let above = strengths.iter().take_while(|&&db| db > threshold).count();
+            let mut ties = peaks_per_second - above;
+
+            for frame in frames.iter_mut() {
+                frame.retain(|&(_, db)| {
+                    if db > threshold { return true; }
+                    if db == threshold && ties > 0 {
+                        ties -= 1;
+                        return true;
+                    }
+                    false
+                });
+            }
+        }
+    }
+}
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::collections::HashMap;
+
+    fn noise(frames: usize) -> Vec<f32> {
+        let mut state = 0x1234567u32;
+        (0..frames * HOP_SIZE + WINDOW_SIZE)
+            .map(|_| {
+                state ^= state << 13;
+                state ^= state >> 17;
+                state ^= state << 5;
+                state as f32 / u32::MAX as f32 * 2.0 - 1.0
+            })
+            .collect()
+    }
+
+    fn unpack(hash: u64) -> (usize, usize, usize) {
+        ((hash >> 20) as usize & 0xFFF, (hash >> 8) as usize & 0xFFF, hash as usize & 0xFF)
+    }
+
+    #[test]
+    fn density_block_is_one_second() {
+        assert_eq!(DENSITY_BLOCK_FRAMES, FRAMES_PER_SECOND.round() as usize);
+    }
+
+    #[test]
+    fn hashes_stay_in_target_zone_and_fan_out() {
+        let config = FingerprintConfig { min_dt: 2, max_dt: 5, max_df: 40, fan_out: 3, peaks_per_second: 0 };
+        let prints = AudioFingerprinter::with_config(config).fingerprint(&noise(30));
+        assert!(!prints.is_empty());
+
+        let mut per_anchor: HashMap<(usize, usize), usize> = HashMap::new();
+        for &(hash, t1) in &prints {
+            let (f1, f2, dt) = unpack(hash);
+            assert!((config.min_dt..=config.max_dt).contains(&dt), "dt {}", dt);
+            assert!(f1.abs_diff(f2) <= config.max_df, "df {}", f1.abs_diff(f2));
+            assert!(t1 + dt < 30);
+            *per_anchor.entry((t1, f1)).or_default() += 1;
+        }
+        assert!(per_anchor.values().all(|&n| n <= config.fan_out));
+        // Noise has plenty of targets, so most anchors fill their fan-out
+        assert!(per_anchor.values().filter(|&&n| n == config.fan_out).count() * 2 > per_anchor.len());
+    }
+
+    #[test]
+    fn density_cap_applies_per_block() {
+        let mut spectrogram: Vec<Vec<(usize, f32)>> = (0..DENSITY_BLOCK_FRAMES * 2 + 5)
+            .map(|t| (0..6).map(|f| (f * 10, (t * 7 + f * 13) as f32 % 50.0)).collect())
+            .collect();
+        AudioFingerprinter::limit_peak_density(&mut spectrogram, 20);
+
+        for block in spectrogram.chunks(DENSITY_BLOCK_FRAMES) {
+            assert_eq!(block.iter().map(Vec::len).sum::<usize>(), 20);
+        }
+    }
+
+    #[test]
+    fn capped_chunks_on_block_boundaries_match_whole_audio() {
+        // What services/library.py relies on: a chunk that starts on a density
+        // block and ends on one yields the whole-file hashes for its anchors
+        let config = FingerprintConfig { peaks_per_second: 40, ..FingerprintConfig::default() };
+        let audio = noise(4 * DENSITY_BLOCK_FRAMES);
+        let whole = AudioFingerprinter::with_config(config).fingerprint(&audio);
+
+        let (start, anchors, overlap) = (DENSITY_BLOCK_FRAMES, DENSITY_BLOCK_FRAMES, DENSITY_BLOCK_FRAMES);
+        let chunk = &audio[start * HOP_SIZE..(start + anchors + overlap) * HOP_SIZE + WINDOW_SIZE];
+        let streamed: Vec<(u64, usize)> = AudioFingerprinter::with_config(config)
+            .fingerprint(chunk)
+            .into_iter()
+            .filter(|&(_, t1)| t1 < anchors)
+            .map(|(hash, t1)| (hash, t1 + start))
+            .collect();
+
+        let expected: Vec<(u64, usize)> =
+            whole.into_iter().filter(|&(_, t1)| (start..start + anchors).contains(&t1)).collect();
+        assert!(!expected.is_empty());
+        assert_eq!(streamed, expected);
+    }
+}
@@ -1,7 +1,17 @@
 use pyo3::prelude::*;
-use crate::audio::AudioFingerprinter;
+use pyo3::exceptions::PyValueError;
+use crate::audio::{AudioFingerprinter, FingerprintConfig};
+use crate::analyzer::{SpectralAnalyzer, FEATURE_NAMES, NUM_FEATURES, analyze_block};
+use crate::tempo::TempoTracker as TempoEstimator;
+use crate::matcher::match_postings;
+use crate::resample::{Converter, TARGET_RATE};
 
+mod analyzer;
 mod audio;
+mod matcher;
+mod resample;
+mod stft;
+mod tempo;
 mod window;
 
 /// A robust, memory-efficient fingerprint structure exposed to Python.
@@ -14,11 +24,51 @@ pub struct Fingerprint {
     pub offset: u32, // The time "anchor" for alignment verification
 }
 
-use numpy::PyReadonlyArray1;
+use numpy::{PyArray1, PyArray2, PyReadonlyArray1, PyReadonlyArrayDyn};
+
+// Polyphase taps per output sample (per phase) for format conversion
+const RESAMPLE_TAPS: usize = 32;
+
+/// Build a fingerprint config from optional Python keyword arguments.
+fn fingerprint_config(
+    min_dt: Option<usize>,
+    max_dt: Option<usize>,
+    max_df: Option<usize>,
+    fan_out: Option<usize>,
+    peaks_per_second: Option<usize>,
+) -> PyResult<FingerprintConfig> {
+    let defaults = FingerprintConfig::default();
+    let config = FingerprintConfig {
+        min_dt: min_dt.unwrap_or(defaults.min_dt),
+        max_dt: max_dt.unwrap_or(defaults.max_dt),
+        max_df: max_df.unwrap_or(defaults.max_df),
+        fan_out: fan_out.unwrap_or(defaults.fan_out),
+        peaks_per_second: peaks_per_second.unwrap_or(defaults.peaks_per_second),
+    };
+
+    // dt is packed into 8 bits of the hash
+    if config.min_dt == 0 || config.min_dt > config.max_dt || config.max_dt > 255 {
+        return Err(PyValueError::new_err("require 1 <= min_dt <= max_dt <= 255"));
+    }
+    if config.fan_out == 0 {
+        return Err(PyValueError::new_err("fan_out must be at least 1"));
+    }
+    Ok(config)
+}
 
 #[pyfunction]
-fn audio_fingerprint(_py: Python, audio_buffer: PyReadonlyArray1<f32>) -> PyResult<Vec<Fingerprint>> {
-    let mut fingerprinter = AudioFingerprinter::new();
+#[pyo3(signature = (audio_buffer, min_dt=None, max_dt=None, max_df=None, fan_out=None, peaks_per_second=None))]
+fn audio_fingerprint(
+    _py: Python,
+    audio_buffer: PyReadonlyArray1<f32>,
+    min_dt: Option<usize>,
+    max_dt: Option<usize>,
+    max_df: Option<usize>,
+    fan_out: Option<usize>,
+    peaks_per_second: Option<usize>,
+) -> PyResult<Vec<Fingerprint>> {
+    let config = fingerprint_config(min_dt, max_dt, max_df, fan_out, peaks_per_second)?;
+    let mut fingerprinter = AudioFingerprinter::with_config(config);
     
     // Zero-copy access to the numpy array
     let audio_slice = audio_buffer.as_slice()?;
@@ -35,23 +85,264 @@ fn audio_fingerprint(_py: Python, audio_buffer: PyReadonlyArray1<f32>) -> PyResu
     Ok(result)
 }
 
+/// Array variant of `audio_fingerprint`: returns (hashes: uint64, offsets: uint32)
+/// so large fingerprint sets cross into Python without per-hash objects.
+/// Input at another rate or with interleaved channels (`sample_rate`, `channels`)
+/// is downmixed and resampled to 44.1 kHz mono natively before fingerprinting.
 #[pyfunction]
-fn audio_analyze(_py: Python, audio_buffer: PyReadonlyArray1<f32>) -> PyResult<(f32, f32)> {
-    let mut fingerprinter = AudioFingerprinter::new();
-    
+#[pyo3(signature = (audio_buffer, min_dt=None, max_dt=None, max_df=None, fan_out=None, peaks_per_second=None, sample_rate=44100, channels=1))]
+fn audio_fingerprint_array<'py>(
+    py: Python<'py>,
+    audio_buffer: PyReadonlyArrayDyn<f32>,
+    min_dt: Option<usize>,
+    max_dt: Option<usize>,
+    max_df: Option<usize>,
+    fan_out: Option<usize>,
+    peaks_per_second: Option<usize>,
+    sample_rate: u32,
+    channels: usize,
+) -> PyResult<(&'py PyArray1<u64>, &'py PyArray1<u32>)> {
+    let config = fingerprint_config(min_dt, max_dt, max_df, fan_out, peaks_per_second)?;
+    let audio_slice = interleaved_slice(&audio_buffer, sample_rate, channels)?;
+
+    let mut fingerprinter = AudioFingerprinter::with_config(config);
+    let raw_data = if sample_rate == TARGET_RATE && channels == 1 {
+        fingerprinter.fingerprint(audio_slice)
+    } else {
+        let mut mono = Vec::with_capacity(audio_slice.len() / channels * TARGET_RATE as usize / sample_rate as usize + 1);
+        Converter::new(sample_rate, TARGET_RATE, channels, RESAMPLE_TAPS).process(audio_slice, &mut mono);
+        fingerprinter.fingerprint(&mono)
+    };
+
+    let hashes: Vec<u64> = raw_data.iter().map(|&(h, _)| h).collect();
+    let offsets: Vec<u32> = raw_data.iter().map(|&(_, t)| t as u32).collect();
+
+    Ok((PyArray1::from_vec(py, hashes), PyArray1::from_vec(py, offsets)))
+}
+
+/// Match query (hash, offset) pairs against a sorted posting table.
+/// Returns up to `top_k` (track, score, offset) tuples, best first.
+#[pyfunction]
+#[pyo3(signature = (q_hashes, q_offsets, hashes, tracks, offsets, top_k=5, max_postings=10000))]
+fn fingerprint_match(
+    py: Python,
+    q_hashes: PyReadonlyArray1<u64>,
+    q_offsets: PyReadonlyArray1<u32>,
+    hashes: PyReadonlyArray1<u64>,
+    tracks: PyReadonlyArray1<u32>,
+    offsets: PyReadonlyArray1<u32>,
+    top_k: usize,
+    max_postings: usize,
+) -> PyResult<Vec<(u32, u32, i32)>> {
+    let (q_hashes, q_offsets) = (q_hashes.as_slice()?, q_offsets.as_slice()?);
+    let (hashes, tracks, offsets) = (hashes.as_slice()?, tracks.as_slice()?, offsets.as_slice()?);
+
+    if q_hashes.len() != q_offsets.len() || hashes.len() != tracks.len() || hashes.len() != offsets.len() {
+        return Err(PyValueError::new_err("hash and offset arrays must have matching lengths"));
+    }
+
+    // Pure Rust from here on; let other Python threads run
+    let matches = py.allow_threads(|| {
+        match_postings(q_hashes, q_offsets, hashes, tracks, offsets, max_postings, top_k)
+    });
+
+    Ok(matches.into_iter().map(|m| (m.track, m.score, m.offset)).collect())
+}
+
+/// Validate a 1-D (interleaved) or 2-D (frames, channels) float32 buffer.
+fn interleaved_slice<'a>(buffer: &'a PyReadonlyArrayDyn<f32>, sample_rate: u32, channels: usize) -> PyResult<&'a [f32]> {
+    if sample_rate == 0 || channels == 0 {
+        return Err(PyValueError::new_err("sample_rate and channels must be positive"));
+    }
+    let shape = buffer.shape();
+    let valid = match shape.len() {
+        1 => shape[0] % channels == 0,
+        2 => shape[1] == channels,
+        _ => false,
+    };
+    if !valid {
+        return Err(PyValueError::new_err("expected (frames,) or (frames, channels) audio matching channels"));
+    }
+    Ok(buffer.as_slice()?)
+}
+
+/// One-shot (rms, flatness) of a mono block recorded at `sample_rate`.
+#[pyfunction]
+#[pyo3(signature = (audio_buffer, sample_rate=44100))]
+fn audio_analyze(_py: Python, audio_buffer: PyReadonlyArray1<f32>, sample_rate: u32) -> PyResult<(f32, f32)> {
+    if sample_rate == 0 {
+        return Err(PyValueError::new_err("sample_rate must be positive"));
+    }
     // Zero-copy access to the numpy array
     let audio_slice = audio_buffer.as_slice()?;
-    
-    // Analyze
-    let (rms, flatness) = fingerprinter.analyze(audio_slice);
-    
-    Ok((rms, flatness))
+
+    // Analyze (shares the STFT path with StreamAnalyzer)
+    let row = analyze_block(audio_slice, sample_rate);
+
+    Ok((row[0], row[1]))
+}
+
+/// Stateful multi-feature analyzer.
+/// Runs one real FFT per hop and returns an (n_frames, 5) float32 matrix with
+/// columns (rms, flatness, centroid, rolloff, onset). Centroid and rolloff are in Hz.
+#[pyclass]
+pub struct StreamAnalyzer {
+    inner: SpectralAnalyzer,
+    // Reused row-major output buffer
+    frames: Vec<f32>,
+}
+
+#[pymethods]
+impl StreamAnalyzer {
+    #[new]
+    #[pyo3(signature = (sample_rate=44100, frame_size=2048, hop_size=512))]
+    fn new(sample_rate: u32, frame_size: usize, hop_size: usize) -> PyResult<Self> {
+        if frame_size < 2 || hop_size == 0 || hop_size > frame_size {
+            return Err(PyValueError::new_err("hop_size must be in 1..=frame_size and frame_size >= 2"));
+        }
+        Ok(Self {
+            inner: SpectralAnalyzer::new(sample_rate, frame_size, hop_size),
+            frames: Vec::with_capacity(NUM_FEATURES * 16),
+        })
+    }
+
+    /// Feed a block of mono samples; returns one feature row per completed hop.
+    fn process<'py>(&mut self, py: Python<'py>, audio_buffer: PyReadonlyArray1<f32>) -> PyResult<&'py PyArray2<f32>> {
+        let audio_slice = audio_buffer.as_slice()?;
+
+        self.frames.clear();
+        let n = self.inner.process(audio_slice, &mut self.frames);
+
+        PyArray1::from_slice(py, &self.frames).reshape([n, NUM_FEATURES])
+    }
+
+    fn reset(&mut self) {
+        self.inner.reset();
+    }
+
+    #[getter]
+    fn columns(&self) -> Vec<&'static str> {
+        FEATURE_NAMES.to_vec()
+    }
+
+    #[getter]
+    fn frame_rate(&self) -> f32 {
+        self.inner.frame_rate()
+    }
+}
+
+/// Stateful format converter: interleaved input at any rate and channel count
+/// in, 44.1 kHz (or `out_rate`) mono float32 out. Channels are averaged and the
+/// rate changed by a polyphase filter in one native pass; filter state carries
+/// across blocks, so a stream can be fed in blocks of any size.
+#[pyclass]
+pub struct Resampler {
+    inner: Converter,
+    in_rate: u32,
+    out_rate: u32,
+    // Reused output buffer
+    out: Vec<f32>,
+}
+
+#[pymethods]
+impl Resampler {
+    #[new]
+    #[pyo3(signature = (in_rate, out_rate=44100, channels=1, taps=32))]
+    fn new(in_rate: u32, out_rate: u32, channels: usize, taps: usize) -> PyResult<Self> {
+        if in_rate == 0 || out_rate == 0 || channels == 0 || taps < 2 {
+            return Err(PyValueError::new_err("require positive rates and channels and taps >= 2"));
+        }
+        Ok(Self {
+            inner: Converter::new(in_rate, out_rate, channels, taps),
+            in_rate,
+            out_rate,
+            out: Vec::with_capacity(8192),
+        })
+    }
+
+    /// Convert one block of (frames, channels) or interleaved samples.
+    fn process<'py>(&mut self, py: Python<'py>, audio_buffer: PyReadonlyArrayDyn<f32>) -> PyResult<&'py PyArray1<f32>> {
+        let audio_slice = interleaved_slice(&audio_buffer, self.in_rate, self.inner.channels())?;
+
+        self.out.clear();
+        self.inner.process(audio_slice, &mut self.out);
+
+        Ok(PyArray1::from_slice(py, &self.out))
+    }
+
+    fn reset(&mut self) {
+        self.inner.reset();
+    }
+
+    #[getter]
+    fn in_rate(&self) -> u32 {
+        self.in_rate
+    }
+
+    #[getter]
+    fn out_rate(&self) -> u32 {
+        self.out_rate
+    }
+
+    #[getter]
+    fn channels(&self) -> usize {
+        self.inner.channels()
+    }
+
+    /// Reduced (up, down) factors, e.g. (147, 160) for 48 kHz -> 44.1 kHz.
+    #[getter]
+    fn ratio(&self) -> (usize, usize) {
+        self.inner.ratio()
+    }
+}
+
+/// Streaming tempo tracker fed with the analyzer's onset column.
+/// Each hop costs a fixed number of operations regardless of history length.
+#[pyclass]
+pub struct TempoTracker {
+    inner: TempoEstimator,
+}
+
+#[pymethods]
+impl TempoTracker {
+    #[new]
+    #[pyo3(signature = (frame_rate, min_bpm=60.0, max_bpm=200.0, half_life=6.0))]
+    fn new(frame_rate: f32, min_bpm: f32, max_bpm: f32, half_life: f32) -> PyResult<Self> {
+        if frame_rate <= 0.0 || min_bpm <= 0.0 || max_bpm <= min_bpm {
+            return Err(PyValueError::new_err("require frame_rate > 0 and 0 < min_bpm < max_bpm"));
+        }
+        Ok(Self { inner: TempoEstimator::new(frame_rate, min_bpm, max_bpm, half_life) })
+    }
+
+    /// Push onset-strength values; returns the latest (bpm, confidence).
+    fn update(&mut self, onsets: PyReadonlyArray1<f32>) -> PyResult<(f32, f32)> {
+        Ok(self.inner.update(onsets.as_slice()?))
+    }
+
+    fn reset(&mut self) {
+        self.inner.reset();
+    }
+
+    #[getter]
+    fn bpm(&self) -> f32 {
+        self.inner.bpm()
+    }
+
+    #[getter]
+    fn confidence(&self) -> f32 {
+        self.inner.confidence()
+    }
 }
 
 #[pymodule]
 fn core(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_class::<Fingerprint>()?;
+    m.add_class::<StreamAnalyzer>()?;
+    m.add_class::<TempoTracker>()?;
+    m.add_class::<Resampler>()?;
     m.add_function(wrap_pyfunction!(audio_fingerprint, m)?)?;
+    m.add_function(wrap_pyfunction!(audio_fingerprint_array, m)?)?;
+    m.add_function(wrap_pyfunction!(fingerprint_match, m)?)?;
     m.add_function(wrap_pyfunction!(audio_analyze, m)?)?;
     Ok(())
-}
\ No newline at end of file
+}
@@ -0,0 +1,57 @@
+use std::collections::HashMap;
+
+/// Best alignment of one candidate track against a query.
+pub struct Match {
+    pub track: u32,
+    pub score: u32,
+    // Track anchor frame minus query anchor frame
+    pub offset: i32,
+}
+
+/// Score candidate tracks by time-offset histogram voting.
+///
+/// `hashes` must be sorted ascending, with `tracks` / `offsets` as the
+/// parallel posting columns. Each query hash is located by binary search and
+/// every posting votes for (track, track_offset - query_offset). A true match
+/// piles its votes into a single offset bin; random collisions spread out.
+/// Hashes with more than `max_postings` entries carry almost no information
+/// and are skipped, which bounds the work per query hash.
+pub fn match_postings(
+    q_hashes: &[u64],
+    q_offsets: &[u32],
+    hashes: &[u64],
+    tracks: &[u32],
+    offsets: &[u32],
+    max_postings: usize,
+    top_k: usize,
+) -> Vec<Match> {
+    let mut votes: HashMap<(u32, i32), u32> = HashMap::with_capacity(q_hashes.len());
+
+    for (&h, &q_off) in q_hashes.iter().zip(q_offsets) {
+        let start = hashes.partition_point(|&x| x < h);
+        let len = hashes[start..].partition_point(|&x| x == h);
+        if len == 0 || len > max_postings { continue; }
+
+        for i in start..start + len {
+            let delta = offsets[i] as i32 - q_off as i32;
+            *votes.entry((tracks[i], delta)).or_insert(0) += 1;
+        }
+    }
+
+    // Keep the strongest offset bin per track
+    let mut best: HashMap<u32, (u32, i32)> = HashMap::new();
+    for ((track, delta), count) in votes {
+        let entry = best.entry(track).or_insert((0, 0));
+        if count > entry.0 {
+            *entry = (count, delta);
+        }
+    }
+
+    let mut matches: Vec<Match> = best
+        .into_iter()
+        .map(|(track, (score, offset))| Match { track, score, offset })
+        .collect();
+    matches.sort_unstable_by(|a, b| b.score.cmp(&a.score).then(a.track.cmp(&b.track)));
+    matches.truncate(top_k);
+    matches
+}
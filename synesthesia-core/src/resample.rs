@@ -0,0 +1,257 @@
+use std::f64::consts::PI;
+
+/// Rate the analysis and fingerprint paths run at.
+pub const TARGET_RATE: u32 = 44100;
+
+fn gcd(a: u32, b: u32) -> u32 {
+    if b == 0 { a } else { gcd(b, a % b) }
+}
+
+fn sinc(x: f64) -> f64 {
+    if x == 0.0 { 1.0 } else { (PI * x).sin() / (PI * x) }
+}
+
+/// Average interleaved frames down to mono, appending to `out`.
+pub fn downmix(interleaved: &[f32], channels: usize, out: &mut Vec<f32>) {
+    if channels <= 1 {
+        out.extend_from_slice(interleaved);
+        return;
+    }
+    let scale = 1.0 / channels as f32;
+    out.extend(interleaved.chunks_exact(channels).map(|frame| frame.iter().sum::<f32>() * scale));
+}
+
+/// Rational polyphase resampler (up by L, down by M).
+///
+/// The windowed-sinc prototype filter is split into L phases of `taps`
+/// coefficients each, so every output sample is a single `taps`-long dot
+/// product against the input history. State (history and phase) carries over
+/// between calls, so feeding a signal in blocks of any size yields exactly the
+/// samples a single call would.
+pub struct Resampler {
+    up: usize,
+    down: usize,
+    taps: usize,
+    // [phase][tap], taps stored time-reversed so each phase dots a contiguous window
+    bank: Vec<f32>,
+    // taps - 1 samples of history followed by unconsumed input
+    buffer: Vec<f32>,
+    // Position of the next output sample: input index into buffer + sub-sample phase
+    index: usize,
+    phase: usize,
+}
+
+impl Resampler {
+    pub fn new(in_rate: u32, out_rate: u32, taps: usize) -> Self {
+        let g = gcd(in_rate, out_rate);
+        let (up, down) = ((out_rate / g) as usize, (in_rate / g) as usize);
+        let taps = taps.max(2);
+
+        // Low-pass at the lower of the two Nyquist rates, relative to the upsampled rate
+        let cutoff = 0.5 / up.max(down) as f64;
+        let length = up * taps;
+        let center = (length - 1) as f64 / 2.0;
+        let mut bank = vec![0.0f32; length];
+        for n in 0..length {
+            // Blackman window
+            let w = 0.42 - 0.5 * (2.0 * PI * n as f64 / (length - 1) as f64).cos()
+                + 0.08 * (4.0 * PI * n as f64 / (length - 1) as f64).cos();
+            let h = up as f64 * 2.0 * cutoff * sinc(2.0 * cutoff * (n as f64 - center)) * w;
+            let (phase, tap) = (n % up, n / up);
+            bank[phase * taps + (taps - 1 - tap)] = h as f32;
+        }
+
+        let mut resampler = Self {
+            up,
+            down,
+            taps,
+            bank,
+            buffer: Vec::with_capacity(taps * 2 + 8192),
+            index: 0,
+            phase: 0,
+        };
+        resampler.reset();
+        resampler
+    }
+
+    /// Input-to-output ratio after reduction, e.g. (147, 160) for 48 kHz -> 44.1 kHz.
+    pub fn ratio(&self) -> (usize, usize) {
+        (self.up, self.down)
+    }
+
+    pub fn is_passthrough(&self) -> bool {
+        self.up == 1 && self.down == 1
+    }
+
+    pub fn reset(&mut self) {
+        self.buffer.clear();
+        self.buffer.resize(self.taps - 1, 0.0);
+        self.index = self.taps - 1;
+        self.phase = 0;
+    }
+
+    /// Resample `input`, appending the output samples to `out`.
+    pub fn process(&mut self, input: &[f32], out: &mut Vec<f32>) {
+        if self.is_passthrough() {
+            out.extend_from_slice(input);
+            return;
+        }
+
+        self.buffer.extend_from_slice(input);
+        out.reserve(input.len() * self.up / self.down + 1);
+
+        let taps = self.taps;
+        while self.index < self.buffer.len() {
+            let coeffs = &self.bank[self.phase * taps..(self.phase + 1) * taps];
+            let window = &self.buffer[self.index + 1 - taps..=self.index];
+            out.push(coeffs.iter().zip(window).map(|(c, x)| c * x).sum());
+
+            self.phase += self.down;
+            self.index += self.phase / self.up;
+            self.phase %= self.up;
+        }
+
+        // Keep only the history the next output still needs (in place, no reallocation)
+        let consumed = (self.index + 1 - taps).min(self.buffer.len());
+        self.buffer.drain(..consumed);
+        self.index -= consumed;
+    }
+}
+
+/// Downmix + resample in one pass: interleaved input at any rate and channel
+/// count in, mono at the target rate out. Buffers are reused across calls.
+pub struct Converter {
+    channels: usize,
+    resampler: Resampler,
+    mono: Vec<f32>,
+}
+
+impl Converter {
+    pub fn new(in_rate: u32, out_rate: u32, channels: usize, taps: usize) -> Self {
+        Self {
+            channels: channels.max(1),
+            resampler: Resampler::new(in_rate, out_rate, taps),
+            mono: Vec::with_capacity(8192),
+        }
+    }
+
+    pub fn channels(&self) -> usize {
+        self.channels
+    }
+
+    pub fn ratio(&self) -> (usize, usize) {
+        self.resampler.ratio()
+    }
+
+    pub fn reset(&mut self) {
+        self.resampler.reset();
+    }
+
+    pub fn process(&mut self, interleaved: &[f32], out: &mut Vec<f32>) {
+        if self.channels == 1 {
+            self.resampler.process(interleaved, out);
+            return;
+        }
+        self.mono.clear();
+        downmix(interleaved, self.channels, &mut self.mono);
+        self.resampler.process(&self.mono, out);
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    const TAPS: usize = 32;
+
+    fn tone(freq: f64, rate: u32, len: usize) -> Vec<f32> {
+        (0..len).map(|n| (2.0 * PI * freq * n as f64 / rate as f64).sin() as f32).collect()
+    }
+
+    fn resample(in_rate: u32, out_rate: u32, input: &[f32]) -> Vec<f32> {
+        let mut out = Vec::new();
+        Resampler::new(in_rate, out_rate, TAPS).process(input, &mut out);
+        out
+    }
+
+    #[test]
+    fn output_length_follows_ratio() {
+        let resampler = Resampler::new(48000, TARGET_RATE, TAPS);
+        assert_eq!(resampler.ratio(), (147, 160));
+        assert_eq!(resample(48000, TARGET_RATE, &vec![0.0; 48000]).len(), 44100);
+        assert_eq!(resample(TARGET_RATE, 48000, &vec![0.0; 44100]).len(), 48000);
+    }
+
+    #[test]
+    fn dc_gain_is_unity() {
+        for (in_rate, out_rate) in [(48000, TARGET_RATE), (22050, TARGET_RATE), (TARGET_RATE, 16000)] {
+            let out = resample(in_rate, out_rate, &vec![1.0; 4096]);
+            // Skip the filter's start-up transient
+            for &y in &out[TAPS * 2..] {
+                assert!((y - 1.0).abs() < 1e-2, "{} -> {}: {}", in_rate, out_rate, y);
+            }
+        }
+    }
+
+    #[test]
+    fn tone_keeps_its_frequency() {
+        let out = resample(48000, TARGET_RATE, &tone(1000.0, 48000, 48000));
+        let steady = &out[TAPS * 2..];
+        let crossings = steady.windows(2).filter(|w| (w[0] < 0.0) != (w[1] < 0.0)).count();
+        let seconds = steady.len() as f64 / TARGET_RATE as f64;
+        let freq = crossings as f64 / 2.0 / seconds;
+        assert!((freq - 1000.0).abs() < 5.0, "measured {} Hz", freq);
+
+        let peak = steady.iter().fold(0.0f32, |m, y| m.max(y.abs()));
+        assert!((peak - 1.0).abs() < 2e-2, "peak {}", peak);
+    }
+
+    #[test]
+    fn blocks_match_single_call() {
+        let input = tone(440.0, 48000, 20000);
+        let whole = resample(48000, TARGET_RATE, &input);
+
+        let mut resampler = Resampler::new(48000, TARGET_RATE, TAPS);
+        let mut blocks = Vec::new();
+        let mut rest = &input[..];
+        for size in [1, 7, 0, 31, 32, 33, 160, 1000, 4095].iter().cycle() {
+            if rest.is_empty() {
+                break;
+            }
+            let (block, tail) = rest.split_at((*size).min(rest.len()));
+            resampler.process(block, &mut blocks);
+            rest = tail;
+        }
+        assert_eq!(whole, blocks);
+    }
+
+    #[test]
+    fn reset_clears_history() {
+        let input = tone(440.0, 48000, 3000);
+        let mut resampler = Resampler::new(48000, TARGET_RATE, TAPS);
+        let mut first = Vec::new();
+        resampler.process(&input, &mut first);
+        resampler.reset();
+        let mut second = Vec::new();
+        resampler.process(&input, &mut second);
+        assert_eq!(first, second);
+    }
+
+    #[test]
+    fn converter_downmixes_stereo() {
+        let stereo: Vec<f32> = (0..1000).flat_map(|_| [0.5f32, -0.25]).collect();
+        let mut converter = Converter::new(TARGET_RATE, TARGET_RATE, 2, TAPS);
+        let mut out = Vec::new();
+        converter.process(&stereo, &mut out);
+        assert_eq!(out, vec![0.125; 1000]);
+
+        // Downmix then resample: a left-only tone comes out at half amplitude
+        let left: Vec<f32> = tone(1000.0, 48000, 9600).into_iter().flat_map(|x| [x, 0.0]).collect();
+        let mut converter = Converter::new(48000, TARGET_RATE, 2, TAPS);
+        let mut out = Vec::new();
+        converter.process(&left, &mut out);
+        assert_eq!(out.len(), 8820);
+        let peak = out[TAPS * 2..].iter().fold(0.0f32, |m, y| m.max(y.abs()));
+        assert!((peak - 0.5).abs() < 1e-2, "peak {}", peak);
+    }
+}
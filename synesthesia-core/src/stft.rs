@@ -0,0 +1,96 @@
+use std::sync::Arc;
+use realfft::{RealFftPlanner, RealToComplex};
+use realfft::num_complex::Complex;
+use crate::window::hanning_window;
+
+/// Windowed real-input FFT over a fixed frame size.
+/// Every buffer is allocated once in `new`; `magnitudes` only writes into them,
+/// so the fingerprinter and the analyzer can share the same spectrum code.
+pub struct Stft {
+    r2c: Arc<dyn RealToComplex<f32>>,
+    window: Vec<f32>,
+    input: Vec<f32>,
+    spectrum: Vec<Complex<f32>>,
+    scratch: Vec<Complex<f32>>,
+    magnitudes: Vec<f32>,
+}
+
+impl Stft {
+    pub fn new(frame_size: usize) -> Self {
+        let mut planner = RealFftPlanner::<f32>::new();
+        let r2c = planner.plan_fft_forward(frame_size);
+        let input = r2c.make_input_vec();
+        let spectrum = r2c.make_output_vec();
+        let scratch = r2c.make_scratch_vec();
+        let num_bins = spectrum.len();
+
+        Self {
+            r2c,
+            window: hanning_window(frame_size),
+            input,
+            spectrum,
+            scratch,
+            magnitudes: vec![0.0; num_bins],
+        }
+    }
+
+    pub fn frame_size(&self) -> usize {
+        self.window.len()
+    }
+
+    /// Number of one-sided bins (frame_size / 2 + 1).
+    pub fn num_bins(&self) -> usize {
+        self.magnitudes.len()
+    }
+
+    /// Window `frame` (zero-padded if shorter than the frame size) and
+    /// return its magnitude spectrum.
+    pub fn magnitudes(&mut self, frame: &[f32]) -> &[f32] {
+        for (i, slot) in self.input.iter_mut().enumerate() {
+            *slot = frame.get(i).copied().unwrap_or(0.0) * self.window[i];
+        }
+
+        // Buffer lengths are fixed at construction, so this cannot fail
+        let _ = self.r2c.process_with_scratch(&mut self.input, &mut self.spectrum, &mut self.scratch);
+
+        for (mag, c) in self.magnitudes.iter_mut().zip(&self.spectrum) {
+            *mag = c.norm();
+        }
+        &self.magnitudes
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::f32::consts::PI;
+
+    #[test]
+    fn one_sided_bins() {
+        let stft = Stft::new(1024);
+        assert_eq!(stft.frame_size(), 1024);
+        assert_eq!(stft.num_bins(), 513);
+    }
+
+    #[test]
+    fn bin_centred_tone_peaks_at_its_bin() {
+        let (size, bin) = (1024, 37);
+        let frame: Vec<f32> = (0..size).map(|n| (2.0 * PI * bin as f32 * n as f32 / size as f32).sin()).collect();
+        let mut stft = Stft::new(size);
+        let mags = stft.magnitudes(&frame);
+        let peak = (0..mags.len()).max_by(|&a, &b| mags[a].total_cmp(&mags[b])).unwrap();
+        assert_eq!(peak, bin);
+        // Hann main lobe: the neighbours get half the peak, the rest almost nothing
+        assert!((mags[bin - 1] / mags[bin] - 0.5).abs() < 1e-3);
+        assert!(mags[bin + 4] < 1e-3 * mags[bin]);
+    }
+
+    #[test]
+    fn short_frames_are_zero_padded() {
+        let mut stft = Stft::new(256);
+        let padded = stft.magnitudes(&[1.0; 100]).to_vec();
+        let mut explicit = vec![1.0; 100];
+        explicit.resize(256, 0.0);
+        assert_eq!(padded, stft.magnitudes(&explicit));
+    }
+}
@@ -0,0 +1,215 @@
+// Perceptual tempo prior: log-Gaussian centred on 120 BPM, one octave wide
+const PRIOR_BPM: f32 = 120.0;
+const PRIOR_OCTAVES: f32 = 1.0;
+
+/// Streaming tempo estimator over an onset-strength envelope.
+///
+/// Keeps an exponentially decaying autocorrelation for every candidate lag.
+/// Each new onset value updates the bank in O(number of lags), independent
+/// of how many seconds of history the estimate reflects, so the cost per hop
+/// is constant (~100 multiply-adds at 44.1 kHz / 512).
+pub struct TempoTracker {
+    frame_rate: f32,
+    min_lag: usize,
+    // Ring of the most recent detrended onset values (max_lag + 1 slots)
+    history: Vec<f32>,
+    pos: usize,
+    // Decayed autocorrelation, indexed by lag - min_lag
+    acf: Vec<f32>,
+    // Perceptual weighting per lag
+    weights: Vec<f32>,
+    decay: f32,
+    mean: f32,
+    energy: f32,
+    frames: usize,
+    bpm: f32,
+    confidence: f32,
+}
+
+impl TempoTracker {
+    pub fn new(frame_rate: f32, min_bpm: f32, max_bpm: f32, half_life: f32) -> Self {
+        let min_lag = ((60.0 * frame_rate / max_bpm).floor() as usize).max(1);
+        let max_lag = ((60.0 * frame_rate / min_bpm).ceil() as usize).max(min_lag + 2);
+        let weights = (min_lag..=max_lag)
+            .map(|lag| {
+                let octaves = (60.0 * frame_rate / lag as f32 / PRIOR_BPM).log2() / PRIOR_OCTAVES;
+                (-0.5 * octaves * octaves).exp()
+            })
+            .collect::<Vec<f32>>();
+
+        Self {
+            frame_rate,
+            min_lag,
+            history: vec![0.0; max_lag + 1],
+            pos: 0,
+            acf: vec![0.0; weights.len()],
+            weights,
+            decay: 0.5f32.powf(1.0 / (half_life * frame_rate).max(1.0)),
+            mean: 0.0,
+            energy: 0.0,
+            frames: 0,
+            bpm: 0.0,
+            confidence: 0.0,
+        }
+    }
+
+    pub fn reset(&mut self) {
+        self.history.iter_mut().for_each(|x| *x = 0.0);
+        self.acf.iter_mut().for_each(|x| *x = 0.0);
+        self.pos = 0;
+        self.mean = 0.0;
+        self.energy = 0.0;
+        self.frames = 0;
+        self.bpm = 0.0;
+        self.confidence = 0.0;
+    }
+
+    pub fn bpm(&self) -> f32 {
+        self.bpm
+    }
+
+    pub fn confidence(&self) -> f32 {
+        self.confidence
+    }
+
+    /// Push one onset-strength value (one analysis hop).
+    pub fn push(&mut self, onset: f32) {
+        // Remove the slowly varying mean so loud passages don't dominate
+        self.mean += (1.0 - self.decay) * (onset - self.mean);
+        let x = onset - self.mean;
+
+        let len = self.history.len();
+        self.pos = (self.pos + 1) % len;
+        self.history[self.pos] = x;
+
+        for (i, acc) in self.acf.iter_mut().enumerate() {
+            let past = self.history[(self.pos + len - (self.min_lag + i)) % len];
+            *acc = self.decay * *acc + x * past;
+        }
+        self.energy = self.decay * self.energy + x * x;
+        self.frames += 1;
+    }
+
+    /// Re-estimate BPM and confidence from the current autocorrelation bank.
+    pub fn estimate(&mut self) -> (f32, f32) {
+        if self.frames < self.history.len() || self.energy <= 0.0 {
+            return (self.bpm, self.confidence);
+        }
+
+        let mut best = 0;
+        let mut best_score = f32::MIN;
+        for (i, (&acc, &w)) in self.acf.iter().zip(&self.weights).enumerate() {
+            if acc * w > best_score {
+                best_score = acc * w;
+                best = i;
+            }
+        }
+
+        // Parabolic interpolation around the peak for sub-frame lag resolution
+        let mut lag = (self.min_lag + best) as f32;
+        if best > 0 && best + 1 < self.acf.len() {
+            let (a, b, c) = (self.acf[best - 1], self.acf[best], self.acf[best + 1]);
+            let denom = a - 2.0 * b + c;
+            if denom < 0.0 {
+                lag += (0.5 * (a - c) / denom).clamp(-0.5, 0.5);
+            }
+        }
+
+        self.bpm = 60.0 * self.frame_rate / lag;
+        self.confidence = (self.acf[best] / self.energy).clamp(0.0, 1.0);
+        (self.bpm, self.confidence)
+    }
+
+    /// Push a run of onset values and return the latest (bpm, confidence).
+    pub fn update(&mut self, onsets: &[f32]) -> (f32, f32) {
+        for &onset in onsets {
+            self.push(onset);
+        }
+        self.estimate()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    const FRAME_RATE: f32 = 44100.0 / 512.0;
+
+    /// Onset envelope of a click train: one unit impulse per beat, split
+    /// between the two nearest frames so off-grid beats don't jitter.
+    fn clicks(bpm: f32, seconds: f32) -> Vec<f32> {
+        let period = 60.0 * FRAME_RATE / bpm;
+        let frames = (seconds * FRAME_RATE) as usize;
+        let mut onsets = vec![0.0; frames + 1];
+        let mut beat = 0.0f32;
+        while (beat as usize) < frames {
+            let (frame, frac) = (beat as usize, beat.fract());
+            onsets[frame] += 1.0 - frac;
+            onsets[frame + 1] += frac;
+            beat += period;
+        }
+        onsets.truncate(frames);
+        onsets
+    }
+
+    #[test]
+    fn no_estimate_before_history_fills() {
+        let mut tracker = TempoTracker::new(FRAME_RATE, 60.0, 200.0, 6.0);
+        assert_eq!(tracker.update(&clicks(120.0, 0.5)), (0.0, 0.0));
+    }
+
+    #[test]
+    fn click_train_tempo() {
+        for bpm in [90.0, 120.0] {
+            let mut tracker = TempoTracker::new(FRAME_RATE, 60.0, 200.0, 6.0);
+            let (estimate, confidence) = tracker.update(&clicks(bpm, 20.0));
+            assert!((estimate - bpm).abs() < 1.5, "{} BPM estimated as {}", bpm, estimate);
+            assert!(confidence > 0.5, "{} BPM confidence {}", bpm, confidence);
+            assert_eq!((tracker.bpm(), tracker.confidence()), (estimate, confidence));
+        }
+    }
+
+    #[test]
+    fn noise_has_low_confidence() {
+        let mut state = 0x2545f491u32;
+        let noise: Vec<f32> = (0..2000)
+            .map(|_| {
+                state ^= state << 13;
+                state ^= state >> 17;
+                state ^= state << 5;
+                state as f32 / u32::MAX as f32
+            })
+            .collect();
+        let mut tracker = TempoTracker::new(FRAME_RATE, 60.0, 200.0, 6.0);
+        let (_, confidence) = tracker.update(&noise);
+        assert!(confidence < 0.3, "confidence {}", confidence);
+    }
+
+    #[test]
+    fn follows_tempo_change_within_a_few_half_lives() {
+        let half_life = 2.0;
+        let mut tracker = TempoTracker::new(FRAME_RATE, 60.0, 200.0, half_life);
+        let (bpm, _) = tracker.update(&clicks(120.0, 20.0));
+        assert!((bpm - 120.0).abs() < 1.5);
+
+        // Half a half-life in, the old tempo still dominates the decayed bank
+        let change = clicks(90.0, 4.0 * half_life);
+        let split = (0.5 * half_life * FRAME_RATE) as usize;
+        let (bpm, _) = tracker.update(&change[..split]);
+        assert!((bpm - 120.0).abs() < 1.5, "switched early: {}", bpm);
+
+        let (bpm, confidence) = tracker.update(&change[split..]);
+        assert!((bpm - 90.0).abs() < 1.5, "still at {}", bpm);
+        assert!(confidence > 0.5, "confidence {}", confidence);
+    }
+
+    #[test]
+    fn reset_forgets_history() {
+        let mut tracker = TempoTracker::new(FRAME_RATE, 60.0, 200.0, 6.0);
+        tracker.update(&clicks(150.0, 20.0));
+        tracker.reset();
+        assert_eq!((tracker.bpm(), tracker.confidence()), (0.0, 0.0));
+        let (bpm, _) = tracker.update(&clicks(90.0, 20.0));
+        assert!((bpm - 90.0).abs() < 1.5, "estimated {}", bpm);
+    }
+}
@@ -0,0 +1,142 @@
+import pytest
+import sys
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mailbox import FrameMailbox
+from ui.app import SynesthesiaApp
+from ui.widgets.vector_monitor import VectorMonitor
+
+def _controller():
+    controller = MagicMock()
+    controller.dsp.sample_rate = 44100
+    controller.dsp.block_size = 2048
+    controller.dsp.mailbox = FrameMailbox()
+    controller.ingesting = False
+    controller.pilot.running = False
+    controller.tick.return_value = {"type": "void"}
+    return controller
+
+@pytest.fixture
+def app():
+    with patch("ui.app.SystemController", return_value=_controller()):
+        yield SynesthesiaApp()
+
+@pytest.mark.asyncio
+async def test_idle_session_does_no_navigation_work(app):
+    async with app.run_test() as pilot:
+        await pilot.pause(0.5)
+        app.controller.tick.reset_mock()
+
+        await pilot.pause(1.0)
+        assert app.controller.tick.call_count == 0
+
+@pytest.mark.asyncio
+async def test_sweep_searches_at_resting_point(app):
+    async with app.run_test() as pilot:
+        await pilot.pause(0.5)
+        app.controller.tick.reset_mock()
+        app.nav_latency_ms.clear()
+        vm = app.query_one(VectorMonitor)
+
+        # A quick programmatic sweep: one search, at the final vector
+        for i in range(5):
+            vm.set_vector({"energy": 0.5 + 0.05 * i})
+            await pilot.pause(0.02)
+        await pilot.pause(app.NAV_DEBOUNCE * 3)
+
+        assert app.controller.tick.call_count == 1
+        vector, = app.controller.tick.call_args.args
+        assert vector["energy"] == pytest.approx(0.7)
+        assert app.controller.tick.call_args.kwargs == {"debounce": False}
+        assert len(app.nav_latency_ms) == 1
+        assert app.nav_latency_ms[0] >= app.NAV_DEBOUNCE * 1000 * 0.9
+
+@pytest.mark.asyncio
+async def test_long_sweep_searches_at_least_every_max_wait(app):
+    async with app.run_test() as pilot:
+        await pilot.pause(0.5)
+        app.controller.tick.reset_mock()
+        vm = app.query_one(VectorMonitor)
+
+        started = time.perf_counter()
+        i = 0
+        while time.perf_counter() - started < app.NAV_MAX_WAIT * 2.5:
+            vm.set_vector({"valence": (i % 20) / 20})
+            i += 1
+            await pilot.pause(0.05)
+        await pilot.pause(app.NAV_DEBOUNCE * 3)
+
+        # Intermediate searches during the sweep plus the trailing one
+        assert app.controller.tick.call_count >= 3
+
+@pytest.mark.asyncio
+async def test_held_key_searches_during_the_sweep(app):
+    async with app.run_test() as pilot:
+        await pilot.pause(0.5)
+        app.controller.tick.reset_mock()
+        vm = app.query_one(VectorMonitor)
+        vm.focus()
+
+        # Auto-repeat at ~20 Hz, back and forth so every press changes the vector
+        started = time.perf_counter()
+        i = 0
+        while time.perf_counter() - started < app.NAV_MAX_WAIT * 2.5:
+            await pilot.press("right" if (i // 5) % 2 == 0 else "left")
+            i += 1
+            await pilot.pause(0.05)
+        during = app.controller.tick.call_count
+        await pilot.pause(app.NAV_DEBOUNCE * 3)
+
+        # Searches while the key is held, and the last one sees where it stopped
+        assert during >= 2
+        vector, = app.controller.tick.call_args.args
+        assert vector == vm.get_vector()
+
+@pytest.mark.asyncio
+async def test_frame_stats_overlay(app):
+    async with app.run_test() as pilot:
+        await pilot.pause(0.3)
+        assert "scope" in app.scheduler.tasks
+
+        app.set_focus(None)
+        await pilot.press("f")
+        await pilot.pause(0.6)
+
+        overlay = app.query_one("#frame-stats")
+        assert overlay.has_class("visible")
+        assert "budget" in str(overlay.render())
+
+@pytest.mark.asyncio
+async def test_panels_light_up_as_services_report(app):
+    app.controller.status = {"vector": "ready", "spotify": "ready", "navigation": "starting"}
+    app.controller.init_ms = {"navigation": 420.0}
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        assert app.first_frame_ms is not None
+        assert app.controller.start.called
+        monitor = app.query_one("#vector-monitor")
+        assert monitor.has_class("pending")
+
+        app.controller.status["navigation"] = "ready"
+        app._show_service_status("navigation", "ready")
+        assert not monitor.has_class("pending")
+        assert "navigation ✓" in app.sub_title
+
+@pytest.mark.asyncio
+async def test_stats_panel_shows_stage_latency(app):
+    from services.metrics import metrics
+    metrics.record("vector_search", 2.0)
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        app.set_focus(None)
+        await pilot.press("s")
+        await pilot.pause()
+
+        panel = app.query_one("#stats")
+        assert panel.has_class("visible")
+        assert "vector_search" in str(app.export_screenshot())
@@ -0,0 +1,136 @@
+import pytest
+import numpy as np
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mailbox import FrameMailbox
+from services.navigation import Navigation
+from services.autopilot import AudioPilot, features_to_target
+
+CATALOG = {
+    "quiet": np.array([0.1, 0.5, 0.5, 0.9, 0.0], dtype=np.float32),
+    "mid": np.array([0.5, 0.5, 0.5, 0.5, 0.0], dtype=np.float32),
+    "loud": np.array([0.9, 0.5, 0.5, 0.1, 0.0], dtype=np.float32),
+}
+
+def _cosine(a, b):
+    return 1.0 - np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+
+def _search(vector, k=1):
+    # Ranked like the collection (cosine)
+    track_id = min(CATALOG, key=lambda t: _cosine(CATALOG[t], vector))
+    return [{"payload": {"spotify_id": track_id}, "vector": CATALOG[track_id].tolist()}]
+
+@pytest.fixture
+def controller():
+    ve = MagicMock()
+    ve.search.side_effect = _search
+    nav = Navigation(ve, MagicMock())
+    nav.debounce_ms = 0
+    return SimpleNamespace(nav=nav, ingesting=False, tick=nav.tick)
+
+def _vector(energy, acousticness):
+    return {"energy": energy, "valence": 0.5, "danceability": 0.5,
+            "acousticness": acousticness, "instrumentalness": 0.0}
+
+class TestAudioPilot:
+    def test_features_map_to_target(self):
+        box = FrameMailbox()
+        base = _vector(0.5, 0.5)
+
+        box.publish(rms=0.3, flatness=0.02)
+        loud_tonal = features_to_target(box.latest(), base)
+        box.publish(rms=0.001, flatness=0.35)
+        quiet_noisy = features_to_target(box.latest(), base)
+
+        assert loud_tonal["energy"] > 0.8 and quiet_noisy["energy"] < 0.2
+        assert loud_tonal["acousticness"] > quiet_noisy["acousticness"]
+        assert loud_tonal["instrumentalness"] == base["instrumentalness"]
+
+    def test_hysteresis_holds_current_track(self, controller):
+        nav = controller.nav
+        nav.switch_margin = 0.2
+
+        assert nav.tick(_vector(0.1, 0.9))["type"] == "found"
+        assert nav.current_track_id == "quiet"
+
+        # "mid" is now nearest, but not by the required margin
+        result = nav.tick(_vector(0.35, 0.65))
+        assert result["type"] == "held"
+        assert nav.current_track_id == "quiet"
+
+        assert nav.tick(_vector(0.9, 0.1))["type"] == "found"
+        assert nav.current_track_id == "loud"
+        assert nav.switches == 2 and nav.holds == 1
+        assert nav.sp.play_track.call_count == 2
+
+    def test_manual_tick_switches_with_default_settings(self, controller):
+        nav = controller.nav
+        nav.tick(_vector(0.1, 0.9))
+
+        # "mid" is cosine-nearest to this target but Euclidean-farther than "quiet"
+        target = {"energy": 0.4, "valence": 0.6, "danceability": 1.0, "acousticness": 0.9, "instrumentalness": 0.0}
+        assert _cosine(CATALOG["mid"], nav._vector_dict_to_array(target)) < \
+            _cosine(CATALOG["quiet"], nav._vector_dict_to_array(target))
+        assert np.linalg.norm(CATALOG["mid"] - nav._vector_dict_to_array(target)) > \
+            np.linalg.norm(CATALOG["quiet"] - nav._vector_dict_to_array(target))
+
+        assert nav.tick(target)["type"] == "found"
+        assert nav.current_track_id == "mid" and nav.holds == 0
+
+    def test_min_dwell_blocks_rapid_switches(self, controller):
+        nav = controller.nav
+        nav.min_dwell_ms = 60_000
+
+        nav.tick(_vector(0.1, 0.9))
+        assert nav.tick(_vector(0.9, 0.1))["type"] == "held"
+        # A forced search bypasses hysteresis
+        assert nav.force_search(_vector(0.9, 0.1))["type"] == "found"
+        assert nav.current_track_id == "loud"
+
+    def test_step_steers_and_measures_latency(self, controller):
+        box = FrameMailbox()
+        pilot = AudioPilot(controller, box, smoothing_s=0.0, min_dwell_s=0.0)
+
+        assert pilot.step(0.1) is None  # nothing published yet
+
+        box.publish(rms=0.5, flatness=0.35, centroid=2000.0)
+        result = pilot.step(0.1)
+
+        assert result["type"] == "found"
+        assert controller.nav.current_track_id == "loud"
+        assert pilot.step(0.1) is None  # same frame is not re-applied
+
+        report = pilot.report()
+        assert report["ticks"] == 1 and report["switches"] == 1
+        assert 0 < report["switch_latency_ms_p50"] < report["budget_ms"]
+
+    def test_thread_ticks_at_rate_and_restores_manual_mode(self, controller):
+        box = FrameMailbox()
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            # Fake clock: every wait publishes a fresh frame; stop after 25 periods
+            sleeps.append(seconds)
+            now[0] += seconds
+            box.publish(rms=0.5 if len(sleeps) % 2 else 0.01, flatness=0.1)
+            if len(sleeps) == 25:
+                pilot.running = False
+
+        pilot = AudioPilot(controller, box, rate_hz=50.0, clock=lambda: now[0], sleep=sleep)
+        box.publish(rms=0.01, flatness=0.1)
+        pilot.start(_vector(0.5, 0.5))
+        assert controller.nav.min_dwell_ms == pilot.min_dwell_s * 1000
+        pilot.thread.join(timeout=5.0)
+        pilot.stop()
+
+        assert pilot.ticks == 25 and pilot.overruns == 0
+        assert sleeps == pytest.approx([0.02] * 25)
+        assert controller.nav.min_dwell_ms == 0
+        assert controller.nav.switch_margin == 0.0
@@ -0,0 +1,70 @@
+import sys
+import os
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ark import Ark
+from services.catalog import SyntheticCatalog, BLOCK, DIMENSIONS
+
+class RecordingEngine:
+    def __init__(self):
+        self.tracks = []
+        self.vectors = []
+
+    def upsert_batch(self, tracks, vectors):
+        self.tracks.extend(tracks)
+        self.vectors.extend(vectors)
+
+class TestSyntheticCatalog:
+    def test_rows_depend_only_on_seed_and_index(self):
+        catalog = SyntheticCatalog(seed=7)
+        tracks, vectors = catalog.chunk(0, 2 * BLOCK)
+
+        # Any slice, even across a block boundary, regenerates identically
+        again, again_vectors = SyntheticCatalog(seed=7).chunk(BLOCK - 10, 20)
+        assert again == tracks[BLOCK - 10:BLOCK + 10]
+        np.testing.assert_array_equal(again_vectors, vectors[BLOCK - 10:BLOCK + 10])
+
+        other, _ = SyntheticCatalog(seed=8).chunk(0, 10)
+        assert other[0]["id"] != tracks[0]["id"]
+
+    def test_ids_are_unique_and_spotify_shaped(self):
+        ids = SyntheticCatalog().ids(0, 200_000)
+        assert len(set(ids)) == len(ids)
+        assert all(len(i) == 22 and i.isalnum() for i in ids[:1000])
+
+    def test_feature_distribution_is_realistic(self):
+        _, vectors = SyntheticCatalog().chunk(0, 50_000)
+        assert vectors.dtype == np.float32 and vectors.shape == (50_000, 5)
+        assert vectors.min() >= 0.0 and vectors.max() <= 1.0
+
+        energy, valence, danceability, acousticness, instrumentalness = vectors.T
+        # Not a uniform cube: loud tracks are rarely acoustic, most tracks have vocals
+        assert np.corrcoef(energy, acousticness)[0, 1] < -0.5
+        assert np.corrcoef(danceability, valence)[0, 1] > 0.2
+        assert np.mean(instrumentalness < 0.1) > 0.5
+        assert 0.5 < energy.mean() < 0.7
+
+    def test_csv_is_readable_by_ark(self, tmp_path):
+        path = str(tmp_path / "tracks_features.csv")
+        catalog = SyntheticCatalog(seed=3)
+        catalog.write_csv(path, 1234, batch_size=500)
+
+        engine = RecordingEngine()
+        Ark(engine).ingest(path, batch_size=400)
+
+        tracks, vectors = catalog.chunk(0, 1234)
+        assert [t["id"] for t in engine.tracks] == [t["id"] for t in tracks]
+        assert engine.tracks[0]["artist"] == tracks[0]["artist"]
+        np.testing.assert_allclose(np.stack(engine.vectors), vectors, atol=1e-4)
+
+    def test_ingest_streams_batches(self):
+        engine = RecordingEngine()
+        progress = []
+        SyntheticCatalog().ingest(engine, 2500, batch_size=1000, callback=progress.append)
+
+        assert progress == [1000, 2000, 2500]
+        assert len(engine.tracks) == 2500
+        assert set(DIMENSIONS) <= set(engine.tracks[0])
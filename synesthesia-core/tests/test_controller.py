@@ -0,0 +1,67 @@
+import pytest
+import sys
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import controller as controller_module
+from services.controller import SystemController, READY, FAILED
+
+def _slow(seconds, result=None, error=None):
+    def build(*args, **kwargs):
+        time.sleep(seconds)
+        if error:
+            raise error
+        return result if result is not None else MagicMock()
+    return build
+
+@pytest.fixture
+def services():
+    with patch.object(controller_module, "VectorEngine", side_effect=_slow(0.3)) as ve, \
+         patch.object(controller_module, "SpotifyClient", side_effect=_slow(0.3)) as sp, \
+         patch.object(controller_module, "DSP") as dsp:
+        dsp.return_value.start.side_effect = _slow(0.3)
+        yield ve, sp, dsp
+
+class TestServiceStartup:
+    def test_construction_is_instant(self, services):
+        started = time.perf_counter()
+        controller = SystemController()
+        assert time.perf_counter() - started < 0.1
+
+        assert controller.ve is None and controller.nav is None
+        assert controller.tick({"energy": 0.5}) is None
+        assert controller.handle_suggest("query") == []
+
+    def test_services_start_concurrently(self, services):
+        events = []
+        controller = SystemController(on_status=lambda name, state: events.append((name, state)))
+
+        started = time.perf_counter()
+        assert controller.start(wait=True) is None
+        elapsed = time.perf_counter() - started
+
+        # Three 0.3 s inits in parallel, not back to back
+        assert elapsed < 0.6
+        assert controller.ready("vector", "spotify", "audio", "fingerprint", "navigation")
+        assert controller.nav is not None and controller.ark is not None
+        assert ("navigation", READY) in events
+        assert events.index(("navigation", READY)) > events.index(("spotify", READY))
+        assert all(0 < ms < 600 for ms in controller.init_ms.values())
+
+    def test_failed_service_is_reported_not_raised(self, services):
+        _, sp, _ = services
+        sp.side_effect = _slow(0.05, error=RuntimeError("Spotify Credentials Missing"))
+
+        controller = SystemController()
+        controller.start()
+        assert not controller.wait_ready(timeout=2.0)
+
+        assert controller.status["spotify"] == FAILED
+        assert controller.status["navigation"] == FAILED
+        assert controller.status["vector"] == READY
+        assert "Credentials" in controller.handle_search("song")["error"]
+        assert controller.start_autopilot() is False
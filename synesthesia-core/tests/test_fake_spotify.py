@@ -0,0 +1,126 @@
+import pytest
+import sys
+import os
+import time
+import random
+from fastapi.testclient import TestClient
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fake_spotify import create_fake_spotify, FakeSpotifyConfig, parse_latency, parse_latencies
+
+def _client(**config) -> TestClient:
+    return TestClient(create_fake_spotify(FakeSpotifyConfig(tracks=2000, **config)))
+
+def _auth(client: TestClient) -> dict:
+    token = client.post("/api/token", data={"grant_type": "client_credentials"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+class TestFakeSpotifyApi:
+    def test_factory_reads_env_when_called(self, monkeypatch):
+        from services import fake_spotify
+        # Nothing is built at import time; uvicorn --factory calls create_fake_spotify()
+        assert not hasattr(fake_spotify, "app")
+
+        monkeypatch.setenv("SYN_FAKE_SPOTIFY_TRACKS", "300")
+        client = TestClient(create_fake_spotify())
+        assert client.get("/fake/stats").json()["tracks"] == 300
+
+    def test_catalog_endpoints(self):
+        client = _client()
+        headers = _auth(client)
+
+        found = client.get("/v1/search", params={"q": "midnight", "type": "track", "limit": 3}, headers=headers).json()
+        items = found["tracks"]["items"]
+        assert len(items) == 3 and found["tracks"]["total"] > 3
+        assert all("midnight" in item["name"].lower() for item in items)
+
+        track_id = items[0]["id"]
+        track = client.get(f"/v1/tracks/{track_id}", headers=headers).json()
+        assert track["uri"] == f"spotify:track:{track_id}" and track["artists"][0]["name"]
+
+        # spotipy asks for "audio-features/?ids=..."
+        features = client.get(f"/v1/audio-features/?ids={track_id},missing", headers=headers).json()["audio_features"]
+        assert features[0]["id"] == track_id and 0 <= features[0]["energy"] <= 1
+        assert features[1] is None
+        assert client.get("/v1/tracks/missing", headers=headers).status_code == 404
+
+    def test_playback(self):
+        client = _client(devices=3)
+        headers = _auth(client)
+        assert client.get("/v1/me/player", headers=headers).status_code == 204
+
+        devices = client.get("/v1/me/player/devices", headers=headers).json()["devices"]
+        assert len(devices) == 3 and sum(d["is_active"] for d in devices) == 1
+
+        track_id = client.get("/v1/search", params={"q": "rain"}, headers=headers).json()["tracks"]["items"][0]["id"]
+        target = devices[2]["id"]
+        played = client.put(f"/v1/me/player/play?device_id={target}", json={"uris": [f"spotify:track:{track_id}"]},
+                            headers=headers)
+        assert played.status_code == 204
+
+        state = client.get("/v1/me/player", headers=headers).json()
+        assert state["item"]["id"] == track_id and state["device"]["id"] == target and state["is_playing"]
+        assert client.put("/v1/me/player/play?device_id=nope", json={"uris": [f"spotify:track:{track_id}"]},
+                          headers=headers).status_code == 404
+
+    def test_tokens_expire(self):
+        client = _client(token_ttl=1)
+        assert client.get("/v1/me/player/devices").status_code == 401
+
+        headers = _auth(client)
+        assert client.get("/v1/me/player/devices", headers=headers).status_code == 200
+        time.sleep(1.1)
+        assert client.get("/v1/me/player/devices", headers=headers).status_code == 401
+        # refreshing gives a working token again
+        refreshed = client.post("/api/token", data={"grant_type": "refresh_token", "refresh_token": "x"}).json()
+        assert client.get("/v1/me/player/devices",
+                          headers={"Authorization": f"Bearer {refreshed['access_token']}"}).status_code == 200
+
+    def test_rate_limit_sends_retry_after(self):
+        client = _client(rate=2, burst=3)
+        headers = _auth(client)  # token endpoint is not rate limited
+
+        statuses = [client.get("/v1/me/player/devices", headers=headers) for _ in range(5)]
+        assert [r.status_code for r in statuses] == [200, 200, 200, 429, 429]
+        assert int(statuses[3].headers["Retry-After"]) >= 1
+        stats = client.get("/fake/stats").json()["endpoints"]["devices"]
+        assert stats["rate_limited"] == 2 and stats["ok"] == 3
+
+    def test_failure_injection_and_runtime_config(self):
+        client = _client(error_rate=1.0)
+        assert client.post("/api/token", data={"grant_type": "client_credentials"}).status_code in (500, 502, 503)
+
+        client.post("/fake/config", json={"error_rate": 0.0, "latency": "token=const:50"})
+        started = time.perf_counter()
+        assert client.post("/api/token", data={"grant_type": "client_credentials"}).status_code == 200
+        assert time.perf_counter() - started >= 0.05
+
+        stats = client.get("/fake/stats").json()["endpoints"]["token"]
+        assert stats["errors"] == 1 and stats["ok"] == 1
+
+def test_client_reads_api_base_at_construction(monkeypatch):
+    from services.spotify import SpotifyClient
+
+    monkeypatch.setenv("SYN_SPOTIFY_API_BASE", "http://127.0.0.1:8901/")
+    client = SpotifyClient()
+    assert not client.mock_mode
+    assert client.sp.prefix == "http://127.0.0.1:8901/v1/"
+    assert client.sp.auth_manager.OAUTH_TOKEN_URL == "http://127.0.0.1:8901/api/token"
+
+class TestLatencySpecs:
+    def test_distributions(self):
+        rng = random.Random(0)
+        assert parse_latency("const:20")(rng) == pytest.approx(0.02)
+        assert all(0.01 <= parse_latency("uniform:10,30")(rng) <= 0.03 for _ in range(100))
+        samples = sorted(parse_latency("lognormal:40,0.5")(rng) for _ in range(2001))
+        assert samples[1000] == pytest.approx(0.04, rel=0.1)
+        with pytest.raises(ValueError):
+            parse_latency("pareto:1,2")
+
+    def test_per_endpoint_overrides(self):
+        samplers = parse_latencies("search=const:100; *=const:5")
+        assert set(samplers) == {"search", "*"}
+        assert samplers["search"](random.Random()) == pytest.approx(0.1)
+        assert set(parse_latencies("const:5")) == {"*"}
@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fingerprint import FingerprintIndex
+
+def _track_postings(seed, n=400, frames=200):
+    rng = np.random.default_rng(seed)
+    hashes = rng.integers(0, 2**32, size=n, dtype=np.uint64)
+    offsets = rng.integers(0, frames, size=n).astype(np.uint32)
+    return hashes, offsets
+
+class TestFingerprintIndex:
+    @pytest.fixture
+    def index(self):
+        postings = {f"track_{i}": _track_postings(i) for i in range(50)}
+        # Force the NumPy matcher (rust core is not built in the test env)
+        with patch('services.fingerprint.fingerprint_match', None):
+            yield FingerprintIndex.build(postings), postings
+
+    def test_build_sorted(self, index):
+        idx, postings = index
+        assert len(idx) == sum(len(h) for h, _ in postings.values())
+        assert np.all(np.diff(idx.hashes.astype(np.float64)) >= 0)
+
+    def test_match_recovers_offset(self, index):
+        idx, postings = index
+        hashes, offsets = postings["track_7"]
+
+        # Query is an excerpt starting 30 frames into the track
+        mask = offsets >= 30
+        q_hashes = hashes[mask]
+        q_offsets = offsets[mask] - 30
+
+        matches = idx.match(q_hashes, q_offsets, top_k=3)
+
+        assert matches[0]["track_id"] == "track_7"
+        assert matches[0]["offset"] == 30
+        assert matches[0]["score"] == mask.sum()
+
+    def test_match_ignores_noise(self, index):
+        idx, _ = index
+        q_hashes, q_offsets = _track_postings(999)
+
+        matches = idx.match(q_hashes, q_offsets)
+
+        assert all(m["score"] < idx.min_score for m in matches)
+
+    def test_empty_index(self):
+        idx = FingerprintIndex.build({})
+        assert idx.match(np.array([1], dtype=np.uint64), np.array([0], dtype=np.uint32)) == []
@@ -0,0 +1,109 @@
+import pytest
+import numpy as np
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fingerprint_store import FingerprintStore, merge_runs, _load_columns
+
+def _track_postings(seed, n=300, frames=150):
+    rng = np.random.default_rng(seed)
+    hashes = rng.integers(0, 2**32, size=n, dtype=np.uint64)
+    offsets = rng.integers(0, frames, size=n).astype(np.uint32)
+    return hashes, offsets
+
+@pytest.fixture(autouse=True)
+def numpy_matcher():
+    # Force the NumPy matcher (rust core is not built in the test env)
+    with patch('services.fingerprint.fingerprint_match', None):
+        yield
+
+class TestFingerprintStore:
+    def test_bulk_build_with_spills(self, tmp_path):
+        store = FingerprintStore.open(str(tmp_path))
+        builder = store.builder(chunk_postings=1000)
+        postings = {f"track_{i}": _track_postings(i) for i in range(20)}
+        for track_id, (h, o) in postings.items():
+            builder.add(track_id, h, o)
+        assert len(builder.runs) > 1
+
+        store.append(builder)
+
+        assert len(store.segments) == 1
+        hashes = store.segments[0][1].hashes
+        assert len(hashes) == 20 * 300
+        assert np.all(hashes[1:] >= hashes[:-1])
+
+        h, o = postings["track_13"]
+        assert store.match(h, o)[0]["track_id"] == "track_13"
+
+    def test_reopen_is_memory_mapped(self, tmp_path):
+        FingerprintStore.open(str(tmp_path)).add_tracks({"a": _track_postings(1), "b": _track_postings(2)})
+
+        store = FingerprintStore.open(str(tmp_path))
+
+        assert isinstance(store.segments[0][1].hashes, np.memmap)
+        assert store.track_count == 2
+        h, o = _track_postings(2)
+        assert store.match(h, o)[0]["track_id"] == "b"
+
+    def test_append_and_compact(self, tmp_path):
+        store = FingerprintStore.open(str(tmp_path), max_segments=100)
+        for i in range(4):
+            store.add_tracks({f"track_{i}": _track_postings(i)})
+        assert len(store.segments) == 4
+
+        store.compact()
+
+        assert len(store.segments) == 1
+        assert len(store) == 4 * 300
+        reopened = FingerprintStore.open(str(tmp_path))
+        assert [n for n, _ in reopened.segments] == [n for n, _ in store.segments]
+        h, o = _track_postings(3)
+        assert reopened.match(h, o)[0]["track_id"] == "track_3"
+
+    def test_background_compaction(self, tmp_path):
+        store = FingerprintStore.open(str(tmp_path), max_segments=2)
+        for i in range(3):
+            store.add_tracks({f"track_{i}": _track_postings(i)})
+
+        store.wait_for_compaction(timeout=10)
+
+        assert len(store.segments) == 1
+
+    def test_sources_commit_with_segment(self, tmp_path):
+        store = FingerprintStore.open(str(tmp_path))
+        builder = store.builder()
+        builder.add("a", *_track_postings(1))
+        store.append(builder, sources=["/music/a.wav"])
+
+        # Crash after the sources were written but before the manifest
+        with patch.object(store, "_write_manifest", side_effect=OSError("crash")):
+            builder = store.builder()
+            builder.add("b", *_track_postings(2))
+            with pytest.raises(OSError):
+                store.append(builder, sources=["/music/b.wav"])
+
+        reopened = FingerprintStore.open(str(tmp_path))
+        assert reopened.sources() == {"/music/a.wav"}
+        assert list(reopened.track_ids) == ["a"]
+
+        builder = reopened.builder()
+        builder.add("b", *_track_postings(2))
+        reopened.append(builder, sources=["/music/b.wav"])
+        assert FingerprintStore.open(str(tmp_path)).sources() == {"/music/a.wav", "/music/b.wav"}
+
+def test_merge_runs(tmp_path):
+    rng = np.random.default_rng(0)
+    runs = []
+    for _ in range(5):
+        h = np.sort(rng.integers(0, 1000, size=777).astype(np.uint64))
+        runs.append((h, np.arange(777, dtype=np.uint32), np.zeros(777, dtype=np.uint32)))
+
+    merge_runs(runs, str(tmp_path / "out"), block_size=64)
+
+    hashes, _, _ = _load_columns(str(tmp_path / "out"))
+    assert np.array_equal(hashes, np.sort(np.concatenate([r[0] for r in runs])))
@@ -0,0 +1,119 @@
+import pytest
+import numpy as np
+import sys
+import os
+import wave
+import struct
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import library
+from services.library import iter_wav_blocks, fingerprint_stream, find_audio_files, LibraryFingerprinter
+from services.fingerprint_store import FingerprintStore
+
+def _fake_fingerprint(audio, peaks_per_block=0):
+    """Pure-Python stand-in with the Rust fingerprinter's frame/pairing/density geometry."""
+    num_windows = (len(audio) - library.WINDOW_SIZE) // library.HOP_SIZE
+    peaks = [int(abs(audio[i * library.HOP_SIZE]) * 1000) for i in range(num_windows)]
+    if peaks_per_block:
+        # Keep the strongest peaks of each density block, like limit_peak_density
+        for start in range(0, num_windows, library.DENSITY_BLOCK_FRAMES):
+            block = range(start, min(start + library.DENSITY_BLOCK_FRAMES, num_windows))
+            for t in sorted(block, key=lambda t: -peaks[t])[peaks_per_block:]:
+                peaks[t] = None
+    hashes, offsets = [], []
+    for t1 in range(num_windows):
+        for t2 in range(t1 + 1, min(t1 + library.LOOKAHEAD_FRAMES, num_windows)):
+            if peaks[t1] is None or peaks[t2] is None:
+                continue
+            hashes.append((peaks[t1] << 20) | (peaks[t2] << 8) | (t2 - t1))
+            offsets.append(t1)
+    return np.array(hashes, dtype=np.uint64), np.array(offsets, dtype=np.uint32)
+
+def _write_wav(path, samples, channels=1, rate=44100):
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+
+class TestLibrary:
+    def test_iter_wav_blocks_downmixes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(library, "Resampler", None)
+        stereo = np.stack([np.full(5000, 0.5), np.full(5000, -0.25)], axis=1).ravel()
+        _write_wav(tmp_path / "a.wav", stereo, channels=2)
+
+        blocks = list(iter_wav_blocks(str(tmp_path / "a.wav"), block_frames=1024))
+
+        assert sum(len(b) for b in blocks) == 5000
+        assert blocks[0].dtype == np.float32
+        assert blocks[0][0] == pytest.approx(0.125, abs=1e-3)
+
+    def test_iter_wav_blocks_reads_float_wavs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(library, "Resampler", None)
+        audio = np.linspace(-1, 1, 3000, dtype="<f4")
+        data = audio.tobytes()
+        fmt = struct.pack("<HHIIHH", 3, 1, 44100, 44100 * 4, 4, 32)
+        (tmp_path / "f.wav").write_bytes(
+            b"RIFF" + struct.pack("<I", 20 + len(fmt) + len(data)) + b"WAVE"
+            + b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", len(data)) + data
+        )
+
+        blocks = list(iter_wav_blocks(str(tmp_path / "f.wav"), block_frames=1024))
+
+        assert [len(b) for b in blocks] == [1024, 1024, 952]
+        np.testing.assert_array_equal(np.concatenate(blocks), audio)
+
+    def test_iter_wav_blocks_needs_resampler_for_other_rates(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(library, "Resampler", None)
+        _write_wav(tmp_path / "b.wav", np.zeros(100), rate=22050)
+
+        with pytest.raises(ValueError):
+            list(iter_wav_blocks(str(tmp_path / "b.wav")))
+
+    def test_streaming_matches_whole_file(self, monkeypatch):
+        monkeypatch.setattr(library, "CHUNK_FRAMES", 37)
+        audio = np.random.default_rng(0).uniform(-1, 1, 44100 * 6).astype(np.float32)
+        blocks = (audio[i:i + 3000] for i in range(0, len(audio), 3000))
+
+        hashes, offsets, seconds = fingerprint_stream(blocks, fingerprint=_fake_fingerprint)
+        whole_hashes, whole_offsets = _fake_fingerprint(audio)
+
+        assert seconds == pytest.approx(6.0)
+        assert sorted(zip(hashes.tolist(), offsets.tolist())) == sorted(zip(whole_hashes.tolist(), whole_offsets.tolist()))
+
+    def test_streaming_matches_whole_file_with_peak_cap(self, monkeypatch):
+        assert library.CHUNK_FRAMES % library.DENSITY_BLOCK_FRAMES == 0
+        assert library.OVERLAP_FRAMES % library.DENSITY_BLOCK_FRAMES == 0
+        assert library.OVERLAP_FRAMES >= library.LOOKAHEAD_FRAMES
+
+        monkeypatch.setattr(library, "CHUNK_FRAMES", 2 * library.DENSITY_BLOCK_FRAMES)
+        audio = np.random.default_rng(1).uniform(-1, 1, 44100 * 8).astype(np.float32)
+        blocks = (audio[i:i + 5000] for i in range(0, len(audio), 5000))
+        capped = lambda chunk: _fake_fingerprint(chunk, peaks_per_block=5)
+
+        hashes, offsets, _ = fingerprint_stream(blocks, fingerprint=capped)
+        whole_hashes, whole_offsets = capped(audio)
+
+        assert sorted(zip(hashes.tolist(), offsets.tolist())) == sorted(zip(whole_hashes.tolist(), whole_offsets.tolist()))
+
+    def test_find_audio_files(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        _write_wav(tmp_path / "sub" / "x.WAV", np.zeros(10))
+        (tmp_path / "notes.txt").write_text("-")
+
+        assert find_audio_files(str(tmp_path)) == [str(tmp_path / "sub" / "x.WAV")]
+
+    def test_colliding_track_ids_fall_back_to_library_paths(self, tmp_path):
+        store = FingerprintStore(str(tmp_path / "store"))
+        store.add_tracks({"outro": (np.array([1], dtype=np.uint64), np.array([0], dtype=np.uint32))})
+        root = tmp_path / "music"
+        paths = [str(root / "a" / "intro.wav"), str(root / "b" / "intro.wav"),
+                 str(root / "a" / "4uLU6hMCjMI75M1A2tKUQC.wav"), str(root / "outro.wav")]
+
+        ids = LibraryFingerprinter(store, workers=1).track_ids(str(root), paths)
+
+        assert ids == {paths[0]: "a/intro.wav", paths[1]: "b/intro.wav",
+                       paths[2]: "4uLU6hMCjMI75M1A2tKUQC", paths[3]: "outro.wav"}
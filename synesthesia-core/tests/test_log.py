@@ -0,0 +1,101 @@
+import pytest
+import sys
+import os
+import threading
+from textual.app import App
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.widgets.log import Log
+
+class LogApp(App):
+    def __init__(self, **log_kwargs):
+        super().__init__()
+        self.log_kwargs = log_kwargs
+
+    def compose(self):
+        yield Log(id="log", **self.log_kwargs)
+
+@pytest.mark.asyncio
+async def test_progress_collapses_into_live_line():
+    app = LogApp()
+    async with app.run_test() as pilot:
+        log = app.query_one(Log)
+        log.log_info("Opening Ark: tracks.csv")
+        for n in range(1, 101):
+            log.log_info(f"Ingested {n * 1000} tracks...", progress=True)
+        log.flush()
+        await pilot.pause()
+
+        assert log.written == 1
+        assert log.collapsed == 99
+        assert "100000" in str(log.live_view.render())
+
+        log.log_info("Ark ready")
+        log.log_info("Ark ready")
+        log.flush()
+        assert log.written == 2  # final progress value committed
+        assert "x2" in str(log.live_view.render())
+
+@pytest.mark.asyncio
+async def test_results_are_never_collapsed(tmp_path):
+    spill = tmp_path / "session.log"
+    app = LogApp(spill_path=str(spill))
+    async with app.run_test() as pilot:
+        log = app.query_one(Log)
+        log.log_found("Track 7 - Artist 1")
+        log.log_found("Track 9 - Artist 1")
+        log.log_found("Track 9 - Artist 1")
+        log.log_error("Spotify code 404")
+        log.log_error("Spotify code 500")
+        log.flush()
+        await pilot.pause()
+        assert log.collapsed == 0
+
+    lines = spill.read_text().splitlines()
+    assert [line.split(" ", 2)[2] for line in lines] == [
+        "FOUND  Track 7 - Artist 1",
+        "FOUND  Track 9 - Artist 1",
+        "FOUND  Track 9 - Artist 1",
+        "ERR    Spotify code 404",
+        "ERR    Spotify code 500",
+    ]
+
+@pytest.mark.asyncio
+async def test_threaded_producers_stay_bounded():
+    app = LogApp(max_lines=50)
+    async with app.run_test() as pilot:
+        log = app.query_one(Log)
+
+        def produce(name):
+            for i in range(200):
+                log.log_found(f"{name} track {'abcdefghij'[i % 10]}")
+
+        threads = [threading.Thread(target=produce, args=(name,)) for name in ("A", "B", "C")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        log.flush()
+        await pilot.pause()
+
+        assert len(log.lines_view.lines) <= 50
+        assert log.collapsed == 0
+        assert log.written + log.dropped == 599  # last one is live
+
+@pytest.mark.asyncio
+async def test_spill_file_keeps_full_history(tmp_path):
+    spill = tmp_path / "session.log"
+    app = LogApp(max_lines=5, spill_path=str(spill))
+    async with app.run_test() as pilot:
+        log = app.query_one(Log)
+        for i in range(20):
+            log.log_error(f"failure {'abcdefghijklmnopqrst'[i]}")
+            log.flush()
+        await pilot.pause()
+
+    lines = spill.read_text().splitlines()
+    assert len(lines) == 20
+    assert lines[0].endswith("ERR    failure a")
+    assert lines[-1].endswith("ERR    failure t")
@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import sys
+import os
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mailbox import FrameMailbox
+
+def _stars(n, base=0):
+    return np.stack([np.arange(base, base + n), np.full(n, 3)], axis=1).astype(np.uint16)
+
+class TestFrameMailbox:
+    def test_drain_returns_frames_in_order(self):
+        box = FrameMailbox(capacity=8)
+        for i in range(5):
+            box.publish(rms=i / 10, flatness=0.5)
+
+        frames = box.drain()
+
+        assert frames["seq"].tolist() == [0, 1, 2, 3, 4]
+        assert frames["rms"][-1] == pytest.approx(0.4)
+        assert len(box.drain()) == 0
+
+    def test_full_ring_counts_drops(self):
+        box = FrameMailbox(capacity=4)
+        for i in range(10):
+            box.publish(rms=0.1, flatness=0.0)
+
+        assert len(box.drain()) == 4
+        assert box.dropped_frames == 6
+        assert box.stats()["published"] == 10
+
+    def test_latest_tracks_newest_without_consuming(self):
+        box = FrameMailbox(capacity=2)
+        assert box.latest() is None
+
+        for i in range(6):
+            box.publish(rms=float(i), flatness=0.0)
+
+        # Ring is full, but the fast path still sees the newest frame
+        assert box.latest()["seq"] == 5
+        assert box.latest()["rms"] == 5.0
+        assert len(box) == 2
+
+    def test_stars_accumulate_across_wraparound(self):
+        box = FrameMailbox(star_capacity=10)
+        box.publish(0.2, 0.0, stars=_stars(6))
+        assert len(box.drain_stars()) == 6
+
+        box.publish(0.2, 0.0, stars=_stars(4, base=100))
+        box.publish(0.2, 0.0, stars=_stars(5, base=200))
+        stars = box.drain_stars()
+
+        assert stars[:, 0].tolist() == list(range(100, 104)) + list(range(200, 205))
+        assert box.drain()["stars"].tolist() == [6, 4, 5]
+
+        box.publish(0.2, 0.0, stars=_stars(12))
+        assert len(box.drain_stars()) == 10
+        assert box.dropped_stars == 2
+
+    def test_concurrent_producer_consumer(self):
+        box = FrameMailbox(capacity=16)
+        n = 20000
+        received = []
+
+        def produce():
+            for i in range(n):
+                box.publish(rms=float(i), flatness=0.0)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        while producer.is_alive() or len(box):
+            received.extend(box.drain()["seq"].tolist())
+        producer.join()
+
+        # Every frame is either delivered exactly once, in order, or counted as dropped
+        assert received == sorted(set(received))
+        assert len(received) + box.dropped_frames == n
@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+import sys
+import os
+import json
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.metrics import Histogram, Metrics
+
+class TestHistogram:
+    def test_percentiles_within_bucket_error(self):
+        rng = np.random.default_rng(0)
+        samples = rng.lognormal(mean=1.0, sigma=1.2, size=20000)  # ms
+        hist = Histogram()
+        for ms in samples:
+            hist.record(ms)
+
+        for q in (50, 90, 99, 99.9):
+            assert hist.percentile(q) == pytest.approx(np.percentile(samples, q), rel=0.07)
+        assert hist.count == 20000
+        assert hist.snapshot()["max_ms"] == pytest.approx(samples.max(), abs=1e-3)
+
+    def test_small_values_are_exact(self):
+        hist = Histogram()
+        for us in (3, 7, 7, 20):
+            hist.record_us(us)
+        assert hist.percentile(50) == pytest.approx(0.007)
+        assert hist.percentile(100) == pytest.approx(0.020)
+
+class TestMetrics:
+    def test_timer_decorator_and_counters(self):
+        m = Metrics()
+
+        @m.timed("work")
+        def work():
+            time.sleep(0.01)
+            return 42
+
+        assert work() == 42
+        with m.timer("work"):
+            time.sleep(0.02)
+        m.count("nav_found")
+        m.count("nav_found")
+        m.gauge("depth", lambda: 3)
+
+        snap = m.snapshot()
+        assert snap["latency"]["work"]["count"] == 2
+        assert 10 <= snap["latency"]["work"]["min_ms"] < snap["latency"]["work"]["max_ms"]
+        assert snap["counters"] == {"nav_found": 2}
+        assert snap["gauges"] == {"depth": 3.0}
+
+    def test_dump_json_and_prometheus(self, tmp_path):
+        m = Metrics()
+        m.record("vector_search", 1.5)
+        m.count("nav_void")
+
+        data = json.loads(open(m.dump(str(tmp_path / "m.json"))).read())
+        assert data["latency"]["vector_search"]["p50_ms"] == pytest.approx(1.5, rel=0.07)
+
+        text = open(m.dump(str(tmp_path / "m.prom"))).read()
+        assert 'synesthesia_vector_search_ms{quantile="0.99"}' in text
+        assert "synesthesia_vector_search_ms_count 1" in text
+        assert "synesthesia_nav_void_total 1" in text
@@ -0,0 +1,68 @@
+import pytest
+import sys
+import os
+import json
+import time
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.metrics import metrics
+from services.profiler import SamplingProfiler
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def hot_leaf():
+    _spin(0.002)
+
+@metrics.timed("test_hot_path")
+def hot_path(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        hot_leaf()
+
+def cold_path(seconds):
+    _spin(seconds)
+
+class TestSamplingProfiler:
+    def test_samples_only_target_sections(self, tmp_path):
+        profiler = SamplingProfiler({"hot": hot_path}, interval=0.002)
+        assert profiler.thread is None  # idle: no sampler, nothing wrapped
+
+        profiler.start()
+        threads = [threading.Thread(target=hot_path, args=(0.3,)), threading.Thread(target=cold_path, args=(0.3,))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        profiler.stop()
+
+        assert profiler.samples > 20
+        assert set(profiler.sections) == {"hot"}
+        top = profiler.top(5)
+        assert "_spin" in top[0]["function"]
+        # The (decorated) section root is on every sampled stack
+        root = [row for row in profiler.top(50) if row["function"].startswith("hot_path")]
+        assert not root or root[0]["total_pct"] == pytest.approx(100.0)
+        assert all(line.startswith("hot;hot_path") for line in profiler.folded().splitlines())
+
+        path = profiler.save(str(tmp_path))
+        assert sorted(os.listdir(path)) == ["stacks.folded", "summary.json", "top.txt"]
+        summary = json.load(open(os.path.join(path, "summary.json")))
+        assert summary["samples"] == profiler.samples
+        assert summary["sections"] == {"hot": profiler.samples}
+
+    def test_restart_clears_previous_session(self):
+        profiler = SamplingProfiler({"hot": hot_path}, interval=0.002)
+        profiler.start()
+        hot_path(0.1)
+        profiler.stop()
+        assert profiler.samples > 0
+
+        profiler.start()
+        profiler.stop()
+        assert profiler.samples == 0
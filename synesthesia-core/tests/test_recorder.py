@@ -0,0 +1,178 @@
+import pytest
+import sys
+import os
+import time
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import controller as controller_module
+from services.controller import SystemController, FAILED
+from services.dsp import DSP, SyntheticSource
+from services.recorder import SessionRecorder, read_log, MAGIC, VECTOR, TICK, RESULT, AUDIO, SEARCH
+from services.replay import Replayer
+
+VECTOR_A = {"energy": 0.5, "valence": 0.25, "danceability": 0.75, "acousticness": 0.0, "instrumentalness": 1.0}
+
+def _result(vector):
+    # Deterministic stand-in for a navigation result
+    return {"type": "found", "distance": 0.1, "track": {"spotify_id": f"track-{vector['energy']:.2f}"}}
+
+class FakeController:
+    def __init__(self, dsp=None):
+        self.dsp = dsp
+        self.ticks = []
+        self.searches = []
+
+    def tick(self, vector, debounce=True):
+        self.ticks.append((vector, debounce))
+        return _result(vector)
+
+    def force_search(self, vector):
+        self.ticks.append((vector, "forced"))
+        return _result(vector)
+
+    def handle_search(self, query):
+        self.searches.append(query)
+        return {}
+
+class TestSessionLog:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "session.synrec")
+        recorder = SessionRecorder(path)
+        recorder.vector(VECTOR_A)
+        seq = recorder.tick(VECTOR_A, debounce=False)
+        recorder.result(seq, 1.5, _result(VECTOR_A))
+        forced = recorder.tick(VECTOR_A, debounce=False, forced=True)
+        recorder.result(forced, 2.0, None)
+        block = np.linspace(-1, 1, 512, dtype=np.float32).reshape(-1, 2)
+        recorder.audio(block, 48000)
+        recorder.search("daft punk")
+        recorder.close()
+        recorder.vector(VECTOR_A)  # after close: ignored
+
+        records = list(read_log(path))
+        assert [kind for _, kind, _ in records] == [VECTOR, TICK, RESULT, TICK, RESULT, AUDIO, SEARCH]
+        assert recorder.records == 7 and os.path.getsize(path) == recorder.bytes
+        times = [t for t, _, _ in records]
+        assert times == sorted(times)
+
+        assert records[0][2] == pytest.approx(VECTOR_A)
+        assert records[1][2]["seq"] == 1 and not records[1][2]["debounce"] and not records[1][2]["forced"]
+        assert records[2][2] == {"seq": 1, "ms": 1.5, "result": _result(VECTOR_A)}
+        assert records[3][2]["forced"] and records[4][2]["result"] is None
+        audio = records[5][2]
+        assert audio["sample_rate"] == 48000 and audio["channels"] == 2
+        np.testing.assert_allclose(audio["block"], block, atol=1e-4)
+        assert records[6][2] == "daft punk"
+
+    def test_truncated_tail_is_ignored(self, tmp_path):
+        path = str(tmp_path / "crash.synrec")
+        recorder = SessionRecorder(path)
+        for _ in range(3):
+            recorder.vector(VECTOR_A)
+        recorder.close()
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 5)
+        assert len(list(read_log(path))) == 2
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a log" + MAGIC)
+        with pytest.raises(ValueError):
+            list(read_log(str(path)))
+
+class TestControllerRecording:
+    def test_ticks_searches_and_audio_are_recorded(self, tmp_path):
+        with patch.object(controller_module, "VectorEngine"), patch.object(controller_module, "SpotifyClient"):
+            controller = SystemController()
+            controller.start(services=("vector", "spotify"))
+            assert controller.wait_ready("vector", "spotify", "navigation", timeout=2.0)
+        assert controller.status["audio"] == FAILED and controller.errors["audio"] == "disabled"
+        controller.nav = MagicMock()
+        controller.nav.tick.side_effect = lambda vector, debounce: _result(vector)
+        controller.nav.force_search.return_value = None
+
+        path = str(tmp_path / "live.synrec")
+        controller.start_recording(path)
+        assert controller.dsp.recorder is controller.recorder
+        controller.record_vector(VECTOR_A)
+        controller.tick(VECTOR_A, debounce=False)
+        controller.force_search(VECTOR_A)
+        controller.dsp.running = True
+        controller.dsp.audio_callback(np.zeros((256, 1), dtype=np.float32), 256, None, None)
+        assert controller.stop_recording() == path
+        assert controller.dsp.recorder is None
+        controller.tick(VECTOR_A)  # not recorded any more
+
+        kinds = [kind for _, kind, _ in read_log(path)]
+        assert kinds == [VECTOR, TICK, RESULT, TICK, RESULT, AUDIO]
+        results = [payload for _, kind, payload in read_log(path) if kind == RESULT]
+        assert results[0]["result"] == _result(VECTOR_A) and results[0]["ms"] >= 0
+        assert results[1]["result"] is None
+
+@pytest.fixture
+def python_fallback():
+    # rust core is not built in the test env; use DSP's Python fallback path
+    with patch('services.dsp.StreamAnalyzer', None), patch('services.dsp.Resampler', None), \
+            patch('services.dsp.audio_fingerprint_array', None):
+        yield
+
+@pytest.mark.usefixtures("python_fallback")
+class TestReplay:
+    def _record(self, path, seconds=1.0, ticks=5):
+        recorder = SessionRecorder(path)
+        dsp = DSP()
+        dsp.recorder = recorder
+        dsp.run_source(SyntheticSource(realtime=False, seconds=seconds))
+        for i in range(ticks):
+            vector = dict(VECTOR_A, energy=i / 10)
+            seq = recorder.tick(vector, debounce=False)
+            recorder.result(seq, 0.5, _result(vector) if i % 2 else {"type": "void"})
+        recorder.search("query")
+        recorder.close()
+
+    def test_replay_at_max_speed(self, tmp_path):
+        path = str(tmp_path / "session.synrec")
+        self._record(path)
+
+        dsp = DSP()
+        frames = []
+        dsp.on_features = frames.append
+        controller = FakeController(dsp)
+        report = Replayer(controller, speed=None).run(path)
+
+        assert report["records"]["audio"] > 0 and report["records"]["tick"] == 5
+        assert report["audio_s"] == pytest.approx(1.0, rel=0.05)
+        assert frames  # the recorded audio went through the DSP again
+        assert [debounce for _, debounce in controller.ticks] == [False] * 5
+        assert controller.searches == ["query"]
+        assert set(report["latency"]) >= {"tick", "recorded_tick", "search", "dsp_block"}
+        assert report["agreement"] == {"compared": 5, "same_type": 2, "same_track": 2}
+
+    def test_vectors_drive_logs_without_ticks(self, tmp_path):
+        path = str(tmp_path / "ui.synrec")
+        recorder = SessionRecorder(path)
+        for i in range(3):
+            recorder.vector(dict(VECTOR_A, energy=i / 10))
+        recorder.close()
+
+        controller = FakeController()
+        report = Replayer(controller, speed=None, searches=False).run(path)
+        assert [debounce for _, debounce in controller.ticks] == [True] * 3
+        assert report["agreement"]["compared"] == 0
+
+    def test_replay_keeps_recorded_schedule(self, tmp_path):
+        path = str(tmp_path / "paced.synrec")
+        recorder = SessionRecorder(path)
+        recorder.vector(VECTOR_A)
+        time.sleep(0.3)
+        recorder.vector(VECTOR_A)
+        recorder.close()
+
+        started = time.perf_counter()
+        report = Replayer(FakeController(), speed=2.0).run(path)
+        assert 0.13 < time.perf_counter() - started < 0.5
+        assert report["recorded_s"] >= 0.3
@@ -0,0 +1,59 @@
+import pytest
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.scheduler import FrameScheduler
+
+@pytest.fixture
+def scheduler():
+    # Frames are driven by hand; no app timer
+    sched = FrameScheduler(SimpleNamespace(workers=[]), fps=100.0)
+    sched._expected = time.perf_counter() + sched.period
+    return sched
+
+def _run_frames(sched, n):
+    for _ in range(n):
+        time.sleep(sched.period)
+        sched._frame()
+
+class TestFrameScheduler:
+    def test_cheap_frames_run_tasks_at_full_rate(self, scheduler):
+        calls = []
+        scheduler.add("viz", lambda: calls.append(1), hz=50, min_hz=5)
+
+        _run_frames(scheduler, 20)
+
+        assert scheduler.scale == 1.0
+        assert scheduler.rate(scheduler.tasks["viz"]) == 50
+        assert 7 <= len(calls) <= 11
+
+    def test_expensive_frames_throttle_visuals_not_navigation(self, scheduler):
+        scheduler.add("viz", lambda: time.sleep(0.02), hz=50, min_hz=5)
+        scheduler.add("nav", lambda: None, hz=50)
+
+        _run_frames(scheduler, 30)
+
+        assert scheduler.rate(scheduler.tasks["viz"]) < 50
+        assert scheduler.rate(scheduler.tasks["nav"]) == 50
+        assert scheduler.tasks["nav"].runs > scheduler.tasks["viz"].runs
+
+    def test_priority_job_drops_visuals_to_floor(self, scheduler):
+        viz = scheduler.add("viz", lambda: None, hz=50, min_hz=5)
+
+        scheduler.begin_priority()
+        assert scheduler.rate(viz) == 5
+        scheduler.end_priority()
+        assert scheduler.rate(viz) == 50
+
+    def test_blocked_loop_counts_dropped_frames(self, scheduler):
+        _run_frames(scheduler, 2)
+        time.sleep(scheduler.period * 6)
+        scheduler._frame()
+
+        assert scheduler.dropped_frames >= 4
+        assert "dropped" in scheduler.overlay_text()
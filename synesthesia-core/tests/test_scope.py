@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mailbox import FrameMailbox
+from ui.widgets.scope import Constellation, RingHistory, Scope
+
+@pytest.fixture
+def constellation():
+    # Rendering needs a running app; capture the text instead
+    with patch.object(Constellation, "update") as update:
+        widget = Constellation()
+        widget.rendered = update
+        yield widget
+
+class TestConstellation:
+    def test_star_moves_left_and_fades(self, constellation):
+        constellation.update_stars(np.array([[600, 3]]), 0.1)
+        assert constellation._rows[2][58] == "+"
+
+        for _ in range(5):
+            constellation.update_stars(np.empty((0, 2)), 0.1)
+        assert constellation._rows[2][53] == "*"
+
+        for _ in range(14):
+            constellation.update_stars(np.empty((0, 2)), 0.1)
+        assert constellation.count == 0
+        assert constellation._rows[2] == " " * Constellation.WIDTH
+
+    def test_hash_bursts_stay_bounded(self, constellation):
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            constellation.update_stars(rng.integers(0, 4096, size=(2000, 2)), 0.1)
+
+        # One star per row per frame, each living < 20 frames
+        assert constellation.count <= Constellation.HEIGHT * 20
+
+    def test_unchanged_frame_is_not_re_rendered(self, constellation):
+        constellation.update_stars(np.array([[0, 1]]), 0.1)
+        renders = constellation.rendered.call_count
+
+        # Star is culled after 20 frames; afterwards every frame is blank
+        for _ in range(30):
+            constellation.update_stars(np.empty((0, 2)), 0.1)
+        blank = constellation.rendered.call_count
+        for _ in range(10):
+            constellation.update_stars(np.empty((0, 2)), 0.1)
+
+        assert blank > renders
+        assert constellation.rendered.call_count == blank
+
+class TestRingHistory:
+    def test_keeps_latest_points_in_order(self):
+        history = RingHistory(points=4)
+        history.push(np.arange(1, 7))
+
+        assert history.data() == [3.0, 4.0, 5.0, 6.0]
+        assert history.version == 6
+
+    def test_min_max_decimation_keeps_peaks(self):
+        history = RingHistory(points=3, decimate=10)
+        signal = np.full(30, 0.2)
+        signal[13] = 0.9  # one-frame transient
+        signal[25] = 0.0
+
+        history.push(signal[:25])
+        # Only completed buckets are visible; the partial one does not bump the version
+        assert history.version == 2
+
+        history.push(signal[25:])
+        # One value per bucket: peaks in the upper envelope, dips in the lower
+        assert history.data() == pytest.approx([0.2, 0.9, 0.2])
+        assert history.floor() == pytest.approx([0.2, 0.2, 0.0])
+        assert history.version == 3
+
+class TestScope:
+    def test_rms_history_is_frame_by_frame_unless_asked(self):
+        scope = Scope(FrameMailbox(), frame_rate=20.0)
+        assert scope.rms_history.decimate == 1 and scope.rms_history.points == 60
+
+        minutes = Scope(FrameMailbox(), frame_rate=20.0, rms_seconds=120.0)
+        assert minutes.rms_history.decimate == 40
+        assert minutes.flatness_history.decimate == 1
+
+    def test_decimated_rms_is_drawn_as_an_envelope(self):
+        mailbox = FrameMailbox()
+        scope = Scope(mailbox, frame_rate=1.0, rms_seconds=120.0)
+        assert scope.rms_history.decimate == 2
+        # Stand-ins for the mounted widgets
+        scope.constellation = Constellation()
+        scope.constellation.update = lambda *_: None
+        scope.rms_sparkline, scope.rms_floor_sparkline, scope.flatness_sparkline = (
+            type("Line", (), {"id": name, "data": None})() for name in ("rms", "rms-floor", "flatness"))
+
+        for rms in (0.5, 0.1, 0.4, 0.3):
+            mailbox.publish(rms, 0.2, 0.0, 0.0, 0.0, 0.0, 0.0)
+        scope.update_scope()
+
+        assert scope.rms_sparkline.data[-2:] == pytest.approx([0.5, 0.4])
+        assert scope.rms_floor_sparkline.data[-2:] == pytest.approx([0.1, 0.3])
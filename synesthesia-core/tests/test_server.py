@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+import sys
+import os
+import time
+import asyncio
+import httpx
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.server import create_app, SearchBatcher
+
+CATALOG = {
+    "quiet": np.array([0.1, 0.5, 0.5, 0.9, 0.0], dtype=np.float32),
+    "loud": np.array([0.9, 0.5, 0.5, 0.1, 0.0], dtype=np.float32),
+}
+
+class FakeIndex:
+    """Shared index: nearest catalog entry per row, one 'round-trip' per batch."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batch_sizes = []
+
+    def search_batch(self, vectors, k=5):
+        self.batch_sizes.append(len(vectors))
+        time.sleep(self.delay)
+        results = []
+        for vector in vectors:
+            track_id = min(CATALOG, key=lambda t: np.linalg.norm(CATALOG[t] - vector))
+            results.append([{"id": track_id, "payload": {"spotify_id": track_id}, "vector": CATALOG[track_id].tolist()}])
+        return results
+
+def _vector(energy, acousticness):
+    return {"energy": energy, "valence": 0.5, "danceability": 0.5,
+            "acousticness": acousticness, "instrumentalness": 0.0}
+
+def test_session_lifecycle():
+    spotify = MagicMock()
+    client = TestClient(create_app(FakeIndex(), spotify))
+
+    sid = client.post("/sessions", json={"playback": True}).json()["session_id"]
+    result = client.post(f"/sessions/{sid}/tick", json=_vector(0.1, 0.9)).json()
+    assert result["type"] == "found" and result["track"]["spotify_id"] == "quiet"
+
+    # Debounced: the next change inside debounce_ms does not search
+    assert client.post(f"/sessions/{sid}/tick", json=_vector(0.9, 0.1)).json() == {"type": "idle"}
+    assert client.post(f"/sessions/{sid}/search", json=_vector(0.9, 0.1)).json()["track"]["spotify_id"] == "loud"
+
+    state = client.get(f"/sessions/{sid}").json()
+    assert state["current_track_id"] == "loud" and state["switches"] == 2
+    assert client.delete(f"/sessions/{sid}").status_code == 200
+    assert client.get(f"/sessions/{sid}").status_code == 404
+
+    # Playback goes through the one shared client, off the event loop
+    deadline = time.time() + 1.0
+    while spotify.play_track.call_count < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert [c.args[0] for c in spotify.play_track.call_args_list] == ["quiet", "loud"]
+
+@pytest.mark.asyncio
+async def test_concurrent_sessions_share_batched_queries():
+    index = FakeIndex(delay=0.02)
+    app = create_app(index, MagicMock(), SearchBatcher(index, workers=1))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        sids = [(await client.post("/sessions")).json()["session_id"] for _ in range(60)]
+
+        async def tick(i, sid):
+            vector = _vector(0.1, 0.9) if i % 2 else _vector(0.9, 0.1)
+            return (await client.post(f"/sessions/{sid}/tick", json=vector)).json()
+
+        results = await asyncio.gather(*(tick(i, sid) for i, sid in enumerate(sids)))
+        stats = (await client.get("/stats")).json()
+
+    assert [r["track"]["spotify_id"] for r in results] == ["loud" if i % 2 == 0 else "quiet" for i in range(60)]
+    assert sum(index.batch_sizes) == 60
+    assert len(index.batch_sizes) <= 5
+    assert stats["sessions"] == 60 and stats["batcher"]["largest_batch"] == max(index.batch_sizes)
@@ -0,0 +1,101 @@
+import pytest
+import numpy as np
+import sys
+import os
+import asyncio
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mailbox import FrameMailbox
+from services.stream import (StreamHub, decode, encode_features, encode_nav, encode_stars,
+                             KIND_FEATURES, KIND_STARS, KIND_NAV, HEADER, WIRE_FRAME_DTYPE)
+from services.server import create_app
+from test_server import FakeIndex, _vector
+
+def _frames(n):
+    box = FrameMailbox()
+    for i in range(n):
+        box.publish(rms=0.1 * i, flatness=0.2, bpm=120.0, stars=np.array([[i, 3]], dtype=np.uint16))
+    return box
+
+class TestWireFormat:
+    def test_round_trip(self):
+        box = _frames(3)
+        frames = box.drain()
+
+        message = encode_features(frames)
+        assert len(message) == HEADER.size + 3 * WIRE_FRAME_DTYPE.itemsize
+        kind, seq, wire = decode(message)
+        assert kind == KIND_FEATURES and seq == 2
+        assert wire["rms"] == pytest.approx([0.0, 0.1, 0.2])
+        assert list(wire["stars"]) == [1, 1, 1]
+
+        kind, seq, stars = decode(encode_stars(box.drain_stars(), seq))
+        assert kind == KIND_STARS and stars.tolist() == [[0, 3], [1, 3], [2, 3]]
+
+        kind, seq, nav = decode(encode_nav({"type": "found", "distance": 0.25, "track": {"title": "Ünïcode"}}, 7))
+        assert (kind, seq) == (KIND_NAV, 7)
+        assert nav == {"type": "found", "distance": 0.25, "track": {"title": "Ünïcode"}}
+
+@pytest.mark.asyncio
+async def test_slow_client_drops_frames_never_nav():
+    hub = StreamHub(max_pending=4)
+    fast = hub.subscribe()
+    slow = hub.subscribe()
+    box = _frames(0)
+
+    for i in range(50):
+        box.publish(rms=0.5, flatness=0.1)
+        hub.publish_frames(box.drain(), box.drain_stars())
+        if i % 10 == 0:
+            hub.publish_nav({"type": "found", "distance": i, "track": {}})
+        await fast.next()  # the fast client keeps up
+        while fast.nav_queue or fast.viz_queue:
+            await fast.next()
+
+    assert fast.dropped == 0
+    # The slow client never read: only the newest frames are left, every nav event is kept
+    assert slow.dropped == 46
+    messages = [decode(await slow.next()) for _ in range(9)]
+    assert [kind for kind, *_ in messages] == [KIND_NAV] * 5 + [KIND_FEATURES] * 4
+    # Nothing left pending, and the last frame delivered is the newest published
+    assert not slow.viz_queue and not slow.nav_queue
+    assert messages[-1][1] == 49
+
+@pytest.mark.asyncio
+async def test_stalled_client_nav_backlog_is_bounded():
+    hub = StreamHub(max_nav=100)
+    stalled = hub.subscribe()
+
+    for i in range(250):
+        hub.publish_nav({"type": "void"}, session_id=f"s{i % 7}")
+
+    assert len(stalled.nav_queue) == 100
+    assert stalled.dropped_nav == 150 and hub.stats()["dropped_nav"] == 150
+    # The oldest were dropped; the seq gap tells the client
+    assert decode(await stalled.next())[1] == 151
+
+def test_websocket_streams_frames_and_session_results():
+    dsp = MagicMock()
+    dsp.mailbox = FrameMailbox()
+    client = TestClient(create_app(FakeIndex(), MagicMock(), dsp=dsp))
+
+    with client:
+        sid = client.post("/sessions").json()["session_id"]
+        with client.websocket_connect(f"/stream?session={sid}") as ws:
+            for i in range(5):
+                dsp.mailbox.publish(rms=0.1, flatness=0.2, stars=np.array([[i, 3]], dtype=np.uint16))
+            frames, stars = 0, 0
+            while frames < 5 or stars < 5:
+                kind, _, payload = decode(ws.receive_bytes())
+                frames += len(payload) if kind == KIND_FEATURES else 0
+                stars += len(payload) if kind == KIND_STARS else 0
+            assert (frames, stars) == (5, 5)
+
+            client.post(f"/sessions/{sid}/tick", json=_vector(0.9, 0.1))
+            kind, _, nav = decode(ws.receive_bytes())
+            assert kind == KIND_NAV and nav["track"]["spotify_id"] == "loud"
+        assert dsp.start.called
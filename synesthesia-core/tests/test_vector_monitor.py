@@ -0,0 +1,50 @@
+import pytest
+import sys
+import os
+from textual.app import App
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.widgets.vector_monitor import VectorMonitor
+
+class MonitorApp(App):
+    def __init__(self):
+        super().__init__()
+        self.changes = []
+
+    def compose(self):
+        yield VectorMonitor(id="vector-monitor")
+
+    def on_vector_monitor_vector_changed(self, event):
+        self.changes.append(event.vector)
+
+@pytest.mark.asyncio
+async def test_set_vector_emits_one_change():
+    app = MonitorApp()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        app.changes.clear()
+        vm = app.query_one(VectorMonitor)
+
+        vm.set_vector([0.1, 0.2, 0.3, 0.4, 0.5])
+        await pilot.pause()
+
+        assert len(app.changes) == 1
+        assert app.changes[0]["acousticness"] == pytest.approx(0.4)
+        assert vm.bars["energy"].progress == pytest.approx(0.1)
+
+@pytest.mark.asyncio
+async def test_key_repeats_within_a_frame_collapse():
+    app = MonitorApp()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        vm = app.query_one(VectorMonitor)
+        app.changes.clear()
+
+        for _ in range(6):
+            vm.action_increase()
+        await pilot.pause()
+
+        assert len(app.changes) == 1
+        assert app.changes[0]["energy"] == pytest.approx(0.8)
@@ -7,16 +7,22 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from textual.app import App, ComposeResult
 from textual.containers import Container, Vertical
 
-from textual.widgets import Header, Footer, Input
+from textual.widgets import Header, Footer, Input, Static
 import threading
 import asyncio
+import collections
+import time
+from typing import Optional
 
 from ui.widgets.scope import Scope
 from ui.widgets.vector_monitor import VectorMonitor
 from ui.widgets.log import Log
 from ui.widgets.track_info import TrackInfo
+from ui.widgets.stats import StatsPanel, ProfilePanel
+from ui.scheduler import FrameScheduler
 
-from services.controller import SystemController
+from services.controller import SystemController, READY, FAILED
+from services.metrics import metrics
 
 from textual import work
 
@@ -27,32 +33,68 @@ class SynesthesiaApp(App):
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("m", "toggle_mic", "Toggle Mic"),
+        ("a", "toggle_autopilot", "Autopilot"),
+        ("f", "toggle_frame_stats", "Frame Stats"),
+        ("s", "toggle_stats", "Stage Stats"),
+        ("d", "dump_metrics", "Dump Metrics"),
+        ("p", "toggle_profiler", "Profile"),
+        ("r", "toggle_recording", "Record"),
         ("/", "focus_search", "Focus Search"),
         ("enter", "search", "Search"),
         ("tab", "focus_next", "Next Panel"),
     ]
 
+    # Navigation runs on VectorChanged (one per frame at most; this is the only
+    # debounce), trailing edge: once the vector has been still for
+    # NAV_DEBOUNCE, or at least every NAV_MAX_WAIT during a long sweep
+    NAV_DEBOUNCE = 0.15
+    NAV_MAX_WAIT = 0.6
+
+    # Panels that stay dimmed until the service behind them is ready
+    SERVICE_PANELS = {
+        "audio": ("#scope",),
+        "spotify": ("#search-input",),
+        "navigation": ("#vector-monitor", "#track-info"),
+    }
+    STATUS_GLYPHS = {"pending": "·", "starting": "…", READY: "✓", FAILED: "✗"}
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.launched_at = time.perf_counter()
+        self.first_frame_ms: Optional[float] = None
+
+        # Debounce state and change -> result latency (ms)
+        self._sweep_started: Optional[float] = None
+        self._last_change: Optional[float] = None
+        self.nav_latency_ms = collections.deque(maxlen=200)
+        self.nav_search_ms = collections.deque(maxlen=200)
+
+        # Single owner of all periodic UI work
+        self.scheduler = FrameScheduler(self)
         
-        # Initialize System Controller
+        # Cheap to build; services start in on_mount, after the first frame is queued
         self.controller = SystemController()
-        self.controller.start()
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
+        yield Static("", id="frame-stats")
+        yield StatsPanel(id="stats")
+        yield ProfilePanel(id="profile")
         
         # Top Row
         with Container(id="top-row"):
-            # Access DSP queue via controller
-            yield Scope(self.controller.dsp.queue, id="scope")
+            # Access DSP mailbox via controller
+            dsp = self.controller.dsp
+            rms_seconds = os.getenv("SYN_RMS_SECONDS")
+            yield Scope(dsp.mailbox, frame_rate=dsp.sample_rate / dsp.block_size,
+                        rms_seconds=float(rms_seconds) if rms_seconds else None, id="scope")
             with Vertical(id="monitor-column"):
                 yield Input(placeholder="Search Spotify...", id="search-input")
                 yield VectorMonitor(id="vector-monitor")
             
         # Bottom Row
         with Container(id="bottom-row"):
-            yield Log(id="log")
+            yield Log(spill_path=os.getenv("SYN_LOG_FILE"), id="log")
             yield TrackInfo(id="track-info")
             
         yield Footer()
@@ -71,44 +113,94 @@ class SynesthesiaApp(App):
         # Start Ark Ingestion in background
         self.log_widget = self.query_one("#log", Log)
         self.log_widget.log_info("Initializing Synesthesia Core...")
-        
-        # Define callback to update log from thread
-        def log_callback(msg):
-            self.call_from_thread(self.log_widget.log_info, msg)
+        self.call_after_refresh(self._first_frame)
 
-        # Start Ingestion via Controller
-        self.controller.handle_ingest(callback=log_callback)
-        
-        # Start Game Loop (10Hz)
-        self.set_interval(0.1, self.game_loop)
+        # Bring services up concurrently; panels light up as each reports ready
+        for selectors in self.SERVICE_PANELS.values():
+            for selector in selectors:
+                self.query_one(selector).add_class("pending")
+        self.controller.on_status = self._on_service_status
+        self.controller.start()
 
-    def game_loop(self):
-        # Prevent lock contention during ingestion
-        if self.controller.ingesting:
-            return
+        # Start Ingestion via Controller (the log is thread-safe and batched per frame)
+        self.controller.handle_ingest(callback=lambda msg: self.log_widget.log_info(msg, progress=True))
+
+        # Periodic work: visualization degrades under load, the overlay is cheap and fixed
+        self.scheduler.add("scope", self.query_one("#scope", Scope).update_scope, hz=20, min_hz=4)
+        self.scheduler.add("log", self.log_widget.flush, hz=10, min_hz=2)
+        self.scheduler.add("overlay", self._update_frame_stats, hz=2)
+        self.scheduler.add("stats", self._update_stats, hz=2)
+        self.scheduler.add("profile", self._update_profile, hz=1)
+        self.scheduler.start()
+
+    def _first_frame(self):
+        self.first_frame_ms = (time.perf_counter() - self.launched_at) * 1000
+        self.log_widget.log_info(f"First frame in {self.first_frame_ms:.0f} ms")
 
-        # Pause game loop if user is typing
+    def _on_service_status(self, name: str, state: str):
+        # Called on the controller's init threads
         try:
-            if self.query_one("#search-input", Input).has_focus:
-                return
-        except:
-            pass
+            self.call_from_thread(self._show_service_status, name, state)
+        except RuntimeError:
+            pass  # app already closed
 
-        # Get current vector from Monitor
-        vm = self.query_one("#vector-monitor", VectorMonitor)
-        current_vector = vm.get_vector()
-        
-        # Offload logic to worker
-        self.run_game_tick(current_vector)
+    def _show_service_status(self, name: str, state: str):
+        status = self.controller.status
+        self.sub_title = "  ".join(f"{n} {self.STATUS_GLYPHS.get(s, s)}" for n, s in status.items())
 
-    @work(exclusive=True, thread=True)
-    def run_game_tick(self, current_vector):
-        # Tick Controller (Blocking)
-        result = self.controller.tick(current_vector)
-        
+        for selector in self.SERVICE_PANELS.get(name, ()):
+            panel = self.query_one(selector)
+            panel.set_class(state not in (READY, FAILED), "pending")
+            panel.set_class(state == FAILED, "failed")
+
+        if state == READY:
+            self.log_widget.log_info(f"{name} ready ({self.controller.init_ms[name]:.0f} ms)")
+        elif state == FAILED:
+            self.log_widget.log_error(f"{name} unavailable: {self.controller.errors.get(name, '')}")
+
+    def on_vector_monitor_vector_changed(self, event: VectorMonitor.VectorChanged):
+        self.controller.record_vector(event.vector)
+        # Audio is steering; the pilot ticks navigation itself
+        if self.controller.pilot.running:
+            return
+
+        now = time.perf_counter()
+        self._last_change = now
+        if self._sweep_started is None:
+            self._sweep_started = now
+        self.debounce_navigation(event.vector)
+
+    @work(exclusive=True, group="nav-debounce")
+    async def debounce_navigation(self, current_vector):
+        # Each new change cancels this worker and starts a fresh wait
+        deadline = self._sweep_started + self.NAV_MAX_WAIT
+        await asyncio.sleep(max(0.0, min(self.NAV_DEBOUNCE, deadline - time.perf_counter())))
+
+        # Prevent lock contention during ingestion: hold the search until it ends
+        while self.controller.ingesting:
+            await asyncio.sleep(0.5)
+
+        self._sweep_started = None
+        self.run_nav_tick(current_vector, self._last_change)
+
+    @work(exclusive=True, thread=True, group="nav")
+    def run_nav_tick(self, current_vector, changed_at):
+        # Tick Controller (Blocking); the UI already debounced the change.
+        # Visuals run at their floor rate until the search is done.
+        self.scheduler.begin_priority()
+        started = time.perf_counter()
+        try:
+            result = self.controller.tick(current_vector, debounce=False)
+        finally:
+            self.scheduler.end_priority()
+        finished = time.perf_counter()
+
+        self.nav_search_ms.append((finished - started) * 1000)
         if result:
+            self.nav_latency_ms.append((finished - changed_at) * 1000)
             self.call_from_thread(self._handle_nav_result, result)
 
+    @metrics.timed("ui_result")
     def _handle_nav_result(self, result):
         try:
             if result['type'] == 'found':
@@ -117,11 +209,77 @@ class SynesthesiaApp(App):
                 self.query_one("#track-info", TrackInfo).update_track(track, result.get('distance', 0.0))
             elif result['type'] == 'void':
                 self.log_widget.log_void()
+            elif result['type'] == 'held':
+                # Hysteresis kept the playing track; repeats collapse into one line
+                candidate = result.get('candidate') or {}
+                self.log_widget.log_info(
+                    f"Holding current track (nearest: {candidate.get('artist')} - {candidate.get('title')})")
         except Exception as e:
             self.log_widget.log_error(f"UI Error: {e}")
 
+    def _update_frame_stats(self):
+        overlay = self.query_one("#frame-stats", Static)
+        if overlay.has_class("visible"):
+            text = self.scheduler.overlay_text()
+            if self.nav_latency_ms:
+                text += f" | nav {self.nav_latency_ms[-1]:.0f}ms"
+            if self.controller.ingesting:
+                text += " | ingesting"
+            if self.first_frame_ms is not None:
+                text += f" | first frame {self.first_frame_ms:.0f}ms"
+            overlay.update(text)
+
+    def action_toggle_frame_stats(self):
+        self.query_one("#frame-stats", Static).toggle_class("visible")
+        self._update_frame_stats()
+
+    def _update_stats(self):
+        panel = self.query_one("#stats", StatsPanel)
+        if panel.has_class("visible"):
+            panel.show(metrics.snapshot())
+
+    def action_toggle_stats(self):
+        self.query_one("#stats", StatsPanel).toggle_class("visible")
+        self._update_stats()
+
+    def _update_profile(self, path: str = ""):
+        panel = self.query_one("#profile", ProfilePanel)
+        profiler = self.controller.profiler
+        if panel.has_class("visible") and (profiler.running or path):
+            panel.show(profiler.summary(n=15), profiler.running, path)
+
+    def action_toggle_profiler(self):
+        # p: start -> p: stop, save and show the result -> p: dismiss
+        panel = self.query_one("#profile", ProfilePanel)
+        if self.controller.profiler.running:
+            path = self.controller.stop_profiling()
+            self._update_profile(path)
+            self.notify(f"Profile written to {path}")
+        elif panel.has_class("visible"):
+            panel.remove_class("visible")
+        else:
+            self.controller.start_profiling()
+            panel.add_class("visible")
+            self._update_profile()
+
+    def action_toggle_recording(self):
+        if self.controller.recorder:
+            path = self.controller.stop_recording()
+            self.notify(f"Session recorded to {path}")
+        else:
+            recorder = self.controller.start_recording()
+            self.notify(f"Recording to {recorder.path}")
+
+    def action_dump_metrics(self):
+        path = metrics.dump(os.getenv("SYN_METRICS_FILE", "metrics.json"))
+        self.notify(f"Metrics written to {path}")
+
     def on_unmount(self):
+        self.scheduler.stop()
         self.controller.stop()
+        # Snapshot of the whole session, if asked for
+        if os.getenv("SYN_METRICS_FILE"):
+            metrics.dump(os.getenv("SYN_METRICS_FILE"))
 
     def action_toggle_mic(self):
         if self.controller.dsp.running:
@@ -131,6 +289,29 @@ class SynesthesiaApp(App):
             self.controller.dsp.start()
             self.notify("Mic Started")
 
+    def action_toggle_autopilot(self):
+        if self.controller.pilot.running:
+            report = self.controller.stop_autopilot()
+            self.log_widget.log_info(
+                f"Autopilot off: {report['ticks']} ticks, {report['switches']} switches, "
+                f"{report['holds']} held, switch latency p50 {report['switch_latency_ms_p50']:.0f} ms "
+                f"({report['over_budget']} over {report['budget_ms']:.0f} ms budget)"
+            )
+            self.notify("Autopilot Off")
+            return
+
+        vm = self.query_one("#vector-monitor", VectorMonitor)
+
+        def on_result(result):
+            target = self.controller.pilot.target
+            self.call_from_thread(self.update_monitor, dict(target))
+            self.call_from_thread(self._handle_nav_result, result)
+
+        if not self.controller.start_autopilot(vm.get_vector(), callback=on_result):
+            self.notify("Navigation not ready")
+            return
+        self.notify("Autopilot On (audio steers)")
+
     def on_input_submitted(self, event: Input.Submitted):
         """Handle search input submission."""
         query = event.value
@@ -142,13 +323,13 @@ class SynesthesiaApp(App):
 
     @work(exclusive=True, thread=True)
     def run_text_search(self, query: str):
-        self.call_from_thread(self.log_widget.log_info, f"Searching Spotify: {query}...")
+        self.log_widget.log_search(query)
         
         # Search via Controller
         result = self.controller.handle_search(query)
         
         if "error" in result:
-            self.call_from_thread(self.log_widget.log_info, result["error"])
+            self.log_widget.log_info(result["error"])
             return
 
         # Handle Success
@@ -170,17 +351,13 @@ class SynesthesiaApp(App):
         
         # Update Monitor
         self.call_from_thread(self.update_monitor, vector)
-        self.call_from_thread(self.log_widget.log_found, f"{metadata.get('artist')} - {metadata.get('title')}")
+        self.log_widget.log_found(f"{metadata.get('artist')} - {metadata.get('title')}")
         self.call_from_thread(self.query_one("#track-info", TrackInfo).update_track, metadata, 0.0)
 
     def update_monitor(self, vector):
         vm = self.query_one("#vector-monitor", VectorMonitor)
-        # Update reactive values
-        vm.energy = float(vector[0])
-        vm.valence = float(vector[1])
-        vm.danceability = float(vector[2])
-        vm.acousticness = float(vector[3])
-        vm.instrumentalness = float(vector[4])
+        # One batched update (single VectorChanged) for all five dimensions
+        vm.set_vector(vector)
 
     def action_focus_search(self):
         """Focus the search input."""
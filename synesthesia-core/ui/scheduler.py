@@ -0,0 +1,164 @@
+import time
+import threading
+from typing import Callable, Dict, List, Optional
+
+from textual.worker import WorkerState
+
+class Task:
+    """One periodic job. min_hz == hz means it is never throttled."""
+
+    def __init__(self, name: str, callback: Callable[[], None], hz: float, min_hz: float):
+        self.name = name
+        self.callback = callback
+        self.hz = hz
+        self.min_hz = min_hz
+        self.next_run = 0.0
+        self.runs = 0
+        self.skipped = 0
+        self.cost_ms = 0.0
+
+    @property
+    def degradable(self) -> bool:
+        return self.min_hz < self.hz
+
+class FrameScheduler:
+    """
+    Owns all periodic TUI work behind one frame timer.
+
+    Every frame it runs the tasks that are due and measures what that cost,
+    plus how late the frame itself fired (event-loop lag, which includes
+    Textual's own rendering). When either eats into the frame budget,
+    degradable tasks (visualization) are slowed down step by step towards
+    their min_hz; they speed back up once frames are cheap again.
+    Non-degradable tasks always run at their rate, and while a priority
+    job (navigation search) is in flight visuals drop straight to min_hz.
+    """
+
+    def __init__(self, app, fps: float = 30.0, budget: float = 0.5):
+        self.app = app
+        self.fps = fps
+        self.period = 1.0 / fps
+        # Fraction of a frame our own work and loop lag may use before throttling
+        self.budget_ms = self.period * budget * 1000
+        self.tasks: Dict[str, Task] = {}
+        self.scale = 1.0
+        self.timer = None
+
+        self._priority = 0
+        self._priority_lock = threading.Lock()
+        self._expected = 0.0
+
+        # Stats for the overlay
+        self.frames = 0
+        self.dropped_frames = 0
+        self.frame_ms = 0.0
+        self.frame_ms_max = 0.0
+        self.lag_ms = 0.0
+        self._window_max = 0.0
+        self._window_start = 0.0
+
+    def add(self, name: str, callback: Callable[[], None], hz: float, min_hz: Optional[float] = None) -> Task:
+        task = Task(name, callback, hz, hz if min_hz is None else min_hz)
+        self.tasks[name] = task
+        return task
+
+    def remove(self, name: str):
+        self.tasks.pop(name, None)
+
+    def start(self):
+        now = time.perf_counter()
+        self._expected = now + self.period
+        self._window_start = now
+        self.timer = self.app.set_interval(self.period, self._frame)
+
+    def stop(self):
+        if self.timer:
+            self.timer.stop()
+            self.timer = None
+
+    def begin_priority(self):
+        """A priority job started (e.g. a navigation search); visuals yield until it ends."""
+        with self._priority_lock:
+            self._priority += 1
+
+    def end_priority(self):
+        with self._priority_lock:
+            self._priority = max(0, self._priority - 1)
+
+    def rate(self, task: Task) -> float:
+        if not task.degradable:
+            return task.hz
+        if self._priority:
+            return task.min_hz
+        return max(task.min_hz, task.hz * self.scale)
+
+    def _frame(self):
+        started = time.perf_counter()
+
+        # Frames that should have happened while the loop was blocked
+        lag = started - self._expected
+        if lag > self.period:
+            self.dropped_frames += int(lag / self.period)
+        self._expected = started + self.period
+
+        for task in list(self.tasks.values()):
+            if started < task.next_run:
+                continue
+            interval = 1.0 / self.rate(task)
+            if task.next_run and started - task.next_run > interval:
+                # Fell behind: count the missed runs, don't try to catch up
+                task.skipped += int((started - task.next_run) / interval)
+                task.next_run = started + interval
+            else:
+                task.next_run = (task.next_run or started) + interval
+
+            t0 = time.perf_counter()
+            try:
+                task.callback()
+            except Exception:
+                pass
+            task.runs += 1
+            task.cost_ms += 0.2 * ((time.perf_counter() - t0) * 1000 - task.cost_ms)
+
+        cost = (time.perf_counter() - started) * 1000
+        self.frames += 1
+        self.frame_ms += 0.2 * (cost - self.frame_ms)
+        self.lag_ms += 0.2 * (max(0.0, lag) * 1000 - self.lag_ms)
+        self._window_max = max(self._window_max, cost)
+        if started - self._window_start >= 1.0:
+            self.frame_ms_max = self._window_max
+            self._window_max, self._window_start = 0.0, started
+
+        self._adapt()
+
+    def _adapt(self):
+        pressure = (self.frame_ms + self.lag_ms) / self.budget_ms
+        if pressure > 1.0:
+            self.scale = max(0.05, self.scale * 0.8)
+        elif pressure < 0.5:
+            self.scale = min(1.0, self.scale * 1.05)
+
+    def worker_depth(self) -> int:
+        """Workers queued or running on the app (search, ingestion, navigation)."""
+        return sum(1 for w in self.app.workers if w.state in (WorkerState.PENDING, WorkerState.RUNNING))
+
+    def stats(self) -> Dict:
+        return {
+            "frame_ms": self.frame_ms,
+            "frame_ms_max": self.frame_ms_max,
+            "lag_ms": self.lag_ms,
+            "budget_ms": self.budget_ms,
+            "dropped_frames": self.dropped_frames,
+            "scale": self.scale,
+            "workers": self.worker_depth(),
+            "rates": {name: self.rate(task) for name, task in self.tasks.items()},
+        }
+
+    def overlay_text(self) -> str:
+        s = self.stats()
+        rates: List[str] = [f"{name} {hz:.0f}Hz" for name, hz in s["rates"].items() if name != "overlay"]
+        return (
+            f"frame {s['frame_ms']:.1f}ms (max {s['frame_ms_max']:.1f}) / budget {s['budget_ms']:.0f}ms | "
+            f"lag {s['lag_ms']:.1f}ms | dropped {s['dropped_frames']} | workers {s['workers']} | "
+            + " ".join(rates)
+        )
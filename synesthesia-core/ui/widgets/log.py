@@ -1,22 +1,151 @@
-from textual.widgets import RichLog
+import re
+import time
+import threading
+import collections
+from typing import Optional
 
-class Log(RichLog):
-    """Panel C: System Event Log."""
-    
-    def __init__(self, **kwargs):
-        super().__init__(markup=True, wrap=True, highlight=True, **kwargs)
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import RichLog, Static
+
+# Digits are what changes between progress messages ("Ingested 5000 tracks...")
+_NUMBERS = re.compile(r"\d+(\.\d+)?")
+
+class Log(Vertical):
+    """
+    Panel C: System Event Log.
+
+    The log_* methods are thread-safe and only queue a line; flush() (driven
+    once per frame by the app's FrameScheduler) writes the whole batch to the
+    view in one go. The view keeps at most max_lines, and lines that fall out
+    of the queue between flushes are counted as dropped.
+
+    The newest message lives on a separate live line. Only info messages
+    collapse: a progress message (log_info(..., progress=True)) is replaced by
+    the next one that only differs in its numbers, and an info line repeated
+    exactly is counted instead of added. SEARCH/FOUND/VOID/ERR lines are always
+    committed to the history.
+    Committed lines are optionally appended as plain text to spill_path so the
+    full session survives while memory stays flat.
+    """
+
+    def __init__(self, max_lines: int = 500, spill_path: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.max_lines = max_lines
+        self.spill_path = spill_path
+
+        self._lock = threading.Lock()
+        self._pending = collections.deque(maxlen=max_lines)
+        self._live: Optional[str] = None
+        self._live_key: Optional[str] = None
+        self._live_repeats = 0
+        self._live_dirty = False
+
+        self._spill = open(spill_path, "a", encoding="utf-8") if spill_path else None
+        self.lines_view: Optional[RichLog] = None
+        self.live_view: Optional[Static] = None
+
+        self.written = 0
+        self.collapsed = 0
+        self.dropped = 0
+
+    def compose(self) -> ComposeResult:
+        yield RichLog(max_lines=self.max_lines, markup=True, wrap=True, highlight=True, id="log-lines")
+        yield Static("", id="log-live")
+
+    def on_mount(self):
+        self.lines_view = self.query_one("#log-lines", RichLog)
+        self.live_view = self.query_one("#log-live", Static)
+
+    def on_unmount(self):
+        self.close()
 
     def log_search(self, query: str):
-        self.write(f"[bold cyan]SEARCH[/] [white]{query}[/]")
+        self._push(f"[bold cyan]SEARCH[/] [white]{query}[/]")
 
     def log_found(self, track: str):
-        self.write(f"[bold green]FOUND[/]  [white]{track}[/]")
+        self._push(f"[bold green]FOUND[/]  [white]{track}[/]")
 
     def log_void(self):
-        self.write("[bold purple]VOID[/]   [dim]Global Discovery Triggered[/]")
+        self._push("[bold purple]VOID[/]   [dim]Global Discovery Triggered[/]")
 
     def log_error(self, msg: str):
-        self.write(f"[bold red]ERR[/]    {msg}")
+        self._push(f"[bold red]ERR[/]    {msg}")
+
+    def log_info(self, msg: str, progress: bool = False):
+        self._push(f"[dim]{msg}[/]", _NUMBERS.sub("#", msg) if progress else msg)
+
+    def _push(self, markup: str, key: Optional[str] = None):
+        # key=None never matches, so the line is committed once a newer one arrives
+        with self._lock:
+            if key is not None and key == self._live_key:
+                # Same message or progress update: rewrite the live line
+                self._live_repeats = self._live_repeats + 1 if markup == self._live else 0
+                self.collapsed += 1
+            else:
+                if self._live is not None:
+                    self._commit(self._live, self._live_repeats)
+                self._live_key = key
+                self._live_repeats = 0
+            self._live = markup
+            self._live_dirty = True
+
+    def _commit(self, markup: str, repeats: int):
+        # Caller holds the lock
+        if repeats:
+            markup += f" [dim](x{repeats + 1})[/]"
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(markup)
+
+    def _live_markup(self) -> str:
+        if self._live_repeats:
+            return self._live + f" [dim](x{self._live_repeats + 1})[/]"
+        return self._live or ""
+
+    def flush(self):
+        """Write everything queued since the last frame. Call on the UI thread."""
+        if self.lines_view is None:
+            return
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            live = self._live_markup() if self._live_dirty else None
+            self._live_dirty = False
+
+        if batch:
+            # One markup parse and one refresh for the whole batch
+            self.lines_view.write("\n".join(batch))
+            self.written += len(batch)
+            self._spill_lines(batch)
+        if live is not None:
+            self.live_view.update(live)
+
+    def _spill_lines(self, batch):
+        if self._spill and batch:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            self._spill.writelines(f"{stamp} {Text.from_markup(line).plain}\n" for line in batch)
+            self._spill.flush()
+
+    def close(self):
+        """Commit the live line to the spill file and close it."""
+        if not self._spill:
+            return
+        with self._lock:
+            if self._live is not None:
+                self._commit(self._live, self._live_repeats)
+                self._live = self._live_key = None
+            batch = list(self._pending)
+            self._pending.clear()
+        self._spill_lines(batch)
+        self._spill.close()
+        self._spill = None
 
-    def log_info(self, msg: str):
-        self.write(f"[dim]{msg}[/]")
\ No newline at end of file
+    def stats(self) -> dict:
+        return {
+            "lines": len(self.lines_view.lines) if self.lines_view else 0,
+            "written": self.written,
+            "collapsed": self.collapsed,
+            "dropped": self.dropped,
+        }
@@ -2,91 +2,187 @@ from textual.widgets import Static, Sparkline
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from rich.text import Text
-import queue
-import random
+import numpy as np
+from typing import Optional
+
+from services.mailbox import FrameMailbox
 
 class Constellation(Static):
     """The Star Chart Visualization."""
+
+    WIDTH = 60
+    HEIGHT = 12
+    # A star lives 1 / 0.05 = 20 frames and at most HEIGHT distinct stars are
+    # born per frame, so this capacity is never exceeded
+    CAPACITY = WIDTH * HEIGHT
+
+    # Glyph per age bucket: [0, 0.5) '.', [0.5, 0.8] '*', (0.8, 1] '+'
+    GLYPHS = np.frombuffer(b".*+", dtype=np.uint8)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.stars = [] # List of [x, y, age]
+        # Fixed-capacity star buffer; live stars are packed in [:count]
+        self.x = np.zeros(self.CAPACITY, dtype=np.int16)
+        self.y = np.zeros(self.CAPACITY, dtype=np.int16)
+        self.age = np.zeros(self.CAPACITY, dtype=np.float32)
+        self.count = 0
+
+        self._grid = np.full((self.HEIGHT, self.WIDTH), ord(' '), dtype=np.uint8)
+        self._prev = self._grid.copy()
+        self._rows = [" " * self.WIDTH] * self.HEIGHT
 
     def update_stars(self, new_stars, rms):
-        # 1. Add new stars
-        for (f1, delta) in new_stars:
-            y = min(11, int(f1 / 300))
-            x = 59
-            self.stars.append([x, y, 1.0])
-
-        # 2. Animate
-        kept_stars = []
-        for star in self.stars:
-            star[0] -= 1
-            star[2] -= 0.05
-            if star[0] > 0 and star[2] > 0:
-                kept_stars.append(star)
-        self.stars = kept_stars
-
-        # 3. Render
-        grid = [[' ' for _ in range(60)] for _ in range(12)]
-        for x, y, age in self.stars:
-            if 0 <= y < 12 and 0 <= x < 60:
-                char = '.' if age < 0.5 else '*'
-                if age > 0.8: char = '+'
-                grid[y][int(x)] = char
-
-        lines = ["".join(row) for row in grid]
-        
+        # 1. Add new stars: every star born this frame sits at the right edge,
+        #    so one per occupied row is enough however many hashes arrived
+        new_stars = np.asarray(new_stars)
+        if new_stars.size:
+            rows = np.unique(np.minimum(self.HEIGHT - 1, new_stars[:, 0] // 300))
+            n = min(len(rows), self.CAPACITY - self.count)
+            end = self.count + n
+            self.x[self.count:end] = self.WIDTH - 1
+            self.y[self.count:end] = rows[:n]
+            self.age[self.count:end] = 1.0
+            self.count = end
+
+        # 2. Animate: age and cull in place
+        live = slice(0, self.count)
+        self.x[live] -= 1
+        self.age[live] -= 0.05
+        keep = (self.x[live] > 0) & (self.age[live] > 0)
+        n = int(keep.sum())
+        if n != self.count:
+            self.x[:n] = self.x[live][keep]
+            self.y[:n] = self.y[live][keep]
+            self.age[:n] = self.age[live][keep]
+            self.count = n
+
+        # 3. Render: rasterize by array indexing, re-join only rows that changed
+        grid = self._grid
+        grid.fill(ord(' '))
+        x, y, age = self.x[:n], self.y[:n], self.age[:n]
+        glyph = (age >= 0.5).astype(np.intp) + (age > 0.8)
+        grid[y, x] = self.GLYPHS[glyph]
+
+        changed = np.flatnonzero((grid != self._prev).any(axis=1))
+        if len(changed) == 0:
+            return
+        for i in changed:
+            self._rows[i] = grid[i].tobytes().decode("ascii")
+        self._prev[:] = grid
+
         # RMS Bar (Optional, since we have sparklines now, but looks cool in ASCII too)
         # rms_len = int(rms * 60)
         # lines.append("[" + "=" * rms_len + " " * (58 - rms_len) + "]")
 
-        text = Text("\n".join(lines), style="green")
+        text = Text("\n".join(self._rows), style="green")
         self.update(text)
 
+class RingHistory:
+    """
+    Fixed-size sparkline history.
+    Samples are folded into buckets of `decimate` frames; each finished bucket
+    keeps its min and max (so short peaks and dips both survive downsampling)
+    and is written into a preallocated ring. data() and floor() are the upper
+    and lower envelopes, one value per bucket. `version` only changes when a
+    bucket completes, so callers can skip redraws when nothing visible changed.
+    """
+
+    def __init__(self, points: int = 60, decimate: int = 1):
+        self.points = points
+        self.decimate = max(1, decimate)
+        self.mins = np.zeros(points, dtype=np.float32)
+        self.maxs = np.zeros(points, dtype=np.float32)
+        self.head = 0  # next slot to write (= oldest bucket)
+        self.version = 0
+
+        self._bucket_min = np.inf
+        self._bucket_max = -np.inf
+        self._bucket_count = 0
+
+    def push(self, values: np.ndarray):
+        for v in np.asarray(values, dtype=np.float32).ravel().tolist():
+            if v < self._bucket_min: self._bucket_min = v
+            if v > self._bucket_max: self._bucket_max = v
+            self._bucket_count += 1
+            if self._bucket_count == self.decimate:
+                self.mins[self.head] = self._bucket_min
+                self.maxs[self.head] = self._bucket_max
+                self.head = (self.head + 1) % self.points
+                self.version += 1
+                self._bucket_min, self._bucket_max, self._bucket_count = np.inf, -np.inf, 0
+
+    def _oldest_first(self, values: np.ndarray) -> list:
+        return np.roll(values, -self.head).tolist()
+
+    def data(self) -> list:
+        """Oldest-first bucket maxima (the frames themselves when not decimated)."""
+        return self._oldest_first(self.maxs)
+
+    def floor(self) -> list:
+        """Oldest-first bucket minima: the lower envelope under data()."""
+        return self._oldest_first(self.mins)
+
 class Scope(Static):
     """Panel A: Combined Visualization."""
     
-    def __init__(self, dsp_queue: queue.Queue, **kwargs):
+    def __init__(self, mailbox: FrameMailbox, frame_rate: float = 44100 / 2048,
+                 rms_seconds: Optional[float] = None, **kwargs):
         super().__init__(**kwargs)
-        self.dsp_queue = dsp_queue
-        self.history = [0.0] * 60
+        self.mailbox = mailbox
+        self.rms_seconds = rms_seconds
+        # Latest 60 frames of each signal; rms_seconds opts into a longer,
+        # min/max-decimated RMS window (e.g. minutes) at the same 60 points,
+        # drawn as an envelope: bucket maxima over bucket minima
+        decimate = max(1, round(rms_seconds * frame_rate / 60)) if rms_seconds else 1
+        self.rms_history = RingHistory(60, decimate=decimate)
+        self.flatness_history = RingHistory(60)
+        self._drawn = {}
 
     def compose(self) -> ComposeResult:
+        rms_label = f"RMS Energy ({self.rms_seconds / 60:g} min)" if self.rms_seconds else "RMS Energy"
         with Vertical():
             yield Constellation(id="constellation", classes="box")
-            yield Static("RMS Energy", classes="label")
-            yield Sparkline(self.history, summary_function=max, id="rms-sparkline")
+            yield Static(rms_label, classes="label")
+            yield Sparkline(self.rms_history.data(), summary_function=max, id="rms-sparkline")
+            if self.rms_history.decimate > 1:
+                yield Sparkline(self.rms_history.floor(), summary_function=min, id="rms-floor-sparkline")
             yield Static("Spectral Flatness", classes="label")
-            yield Sparkline(self.history, summary_function=max, id="flatness-sparkline")
+            yield Sparkline(self.flatness_history.data(), summary_function=max, id="flatness-sparkline")
 
     def on_mount(self):
         self.constellation = self.query_one("#constellation", Constellation)
         self.rms_sparkline = self.query_one("#rms-sparkline", Sparkline)
         self.flatness_sparkline = self.query_one("#flatness-sparkline", Sparkline)
-        self.set_interval(1/20, self.update_scope)
+        self.rms_floor_sparkline = None
+        if self.rms_history.decimate > 1:
+            self.rms_floor_sparkline = self.query_one("#rms-floor-sparkline", Sparkline)
+        # update_scope is driven by the app's FrameScheduler
+
+    def _redraw(self, sparkline: Sparkline, history: RingHistory, envelope=None):
+        # Reassigning .data forces a full re-render; only do it when a point changed
+        if self._drawn.get(sparkline.id) != history.version:
+            sparkline.data = (envelope or history.data)()
+            self._drawn[sparkline.id] = history.version
 
     def update_scope(self):
         try:
-            if self.dsp_queue.empty(): return
-
-            batch_stars = []
-            last_rms = 0.0
-            last_flatness = 0.0
+            # Drain the ring; stars accumulate, continuous signals take the newest frame
+            frames = self.mailbox.drain()
+            if len(frames) == 0: return
 
-            # Drain queue but KEEP the transient data
-            while not self.dsp_queue.empty():
-                item = self.dsp_queue.get_nowait()
-                batch_stars.extend(item.get('stars', [])) # Accumulate stars
-                last_rms = item.get('rms', 0)             # RMS is continuous, taking last is fine
-                last_flatness = item.get('spectral_centroid', 0)
+            batch_stars = self.mailbox.drain_stars()
+            last_rms = float(frames["rms"][-1])
 
             # Update Constellation with ALL stars found since last frame
             self.constellation.update_stars(batch_stars, last_rms)
 
-            # Update Sparklines with latest values
-            self.rms_sparkline.data = (self.rms_sparkline.data[1:] + [last_rms])
-            self.flatness_sparkline.data = (self.flatness_sparkline.data[1:] + [last_flatness])
+            # Every frame goes into the histories; sparklines redraw only on change
+            self.rms_history.push(frames["rms"])
+            self.flatness_history.push(frames["flatness"])
+            self._redraw(self.rms_sparkline, self.rms_history)
+            if self.rms_floor_sparkline:
+                self._redraw(self.rms_floor_sparkline, self.rms_history, self.rms_history.floor)
+            self._redraw(self.flatness_sparkline, self.flatness_history)
 
         except Exception:
             pass
@@ -0,0 +1,42 @@
+from rich.table import Table
+from textual.widgets import Static
+
+class StatsPanel(Static):
+    """Per-stage latency (p50 / p99 / max in ms) and counters from the metrics registry."""
+
+    def show(self, snapshot: dict):
+        table = Table(box=None, padding=(0, 1), expand=True)
+        table.add_column("stage", style="cyan")
+        table.add_column("n", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p99", justify="right")
+        table.add_column("max", justify="right", style="dim")
+
+        for name, s in snapshot["latency"].items():
+            if s["count"]:
+                table.add_row(name, str(s["count"]), f"{s['p50_ms']:.2f}", f"{s['p99_ms']:.2f}", f"{s['max_ms']:.1f}")
+
+        values = dict(snapshot["counters"])
+        values.update(snapshot["gauges"])
+        for name, value in values.items():
+            table.add_row(f"[dim]{name}[/]", f"{value:g}", "", "", "")
+
+        self.update(table)
+
+class ProfilePanel(Static):
+    """Top-N hot functions of the running (or last) profiling session."""
+
+    def show(self, summary: dict, running: bool, path: str = ""):
+        state = "[bold red]● profiling[/]" if running else f"[dim]saved {path}[/]"
+        sections = "  ".join(f"{name} {count}" for name, count in summary["sections"].items())
+
+        table = Table(box=None, padding=(0, 1), expand=True,
+                      title=f"{state}  {summary['samples']} samples / {summary['duration_s']:.1f}s",
+                      caption=sections or None)
+        table.add_column("self%", justify="right")
+        table.add_column("tot%", justify="right", style="dim")
+        table.add_column("function", style="cyan", no_wrap=True, overflow="ellipsis")
+        for row in summary["top"]:
+            table.add_row(f"{row['self_pct']:.1f}", f"{row['total_pct']:.1f}", row["function"])
+
+        self.update(table)
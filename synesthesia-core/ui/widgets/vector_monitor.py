@@ -4,6 +4,7 @@ from textual.containers import Vertical
 from textual.reactive import reactive
 from textual.binding import Binding
 from textual.message import Message
+from typing import Dict, Optional, Sequence, Union
 
 class VectorMonitor(Static):
     """Panel B: Vector State Monitor."""
@@ -29,11 +30,17 @@ class VectorMonitor(Static):
     colors = ["red", "blue", "green", "yellow", "cyan"]
 
     class VectorChanged(Message):
-        """Emitted when the vector changes."""
+        """Emitted when the vector changes (at most once per frame)."""
         def __init__(self, vector: dict):
             self.vector = vector
             super().__init__()
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bars: Dict[str, ProgressBar] = {}
+        self.labels: Dict[str, Label] = {}
+        self._change_pending = False
+
     def compose(self) -> ComposeResult:
         with Vertical():
             yield Label("Target Vector", classes="header")
@@ -42,6 +49,15 @@ class VectorMonitor(Static):
                 yield ProgressBar(total=1.0, show_eta=False, id=f"bar-{dim}", classes=f"bar-{self.colors[i]}")
             yield Label("↑↓ Select | ←→ Adjust (Auto-Search) | / Search", classes="help-text")
 
+    def on_mount(self):
+        # Resolve children once instead of querying the DOM on every update
+        for dim in self.dimensions:
+            self.bars[dim] = self.query_one(f"#bar-{dim}", ProgressBar)
+            self.labels[dim] = self.query_one(f"#label-{dim}", Label)
+        for dim in self.dimensions:
+            self.bars[dim].progress = getattr(self, dim)
+        self.watch_selected_index(self.selected_index)
+
     def watch_energy(self, value): self.update_bar("energy", value)
     def watch_valence(self, value): self.update_bar("valence", value)
     def watch_danceability(self, value): self.update_bar("danceability", value)
@@ -49,24 +65,56 @@ class VectorMonitor(Static):
     def watch_instrumentalness(self, value): self.update_bar("instrumentalness", value)
 
     def update_bar(self, dim, value):
-        try:
-            bar = self.query_one(f"#bar-{dim}", ProgressBar)
+        bar = self.bars.get(dim)
+        if bar is not None:
             bar.progress = value
-            self.post_message(self.VectorChanged(self.get_vector()))
-        except:
-            pass
+        self._schedule_change()
+
+    def set_vector(self, vector: Union[Dict[str, float], Sequence[float]]):
+        """
+        Apply several dimensions at once: one bar update each and a single
+        coalesced VectorChanged, instead of one message per dimension.
+        """
+        if not isinstance(vector, dict):
+            vector = dict(zip(self.dimensions, vector))
+
+        changed = False
+        for dim, value in vector.items():
+            value = float(value)
+            if getattr(self, dim) == value:
+                continue
+            # Bypass the per-dimension watcher; the bar is updated here
+            self.set_reactive(getattr(VectorMonitor, dim), value)
+            bar = self.bars.get(dim)
+            if bar is not None:
+                bar.progress = value
+            changed = True
+
+        if changed:
+            self._schedule_change()
+
+    def _schedule_change(self):
+        # Any number of updates before the next refresh (set_vector, a burst of
+        # key repeats) produce one message; the app debounces across frames
+        if self._change_pending:
+            return
+        self._change_pending = True
+        self.call_after_refresh(self._emit_change)
+
+    def _emit_change(self):
+        self._change_pending = False
+        self.post_message(self.VectorChanged(self.get_vector()))
 
     def watch_selected_index(self, value):
         # Highlight the selected label
         for i, dim in enumerate(self.dimensions):
-            try:
-                label = self.query_one(f"#label-{dim}", Label)
-                if i == value:
-                    label.add_class("selected")
-                else:
-                    label.remove_class("selected")
-            except:
-                pass
+            label = self.labels.get(dim)
+            if label is None:
+                continue
+            if i == value:
+                label.add_class("selected")
+            else:
+                label.remove_class("selected")
 
     def action_select_prev(self):
         self.selected_index = (self.selected_index - 1) % len(self.dimensions)
@@ -74,15 +122,16 @@ class VectorMonitor(Static):
     def action_select_next(self):
         self.selected_index = (self.selected_index + 1) % len(self.dimensions)
 
-    def action_decrease(self):
+    def _adjust(self, step: float):
         dim = self.dimensions[self.selected_index]
         current = getattr(self, dim)
-        setattr(self, dim, max(0.0, current - 0.05))
+        setattr(self, dim, min(1.0, max(0.0, current + step)))
+
+    def action_decrease(self):
+        self._adjust(-0.05)
 
     def action_increase(self):
-        dim = self.dimensions[self.selected_index]
-        current = getattr(self, dim)
-        setattr(self, dim, min(1.0, current + 0.05))
+        self._adjust(0.05)
 
     def get_vector(self):
         return {